@@ -1,7 +1,12 @@
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import time
+import threading
 import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
 
 logger = logging.getLogger(__name__)
 
@@ -13,25 +18,304 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("❌ DATABASE_URL is not set")
 
+# -------------------------------------------------
+# POOL CONFIG
+# -------------------------------------------------
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))            # wait for a free connection (s)
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "60"))         # ping / reap after this idle time (s)
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))  # recycle connections older than this (s)
+
+Connection = psycopg2.extensions.connection
+
+
+class PoolTimeout(RuntimeError):
+    """
+    Raised when no connection could be checked out within the pool timeout.
+    """
+
 
 # -------------------------------------------------
-# DB CONNECTION (LAZY, SAFE)
+# CONNECTION POOL
 # -------------------------------------------------
-def get_db() -> psycopg2.extensions.connection:
+class ConnectionPool:
     """
-    Returns a new PostgreSQL connection.
-    Caller is responsible for closing it.
-    Safe for Supabase (SSL required).
+    Thread-safe PostgreSQL connection pool.
+
+    - Opens connections lazily up to `max_size`, keeps `min_size` warm.
+    - Checkout waits up to `timeout` seconds, then raises PoolTimeout.
+    - Connections idle longer than `max_idle` are pinged (SELECT 1) before reuse,
+      or closed if the pool is above `min_size`.
+    - Connections older than `max_lifetime` are recycled.
+    - Returned connections with an open / failed transaction are rolled back.
     """
-    try:
-        conn = psycopg2.connect(
-            DATABASE_URL,
-            cursor_factory=RealDictCursor,
-            sslmode="require",      # REQUIRED for Supabase external connections
-            connect_timeout=5,      # Prevents Supabase 30-60s hangs
-        )
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        max_idle: float = DB_POOL_MAX_IDLE,
+        max_lifetime: float = DB_POOL_MAX_LIFETIME,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool size: need 0 <= min_size <= max_size and max_size >= 1")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Connection, float]] = []      # (conn, last_used), LIFO
+        self._created: Dict[Connection, float] = {}          # conn → created_at
+        self._size = 0
+        self._closed = False
+
+        self._stats: Dict[str, float] = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "connects": 0,
+            "connect_errors": 0,
+            "discarded": 0,
+            "health_check_failures": 0,
+            "wait_time_total": 0.0,
+        }
+
+    # ---------- connection lifecycle ----------
+    def _connect(self) -> Connection:
+        try:
+            conn = psycopg2.connect(
+                self.dsn,
+                sslmode="require",      # REQUIRED for Supabase external connections
+                connect_timeout=5,      # Prevents Supabase 30-60s hangs
+            )
+        except Exception as e:
+            with self._cond:
+                self._stats["connect_errors"] += 1
+            logger.exception(f"❌ Database connection failed → {e}")
+            raise RuntimeError("Database connection failed") from e
+
+        with self._cond:
+            self._created[conn] = time.monotonic()
+            self._stats["connects"] += 1
+        return conn
+
+    def _discard(self, conn: Connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+        with self._cond:
+            self._created.pop(conn, None)
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _healthy(self, conn: Connection) -> bool:
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    # ---------- checkout / checkin ----------
+    def getconn(self, timeout: Optional[float] = None) -> Connection:
+        """
+        Checks a connection out of the pool. Must be returned with putconn().
+        """
+        wait = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + wait
+
+        while True:
+            conn: Optional[Connection] = None
+            last_used = 0.0
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"No database connection available within {wait:.1f}s")
+                    self._cond.wait(remaining)
+
+            # ---- Reserved a slot: open a new connection ----
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                break
+
+            # ---- Reused an idle connection: validate it ----
+            now = time.monotonic()
+            created = self._created.get(conn, now)
+
+            if conn.closed or now - created > self.max_lifetime:
+                self._discard(conn)
+                continue
+
+            if now - last_used > self.max_idle:
+                if self._size > self.min_size or not self._healthy(conn):
+                    self._discard(conn)
+                    continue
+
+            break
+
+        with self._cond:
+            self._stats["checkouts"] += 1
+            self._stats["wait_time_total"] += time.monotonic() - start
         return conn
 
-    except Exception as e:
-        logger.exception(f"❌ Database connection failed → {e}")
-        raise RuntimeError("Database connection failed") from e
+    def putconn(self, conn: Connection, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool, rolling back any open transaction.
+        """
+        if discard or conn.closed:
+            self._discard(conn)
+            return
+
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                self._created.pop(conn, None)
+                conn.close()
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    # ---------- maintenance ----------
+    def warm(self) -> None:
+        """
+        Opens connections until `min_size` are available.
+        """
+        conns = []
+        try:
+            while True:
+                with self._cond:
+                    if self._size >= self.min_size:
+                        break
+                conns.append(self.getconn())
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            for conn, _ in idle:
+                self._created.pop(conn, None)
+            self._cond.notify_all()
+
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            checkouts = self._stats["checkouts"]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "checkouts": int(checkouts),
+                "timeouts": int(self._stats["timeouts"]),
+                "connects": int(self._stats["connects"]),
+                "connect_errors": int(self._stats["connect_errors"]),
+                "discarded": int(self._stats["discarded"]),
+                "health_check_failures": int(self._stats["health_check_failures"]),
+                "avg_wait_ms": round(self._stats["wait_time_total"] / checkouts * 1000, 3) if checkouts else 0.0,
+            }
+
+
+# -------------------------------------------------
+# SHARED POOL (LAZY, ONE PER PROCESS)
+# -------------------------------------------------
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_URL)
+    return _pool
+
+
+@contextmanager
+def db_connection(timeout: Optional[float] = None) -> Iterator[Connection]:
+    """
+    Borrows a pooled PostgreSQL connection.
+
+        with db_connection() as conn:
+            cur = conn.cursor()
+            ...
+            conn.commit()
+
+    Uncommitted work is rolled back when the block exits.
+    """
+    pool = get_pool()
+    conn = pool.getconn(timeout)
+    try:
+        yield conn
+    except BaseException:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def pool_stats() -> Dict[str, Any]:
+    return get_pool().stats()
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,44 @@
+import os
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.db import DB_POOL_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# -------------------------------------------------
+# EXECUTOR CONFIG
+# -------------------------------------------------
+# One thread per pooled connection: more threads would only queue on the pool.
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_MAX_SIZE)))
+
+_executor = ThreadPoolExecutor(
+    max_workers=DB_EXECUTOR_WORKERS,
+    thread_name_prefix="db",
+)
+
+
+# -------------------------------------------------
+# ASYNC ADAPTER
+# -------------------------------------------------
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking psycopg2 helper on the bounded DB executor.
+
+        is_pro = await run_db(is_user_pro, telegram_id)
+
+    Async handlers must use this instead of calling DB helpers directly,
+    so one slow query never stalls the event loop (and every other chat).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_db_executor() -> None:
+    _executor.shutdown(wait=True)
+    logger.info("🛑 DB executor stopped")
@@ -1,43 +1,263 @@
-import psycopg2
-from app.db import get_db
+import sys
+import logging
+from typing import List, Set, Tuple
 
-MIGRATIONS = [
-    """
+from app.db import db_connection
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------
+# VERSIONED MIGRATIONS
+# (version, name, sql) — append only, never edit or renumber
+#
+# SQL starting with NO_TRANSACTION runs outside a transaction, one
+# statement at a time (needed for CREATE / REINDEX ... CONCURRENTLY on hot
+# tables). Every statement in such a migration must be safe to run twice
+# (IF NOT EXISTS, REINDEX) and CONCURRENTLY: lock_timeout only applies
+# inside the migration transaction, so blocking DDL (ALTER TABLE, ...) goes
+# in its own, transactional migration.
+# -------------------------------------------------
+NO_TRANSACTION = "-- no-transaction"
+
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, "creators_pro_expires_at", """
     ALTER TABLE creators ADD COLUMN IF NOT EXISTS pro_expires_at TIMESTAMP WITH TIME ZONE;
-    """,
-    """
+    """),
+    (2, "creators_whitelisting_enabled", """
     ALTER TABLE creators ADD COLUMN IF NOT EXISTS whitelisting_enabled BOOLEAN DEFAULT FALSE;
-    """,
-    """
+    """),
+    (3, "creators_usage_rights_months", """
     ALTER TABLE creators ADD COLUMN IF NOT EXISTS usage_rights_months INTEGER DEFAULT 3;
-    """,
-    """
+    """),
+    (4, "creators_creator_type", """
     ALTER TABLE creators ADD COLUMN IF NOT EXISTS creator_type TEXT;
-    """,
-    """
+    """),
+    (5, "payments_plan", """
     ALTER TABLE payments ADD COLUMN IF NOT EXISTS plan TEXT;
-    """,
-    """
+    """),
+    (6, "payments_paid_at", """
     ALTER TABLE payments ADD COLUMN IF NOT EXISTS paid_at TIMESTAMP WITH TIME ZONE;
-    """,
-    """
+    """),
+    (7, "payments_currency", """
     ALTER TABLE payments ADD COLUMN IF NOT EXISTS currency TEXT DEFAULT 'NGN';
-    """
+    """),
+    (8, "telegram_updates", """
+    CREATE TABLE IF NOT EXISTS telegram_updates (
+        update_id BIGINT PRIMARY KEY,
+        received_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS telegram_updates_received_at_idx ON telegram_updates (received_at);
+    """),
+    (9, "paystack_events", """
+    CREATE TABLE IF NOT EXISTS paystack_events (
+        id BIGSERIAL PRIMARY KEY,
+        event_key TEXT NOT NULL UNIQUE,
+        event TEXT NOT NULL,
+        reference TEXT,
+        payload JSONB NOT NULL,
+        received_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        processed_at TIMESTAMP WITH TIME ZONE,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS paystack_events_pending_idx
+        ON paystack_events (id) WHERE processed_at IS NULL;
+    """),
+    (10, "payments_reconcile", """
+    ALTER TABLE payments ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+    CREATE INDEX IF NOT EXISTS payments_pending_reference_idx
+        ON payments (reference) WHERE status = 'pending';
+    """),
+    (11, "creators_pro_expiry_idx", """
+    CREATE INDEX IF NOT EXISTS creators_pro_expires_at_idx
+        ON creators (pro_expires_at) WHERE is_pro = TRUE;
+    """),
+    (12, "conversation_state", """
+    CREATE TABLE IF NOT EXISTS conversation_state (
+        user_id BIGINT PRIMARY KEY,
+        data JSONB NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS conversation_state_updated_at_idx ON conversation_state (updated_at);
+    """),
+    (13, "pricing_config", """
+    CREATE TABLE IF NOT EXISTS pricing_config (
+        version SERIAL PRIMARY KEY,
+        config JSONB NOT NULL,
+        note TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    """),
+    (14, "payments_reconcile_claim", """
+    ALTER TABLE payments ADD COLUMN IF NOT EXISTS reconcile_claimed_at TIMESTAMP WITH TIME ZONE;
+    """),
+    (15, "payments_pending_reference_idx_rebuild", NO_TRANSACTION + """
+    REINDEX INDEX CONCURRENTLY payments_pending_reference_idx;
+    """),
+    (16, "creators_pro_expires_at_idx_rebuild", NO_TRANSACTION + """
+    REINDEX INDEX CONCURRENTLY creators_pro_expires_at_idx;
+    """),
+    (17, "paystack_events_retry", """
+    ALTER TABLE paystack_events ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE paystack_events ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+    """),
 ]
 
-def run_migrations():
-    conn = None
+# Transaction-level advisory lock key: only one worker migrates at a time.
+# pg_advisory_xact_lock is released by the COMMIT that records the migration,
+# so it is safe behind a transaction-mode pooler (a session-level lock could
+# be taken on one server connection and "released" on another).
+MIGRATION_LOCK_KEY = 72_610_006
+
+# Max time a migration waits for its table lock before failing (instead of
+# queueing every live query behind an ACCESS EXCLUSIVE request)
+MIGRATION_LOCK_TIMEOUT = "5s"
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _applied_versions(cur) -> Set[int]:
+    cur.execute("SELECT to_regclass('schema_migrations')")
+    row = cur.fetchone()
+    if not row or row[0] is None:
+        return set()
+
+    cur.execute("SELECT version FROM schema_migrations")
+    return {r[0] for r in cur.fetchall()}
+
+
+def pending_migrations() -> List[Tuple[int, str, str]]:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        applied = _applied_versions(cur)
+        conn.rollback()
+
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def _lock_and_check(cur, version: int) -> bool:
+    """
+    Takes the migration lock for the current transaction and reports
+    whether `version` still needs applying.
+    """
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_KEY,))
+    cur.execute(SCHEMA_MIGRATIONS_SQL)
+
+    # Re-check under the lock: another worker may have just applied it
+    cur.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+    return cur.fetchone() is None
+
+
+def _run_without_transaction(conn, sql: str) -> None:
+    """
+    Runs each statement in autocommit mode. No advisory lock is held while
+    they run (CONCURRENTLY cannot run inside a transaction), so statements
+    must tolerate a second worker doing the same: IF NOT EXISTS makes the
+    loser a no-op. A CONCURRENTLY build that fails leaves an INVALID index
+    behind; drop it by hand before the migration is retried.
+
+    Only CONCURRENTLY statements are accepted: anything else could queue
+    an ACCESS EXCLUSIVE lock behind live traffic with no lock_timeout (a
+    session-level SET would leak to other clients behind the pooler).
+    """
+    statements = [s for s in sql.replace(NO_TRANSACTION, "").split(";") if s.strip()]
+    for statement in statements:
+        if "CONCURRENTLY" not in statement.upper():
+            raise RuntimeError(f"❌ {NO_TRANSACTION} migrations only take CONCURRENTLY statements: {statement.strip()}")
+
+    conn.autocommit = True
     try:
-        conn = get_db()
         cur = conn.cursor()
-        for sql in MIGRATIONS:
-            cur.execute(sql)
-        conn.commit()
-        cur.close()
-    except Exception as e:
-        print(f"DB Migration Error: {e}")
-        if conn:
-            conn.rollback()
+        for statement in statements:
+            cur.execute(statement)
     finally:
-        if conn:
-            conn.close()
+        conn.autocommit = False
+
+
+def run_migrations() -> int:
+    """
+    Applies pending migrations and returns how many ran.
+
+    Fast path: a single SELECT when the schema is up to date (no DDL, no locks).
+    Otherwise each pending migration runs in its own transaction, which first
+    takes a transaction-level advisory lock and re-checks schema_migrations
+    under it, so concurrent workers apply each migration exactly once.
+    NO_TRANSACTION migrations check under the lock, run unlocked, and are
+    then recorded under the lock unless another worker recorded them first.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+
+        applied = _applied_versions(cur)
+        conn.rollback()
+        if all(version in applied for version, _, _ in MIGRATIONS):
+            return 0
+
+        applied_count = 0
+        try:
+            for version, name, sql in MIGRATIONS:
+                if version in applied:
+                    continue
+
+                if not _lock_and_check(cur, version):
+                    conn.commit()
+                    continue
+
+                if sql.lstrip().startswith(NO_TRANSACTION):
+                    conn.commit()
+                    _run_without_transaction(conn, sql)
+                    if not _lock_and_check(cur, version):
+                        # another worker ran it as well and recorded it first
+                        conn.commit()
+                        continue
+                else:
+                    cur.execute(f"SET LOCAL lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+                    cur.execute(sql)
+
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s) "
+                    "ON CONFLICT (version) DO NOTHING",
+                    (version, name),
+                )
+                conn.commit()
+                applied_count += 1
+                logger.info(f"🛠 Applied migration {version:04d}_{name}")
+
+        finally:
+            conn.rollback()
+
+    return applied_count
+
+
+# -------------------------------------------------
+# CLI: python -m app.db_auto_migrate [migrate|status]
+# -------------------------------------------------
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO)
+    command = argv[0] if argv else "migrate"
+
+    if command == "status":
+        pending = pending_migrations()
+        print(f"{len(MIGRATIONS) - len(pending)}/{len(MIGRATIONS)} migrations applied")
+        for version, name, _ in pending:
+            print(f"pending: {version:04d}_{name}")
+        return 0
+
+    if command == "migrate":
+        count = run_migrations()
+        print(f"Applied {count} migration(s)")
+        return 0
+
+    print("usage: python -m app.db_auto_migrate [migrate|status]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
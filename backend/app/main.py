@@ -1,20 +1,31 @@
 # backend/app/main.py
 
 import os
-import json
-import hmac
-import hashlib
 import logging
-from typing import Dict, Any
 
-import psycopg2
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request
 
 from .db_auto_migrate import run_migrations
+from app.db import db_connection, get_pool, pool_stats, close_pool
+from app.db_async import shutdown_db_executor
+from app.services.pro_service import pro_cache_stats
+from app.services.paystack_client import get_paystack_client, close_paystack_client
+from app.services.checkout_cache import checkout_cache
+from app.services.paystack_webhooks import receive_paystack_webhook, webhook_processor
+from app.services.paystack_reconcile import payment_reconciler
+from app.services.pro_expiry import pro_expiry_sweeper
+from app.services.telegram_rate_limiter import telegram_rate_limiter
+from app.services.conversation_store import CONVERSATION_STORE, conversation_store
+from app.services.roster_pricing import roster_pricer
+from app.services.ratecard import ratecard_exporter
+from app.services.pricing_config import pricing_config_manager
+from app.services.fx_rates import fx_refresher
+from app.services.pricing_cache import pricing_cache
 
 # Telegram Webhook Router + App
 from app.routes.telegram_webhook import router as telegram_router
-from app.routes.telegram_webhook import telegram_app
+from app.routes.telegram_webhook import telegram_app, update_queue, update_dedup, TELEGRAM_UPDATE_MODE
+from bot.handlers.text_router import callback_router
 
 # Sub-routers
 from app.routes.pricing import router as pricing_router
@@ -33,20 +44,12 @@ def get_required_env(name: str) -> str:
         raise RuntimeError(f"❌ Missing required env var: {name}")
     return value
 
-DATABASE_URL = get_required_env("DATABASE_URL")
 PAYSTACK_SECRET_KEY = get_required_env("PAYSTACK_SECRET_KEY")
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # optional
 
-
-# ============================================================
-# DB CONNECTION (Supabase / Render)
-# ============================================================
-def get_db():
-    return psycopg2.connect(
-        DATABASE_URL,
-        sslmode="require",
-        connect_timeout=5,
-    )
+# set to "false" to skip migrations at boot and run them out of band:
+#   python -m app.db_auto_migrate
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").strip().lower() != "false"
 
 
 # ============================================================
@@ -67,13 +70,35 @@ async def startup_event():
     logger.info("🚀 Backend starting up...")
 
     # 1) DATABASE MIGRATIONS
+    if RUN_MIGRATIONS_ON_STARTUP:
+        try:
+            applied = run_migrations()
+            logger.info(f"🛠 DB migrations complete ({applied} applied)")
+        except Exception as e:
+            logger.error(f"❌ Migration error: {e}")
+    else:
+        logger.info("⏭ DB migrations skipped (RUN_MIGRATIONS_ON_STARTUP=false)")
+
+    # 2) DB POOL WARM-UP (keeps DB_POOL_MIN_SIZE connections ready)
     try:
-        run_migrations()
-        logger.info("🛠 DB migrations complete")
+        get_pool().warm()
+        logger.info(f"🗄 DB pool ready: {pool_stats()}")
     except Exception as e:
-        logger.error(f"❌ Migration error: {e}")
+        logger.error(f"❌ DB pool warm-up failed: {e}")
+
+    # 2a) PRICING CONFIG (loads the published config, then polls for new revisions)
+    await pricing_config_manager.start()
+
+    # 2b) FX RATES (USD / foreign-currency figures; refreshed in the background)
+    await fx_refresher.start()
+
+    # 2c) PAYSTACK WEBHOOK INBOX PROCESSOR
+    await webhook_processor.start()
+
+    # 2d) PAYSTACK RECONCILIATION (resolves pending payments whose webhook never came)
+    await payment_reconciler.start()
 
-    # 2) TELEGRAM BOT INITIALIZATION
+    # 3) TELEGRAM BOT INITIALIZATION
     try:
         await telegram_app.initialize()
 
@@ -86,21 +111,53 @@ async def startup_event():
 
         logger.info("🤖 Telegram bot initialized successfully")
 
+        if CONVERSATION_STORE == "postgres":
+            await conversation_store.start()
+
+        if TELEGRAM_UPDATE_MODE == "queued":
+            await update_queue.start()
+
     except Exception as e:
         logger.error(f"❌ Telegram init failed: {e}")
 
+    # 4) PRO EXPIRY SWEEPER (expires lapsed PRO + sends renewal reminders)
+    await pro_expiry_sweeper.start(telegram_app.bot)
+
 
 # ============================================================
 # APPLICATION SHUTDOWN
 # ============================================================
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Drain in-flight updates before the bot goes away
+    await pro_expiry_sweeper.stop()
+    await update_queue.stop()
+
+    # Flush pending conversation state once no more updates can run
+    if CONVERSATION_STORE == "postgres":
+        try:
+            await conversation_store.stop()
+        except Exception as e:
+            logger.error(f"❌ Conversation state flush failed: {e}")
+
     try:
         await telegram_app.shutdown()
         logger.info("🛑 Telegram bot shutdown complete")
     except Exception as e:
         logger.error(f"❌ Telegram shutdown failed: {e}")
 
+    await payment_reconciler.stop()
+    await webhook_processor.stop()
+    await fx_refresher.stop()
+    await pricing_config_manager.stop()
+    await close_paystack_client()
+
+    roster_pricer.shutdown()
+    ratecard_exporter.shutdown()
+    shutdown_db_executor()
+    close_pool()
+    logger.info("🛑 DB pool closed")
+
 
 # ============================================================
 # ROUTER REGISTRATION (ORDER MATTERS)
@@ -127,78 +184,46 @@ def health():
 @app.get("/db/test")
 def db_test():
     try:
-        conn = get_db()
-        conn.close()
+        with db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
         return {"db": "ok"}
     except Exception as e:
         return {"db": "error", "detail": str(e)}
 
 
+@app.get("/db/pool")
+def db_pool():
+    return pool_stats()
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "db_pool": pool_stats(),
+        "pro_cache": pro_cache_stats(),
+        "telegram_queue": update_queue.stats(),
+        "telegram_dedup": update_dedup.stats(),
+        "telegram_outbound": telegram_rate_limiter.stats(),
+        "telegram_callbacks": callback_router.stats(),
+        "conversations": conversation_store.stats(),
+        "paystack": get_paystack_client().stats(),
+        "checkout_cache": checkout_cache.stats(),
+        "paystack_webhooks": webhook_processor.stats(),
+        "paystack_reconcile": payment_reconciler.stats(),
+        "pro_expiry": pro_expiry_sweeper.stats(),
+        "roster_uploads": roster_pricer.stats(),
+        "ratecards": ratecard_exporter.stats(),
+        "pricing_config": pricing_config_manager.stats(),
+        "fx": fx_refresher.stats(),
+        "pricing_cache": pricing_cache.stats(),
+    }
+
+
 # ============================================================
 # PAYSTACK WEBHOOK (PRO ACTIVATION)
 # ============================================================
 @app.post("/paystack/webhook")
 async def paystack_webhook(request: Request):
-    raw_body = await request.body()
-    signature = request.headers.get("x-paystack-signature")
-
-    if not signature:
-        raise HTTPException(status_code=400, detail="Missing Paystack signature")
-
-    expected = hmac.new(
-        PAYSTACK_SECRET_KEY.encode(),
-        raw_body,
-        hashlib.sha512
-    ).hexdigest()
-
-    if not hmac.compare_digest(signature, expected):
-        raise HTTPException(status_code=400, detail="Invalid Paystack signature")
-
-    event = json.loads(raw_body)
-
-    if event.get("event") != "charge.success":
-        logger.info("📨 Non-billing webhook received — ignored.")
-        return {"status": "ignored"}
-
-    data = event.get("data", {})
-    reference = data.get("reference")
-    meta = data.get("metadata", {}) or {}
-    telegram_id = str(meta.get("telegram_id"))
-
-    if not reference or not telegram_id:
-        logger.error("❌ Webhook missing reference or telegram_id")
-        return {"status": "invalid"}
-
-    conn = get_db()
-    try:
-        cur = conn.cursor()
-
-        cur.execute(
-            "UPDATE payments SET status='success', paid_at=CURRENT_TIMESTAMP WHERE reference=%s",
-            (reference,),
-        )
-
-        cur.execute(
-            """
-            INSERT INTO creators (telegram_id, is_pro, pro_activated_at, pro_expires_at, whitelisting_enabled)
-            VALUES (%s, TRUE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + INTERVAL '365 days', TRUE)
-            ON CONFLICT (telegram_id)
-            DO UPDATE SET
-                is_pro = TRUE,
-                pro_activated_at = CURRENT_TIMESTAMP,
-                pro_expires_at = CURRENT_TIMESTAMP + INTERVAL '365 days',
-                whitelisting_enabled = TRUE
-            """,
-            (telegram_id,)
-        )
-
-        conn.commit()
-    except Exception as e:
-        logger.error(f"❌ Webhook DB error → {e}")
-        conn.rollback()
-        raise HTTPException(status_code=500, detail="Internal Error")
-    finally:
-        conn.close()
-
-    logger.info(f"🎉 PRO Activated for Telegram User {telegram_id} (Ref: {reference})")
-    return {"status": "upgraded", "telegram_id": telegram_id}
+    return await receive_paystack_webhook(request)
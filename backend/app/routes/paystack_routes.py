@@ -2,15 +2,17 @@
 
 import os
 import uuid
-import hmac
-import hashlib
 import logging
 from typing import Dict, Any
 
-import requests
-import psycopg2
 from fastapi import APIRouter, HTTPException, Request
 
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.paystack_client import get_paystack_client, PaystackError, PaystackUnavailable
+from app.services.checkout_cache import checkout_cache
+from app.services.paystack_webhooks import receive_paystack_webhook
+
 logger = logging.getLogger("creator-backend.paystack")
 
 router = APIRouter(prefix="/paystack", tags=["paystack"])
@@ -26,25 +28,26 @@ def get_required_env(name: str) -> str:
     return value
 
 PAYSTACK_SECRET_KEY = get_required_env("PAYSTACK_SECRET_KEY")
-DATABASE_URL = get_required_env("DATABASE_URL")
 
 
 # -------------------------------------------------
-# DB HELPERS
+# INIT PAYMENT (Supports Bot Payload)
 # -------------------------------------------------
-def get_db():
-    return psycopg2.connect(
-        DATABASE_URL,
-        sslmode="require",
-        connect_timeout=5,
-    )
+def insert_pending_payment(reference: str, telegram_id: str, amount: int, plan: str) -> None:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO payments (reference, telegram_id, amount, plan, status)
+            VALUES (%s, %s, %s, %s, 'pending')
+            """,
+            (reference, telegram_id, amount, plan),
+        )
+        conn.commit()
 
 
-# -------------------------------------------------
-# INIT PAYMENT (Supports Bot Payload)
-# -------------------------------------------------
 @router.post("/init")
-def init_payment(payload: Dict[str, Any]):
+async def init_payment(payload: Dict[str, Any]):
     """
     Initialize Paystack PRO subscription payment.
 
@@ -62,7 +65,6 @@ def init_payment(payload: Dict[str, Any]):
         email = f"user{telegram_id}@gmail.com"
         amount = 1_000_000  # ₦10,000 one-time PRO
         plan = "PRO"
-        reference = str(uuid.uuid4())
 
     # -----------------------
     # MODE 2: LEGACY BOT /pay
@@ -73,127 +75,45 @@ def init_payment(payload: Dict[str, Any]):
         metadata = payload.get("metadata") or {}
         telegram_id = metadata.get("telegram_id")
         plan = "LEGACY"
-        reference = str(uuid.uuid4())
 
         if not email or not telegram_id or not amount:
             raise HTTPException(400, "Missing email, telegram_id or amount")
 
-    # -----------------------
-    # Paystack call
-    # -----------------------
-    resp = requests.post(
-        "https://api.paystack.co/transaction/initialize",
-        headers={
-            "Authorization": f"Bearer {PAYSTACK_SECRET_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "email": email,
-            "amount": amount,
-            "reference": reference,
-            "metadata": {
-                "telegram_id": str(telegram_id),
-                "plan": plan
-            },
-        },
-        timeout=15,
-    )
-
-    if not resp.ok:
-        logger.error("Paystack init failed: %s", resp.text)
-        raise HTTPException(400, "Paystack init failed")
+    async def create_checkout() -> Dict[str, Any]:
+        reference = str(uuid.uuid4())
 
-    # -----------------------
-    # DB INSERT
-    # -----------------------
-    conn = get_db()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO payments (reference, telegram_id, amount, plan, status)
-            VALUES (%s, %s, %s, %s, 'pending')
-            """,
-            (reference, str(telegram_id), amount, plan),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+        # -----------------------
+        # Paystack call
+        # -----------------------
+        try:
+            data = await get_paystack_client().initialize_transaction(
+                email=email,
+                amount=amount,
+                reference=reference,
+                metadata={
+                    "telegram_id": str(telegram_id),
+                    "plan": plan
+                },
+            )
+        except PaystackUnavailable:
+            raise HTTPException(503, "Paystack unavailable")
+        except PaystackError as e:
+            logger.error("Paystack init failed: %s", e)
+            raise HTTPException(400, "Paystack init failed")
+
+        # -----------------------
+        # DB INSERT
+        # -----------------------
+        await run_db(insert_pending_payment, reference, str(telegram_id), amount, plan)
 
-    return resp.json().get("data", {})
+        return data
+
+    # Repeat taps reuse the pending checkout; concurrent taps share one Paystack call
+    return await checkout_cache.get_or_create(telegram_id, plan, amount, create_checkout)
 
 # -------------------------------------------------
-# PAYSTACK WEBHOOK (Handles charge.success)
+# PAYSTACK WEBHOOK (durable inbox, see paystack_webhooks)
 # -------------------------------------------------
 @router.post("/webhook")
 async def paystack_webhook(request: Request):
-    raw_body = await request.body()
-    signature = request.headers.get("x-paystack-signature")
-
-    if not signature:
-        raise HTTPException(400, "Missing Paystack signature")
-
-    expected = hmac.new(
-        PAYSTACK_SECRET_KEY.encode(),
-        raw_body,
-        hashlib.sha512
-    ).hexdigest()
-
-    if not hmac.compare_digest(expected, signature):
-        raise HTTPException(400, "Invalid Paystack signature")
-
-    try:
-        payload = await request.json()
-    except:
-        raise HTTPException(400, "Invalid JSON")
-
-    if payload.get("event") != "charge.success":
-        return {"status": "ignored"}
-
-    data = payload.get("data") or {}
-    metadata = data.get("metadata") or {}
-
-    reference = data.get("reference")
-    telegram_id = metadata.get("telegram_id")
-    plan = metadata.get("plan")
-
-    if not reference or not telegram_id:
-        logger.warning("Webhook missing fields")
-        return {"status": "ignored"}
-
-    conn = get_db()
-    try:
-        cur = conn.cursor()
-
-        # Mark payment as success
-        cur.execute(
-            "UPDATE payments SET status='success', paid_at=CURRENT_TIMESTAMP WHERE reference=%s",
-            (reference,),
-        )
-
-        # Enable PRO for 30 days
-        if plan == "PRO":
-            cur.execute(
-                """
-                INSERT INTO creators (telegram_id, is_pro, pro_activated_at, pro_expires_at)
-                VALUES (%s, TRUE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + INTERVAL '30 days')
-                ON CONFLICT (telegram_id)
-                DO UPDATE SET
-                    is_pro = TRUE,
-                    pro_activated_at = CURRENT_TIMESTAMP,
-                    pro_expires_at = CURRENT_TIMESTAMP + INTERVAL '30 days'
-                """,
-                (telegram_id,)
-            )
-
-        conn.commit()
-
-    except Exception as e:
-        logger.error(f"Webhook DB error: {e}")
-        conn.rollback()
-        raise HTTPException(500, "Internal Error")
-
-    finally:
-        conn.close()
-
-    return {"status": "subscription_active", "plan": plan}
+    return await receive_paystack_webhook(request)
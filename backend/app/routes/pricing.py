@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
-from app.services.pro_service import is_user_pro
-from app.services.hybrid_pricing_engine import hybrid_pricing_engine
+from app.services.pricing_quote import quote_creator, price_creators
+from app.services.fx_rates import current_fx, convert_all
 
 router = APIRouter(prefix="/pricing", tags=["Pricing"])
 
@@ -15,30 +15,37 @@ class PricingPayload(BaseModel):
     platform: str
     niche: str
 
+class BatchPricingPayload(BaseModel):
+    telegram_id: Optional[str] = None
+    followers: List[Optional[int]]
+    avg_views: List[Optional[int]]
+    engagement_rate: List[Optional[float]]
+    platform: List[str]
+    niche: List[str]
+    mode: str = "range"
+
+MAX_BATCH_ROWS = 50_000
+
 @router.post("/calculate")
 def calculate_pricing(data: PricingPayload):
     if not data.platform or not data.niche:
         raise HTTPException(status_code=400, detail="platform and niche are required")
 
-    try:
-        pro_user = is_user_pro(data.telegram_id)
-    except Exception:
-        pro_user = False
-
-    result = hybrid_pricing_engine(
+    quote = quote_creator(
+        telegram_id=data.telegram_id,
         followers=data.followers,
         avg_views=data.avg_views,
         engagement=data.engagement_rate,
         platform=data.platform,
         niche=data.niche,
-        is_pro=pro_user,
         mode="single"
     )
 
-    if result.get("error"):
+    if quote.result.get("error"):
         raise HTTPException(status_code=400, detail="insufficient_data")
 
-    return result
+    # cached quotes carry their JSON body: no re-serialization on a hit
+    return Response(content=quote.body(), media_type="application/json")
 
 
 @router.post("/range")
@@ -46,22 +53,56 @@ def calculate_pricing_range(data: PricingPayload):
     if not data.platform or not data.niche:
         raise HTTPException(status_code=400, detail="platform and niche are required")
 
-    try:
-        pro_user = is_user_pro(data.telegram_id)
-    except Exception:
-        pro_user = False
-
-    result = hybrid_pricing_engine(
+    quote = quote_creator(
+        telegram_id=data.telegram_id,
         followers=data.followers,
         avg_views=data.avg_views,
         engagement=data.engagement_rate,
         platform=data.platform,
         niche=data.niche,
-        is_pro=pro_user,
         mode="range"
     )
 
-    if result.get("error"):
-        return result
+    return Response(content=quote.body(), media_type="application/json")
+
+
+@router.post("/batch")
+def calculate_pricing_batch(data: BatchPricingPayload):
+    """
+    Prices a whole roster in one call.
+    Columns are parallel arrays; PRO status is looked up once for the caller.
+    """
+    n = len(data.followers)
+    columns = (data.avg_views, data.engagement_rate, data.platform, data.niche)
+    if any(len(col) != n for col in columns):
+        raise HTTPException(status_code=400, detail="all columns must have the same length")
+
+    if n > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=400, detail=f"batch too large (max {MAX_BATCH_ROWS} rows)")
+
+    if data.mode not in ("single", "range"):
+        raise HTTPException(status_code=400, detail="mode must be 'single' or 'range'")
+
+    results = price_creators(
+        telegram_id=data.telegram_id,
+        followers=data.followers,
+        avg_views=data.avg_views,
+        engagement=data.engagement_rate,
+        platform=data.platform,
+        niche=data.niche,
+        mode=data.mode
+    )
+
+    return {"count": n, "results": results}
+
 
-    return result
+@router.get("/fx")
+def fx_rates(amount_ngn: Optional[float] = None):
+    """
+    Current FX snapshot (NGN per unit, staleness) and, if `amount_ngn`
+    is given, that amount in every supported currency.
+    """
+    snapshot = current_fx().to_dict()
+    if amount_ngn is not None:
+        snapshot["converted"] = dict(convert_all(amount_ngn))
+    return snapshot
@@ -2,16 +2,22 @@
 
 import os
 import logging
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, HTTPException
 from telegram import Update
 from telegram.ext import (
     Application,
     CommandHandler,
     CallbackQueryHandler,
+    ContextTypes,
     MessageHandler,
     filters,
 )
 
+from app.services.update_queue import UpdateQueue
+from app.services.update_dedup import UpdateDeduplicator
+from app.services.telegram_rate_limiter import telegram_rate_limiter
+from app.services.conversation_store import CONVERSATION_STORE, StoredCallbackContext, conversation_store
+
 logger = logging.getLogger("telegram-webhook")
 
 # -------------------------------------------------
@@ -21,15 +27,29 @@ BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 if not BOT_TOKEN:
     raise RuntimeError("TELEGRAM_BOT_TOKEN is missing")
 
+# "queued" → ack at once, process on worker queue; "inline" → process inside the request
+TELEGRAM_UPDATE_MODE = os.getenv("TELEGRAM_UPDATE_MODE", "queued").strip().lower()
+TELEGRAM_QUEUE_WORKERS = int(os.getenv("TELEGRAM_QUEUE_WORKERS", "8"))
+TELEGRAM_QUEUE_MAXSIZE = int(os.getenv("TELEGRAM_QUEUE_MAXSIZE", "1000"))
+
+# "true" → also dedup update_ids across workers via the telegram_updates table
+TELEGRAM_DEDUP_SHARED = os.getenv("TELEGRAM_DEDUP_SHARED", "false").strip().lower() == "true"
+
 # -------------------------------------------------
 # TELEGRAM APPLICATION
 # -------------------------------------------------
-telegram_app: Application = (
+_builder = (
     Application.builder()
     .token(BOT_TOKEN)
-    .build()
+    .rate_limiter(telegram_rate_limiter)   # per-chat + global send pacing, RetryAfter retries
 )
 
+# user_data from the shared Postgres store instead of per-process dicts
+if CONVERSATION_STORE == "postgres":
+    _builder = _builder.context_types(ContextTypes(context=StoredCallbackContext))
+
+telegram_app: Application = _builder.build()
+
 # -------------------------------------------------
 # IMPORT HANDLERS
 # -------------------------------------------------
@@ -39,20 +59,15 @@ from bot.handlers.deal import deal_script, deal_step_handler
 from bot.handlers.subscribe import subscribe_command, pay_command, upgrade_pro
 from bot.handlers.status import status
 from bot.handlers.text_router import text_router, callback_router
-from bot.handlers.callbacks_platform import platform_selected
-from bot.callbacks_niche import niche_selected
-from bot.handlers.elite_package import elite_package_start, elite_package_step
+from bot.handlers.elite_package import elite_package_step
+from bot.handlers.roster import roster_upload
 
 
 # -------------------------------------------------
 # CALLBACK HANDLERS (ORDER MATTERS)
 # -------------------------------------------------
-telegram_app.add_handler(CallbackQueryHandler(platform_selected, pattern=r"^platform_"))
-telegram_app.add_handler(CallbackQueryHandler(niche_selected, pattern=r"^niche_"))
-telegram_app.add_handler(CallbackQueryHandler(elite_package_start, pattern=r"^elite_package"))
-
-# NEW: global callback router for PRO upgrades
-telegram_app.add_handler(CallbackQueryHandler(callback_router))
+# single dispatcher: decode callback_data → dict lookup by action
+telegram_app.add_handler(CallbackQueryHandler(callback_router.dispatch))
 
 
 # -------------------------------------------------
@@ -71,6 +86,36 @@ telegram_app.add_handler(CommandHandler("status", status))
 telegram_app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, text_router))
 
 
+# -------------------------------------------------
+# ROSTER UPLOADS (CSV / XLSX → priced CSV)
+# -------------------------------------------------
+telegram_app.add_handler(MessageHandler(
+    filters.Document.FileExtension("csv") | filters.Document.FileExtension("xlsx"),
+    roster_upload,
+))
+
+
+# -------------------------------------------------
+# UPDATE PROCESSING (conversation state loaded / saved around each update)
+# -------------------------------------------------
+if CONVERSATION_STORE == "postgres":
+    process_update = conversation_store.wrap(telegram_app.process_update)
+else:
+    process_update = telegram_app.process_update
+
+
+# -------------------------------------------------
+# UPDATE QUEUE (started / drained by app.main lifecycle)
+# -------------------------------------------------
+update_queue = UpdateQueue(
+    process_update,
+    workers=TELEGRAM_QUEUE_WORKERS,
+    maxsize=TELEGRAM_QUEUE_MAXSIZE,
+)
+
+update_dedup = UpdateDeduplicator(shared=TELEGRAM_DEDUP_SHARED)
+
+
 # -------------------------------------------------
 # FASTAPI ROUTER
 # -------------------------------------------------
@@ -83,12 +128,31 @@ router = APIRouter(prefix="/telegram")
 async def telegram_webhook(request: Request):
     """
     Receives Telegram webhook updates and routes them to python-telegram-bot.
+    Queued mode returns 200 as soon as the update is enqueued; if the queue
+    stays full we return 503 so Telegram redelivers later.
     """
     payload = await request.json()
 
     try:
         update = Update.de_json(payload, telegram_app.bot)
-        await telegram_app.process_update(update)
+    except Exception as e:
+        logger.error(f"❌ Invalid Telegram update: {e}")
+        return {"ok": True}
+
+    # Redelivered update → already handled (or in flight), just ack
+    if await update_dedup.is_duplicate(update.update_id):
+        logger.info(f"🔁 Duplicate Telegram update {update.update_id} ignored")
+        return {"ok": True}
+
+    if update_queue.running:
+        if not await update_queue.submit(update):
+            logger.warning(f"⚠️ Update queue full, deferring update {update.update_id}")
+            await update_dedup.release(update.update_id)
+            raise HTTPException(status_code=503, detail="busy")
+        return {"ok": True}
+
+    try:
+        await process_update(update)
     except Exception as e:
         logger.error(f"❌ Error processing Telegram update: {e}")
 
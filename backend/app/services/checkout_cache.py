@@ -0,0 +1,102 @@
+# backend/app/services/checkout_cache.py
+
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
+
+from app.utils.cache import TTLCache, MISSING
+
+logger = logging.getLogger("creator-backend.checkout-cache")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# How long an unpaid authorization_url is handed out again instead of
+# creating a new Paystack transaction + payments row (0 disables reuse)
+PAYSTACK_CHECKOUT_REUSE_SECONDS = float(os.getenv("PAYSTACK_CHECKOUT_REUSE_SECONDS", "1800"))
+PAYSTACK_CHECKOUT_CACHE_SIZE = int(os.getenv("PAYSTACK_CHECKOUT_CACHE_SIZE", "10000"))
+
+CHECKOUT_PLANS = ("PRO", "LEGACY")
+
+CheckoutKey = Tuple[str, str]
+
+
+class CheckoutCache:
+    """
+    Pending-checkout cache keyed by (telegram_id, plan).
+
+    - A still-valid checkout (same amount) is reused for the whole window.
+    - Concurrent requests for the same key are collapsed (single-flight):
+      only the first calls Paystack, the rest await its result.
+    - invalidate_user() drops entries once the user has paid.
+    """
+
+    def __init__(self, ttl: float = PAYSTACK_CHECKOUT_REUSE_SECONDS, maxsize: int = PAYSTACK_CHECKOUT_CACHE_SIZE):
+        self.enabled = ttl > 0
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=max(ttl, 1))
+        self._inflight: Dict[CheckoutKey, "asyncio.Future[Dict[str, Any]]"] = {}
+
+        self.created = 0
+        self.reused = 0
+        self.collapsed = 0
+
+    async def get_or_create(
+        self,
+        telegram_id: Union[str, int],
+        plan: str,
+        amount: int,
+        create: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Returns a checkout dict (authorization_url, reference, ...) for the user,
+        calling `create()` only when nothing reusable exists or is in flight.
+        """
+        key = (str(telegram_id), plan)
+
+        if self.enabled:
+            cached = self._cache.get(key)
+            if cached is not MISSING and cached.get("amount") == amount:
+                self.reused += 1
+                return cached["data"]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.collapsed += 1
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await create()
+            self.created += 1
+            if self.enabled:
+                self._cache.set(key, {"amount": amount, "data": data})
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_user(self, telegram_id: Union[str, int]) -> None:
+        for plan in CHECKOUT_PLANS:
+            self._cache.invalidate((str(telegram_id), plan))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "created": self.created,
+            "reused": self.reused,
+            "collapsed": self.collapsed,
+            "inflight": len(self._inflight),
+            "cache": self._cache.stats(),
+        }
+
+
+checkout_cache = CheckoutCache()
@@ -0,0 +1,371 @@
+# backend/app/services/conversation_store.py
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+from telegram import Update
+from telegram.ext import CallbackContext, ExtBot
+
+from app.db import db_connection
+from app.db_async import run_db
+
+logger = logging.getLogger("telegram-conversations")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# "postgres" → user_data lives in conversation_state (multi-worker safe)
+# "memory"   → PTB's in-process dicts (single worker only)
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "postgres").strip().lower()
+
+# abandoned flows are dropped after this long without an update
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", str(24 * 3600)))
+# write-behind: dirty states are flushed in one batch this often
+CONVERSATION_FLUSH_INTERVAL = float(os.getenv("CONVERSATION_FLUSH_INTERVAL", "1.0"))
+CONVERSATION_FLUSH_BATCH = 500            # rows per INSERT statement
+# per-process cap on loaded states (least recently used are unloaded first)
+CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "5000"))
+CONVERSATION_IDLE_EVICT = float(os.getenv("CONVERSATION_IDLE_EVICT", "600"))
+# "false" → a loaded state is authoritative (one worker, as in the
+# Procfile), writes are batched — no DB round trip on a warm update;
+# "true" → re-read from Postgres on every update (other workers may have
+# moved the flow on) and write the state back before the update is acked.
+# Set it when running more than one worker / instance.
+CONVERSATION_SHARED = os.getenv("CONVERSATION_SHARED", "false").strip().lower() == "true"
+
+# run the DB TTL purge every N flushes
+_PURGE_EVERY = 600
+
+
+class _Entry:
+    __slots__ = ("data", "saved", "touched", "inflight")
+
+    def __init__(self, data: Dict[str, Any], saved: str):
+        self.data = data
+        self.saved = saved          # JSON last written to / read from the DB
+        self.touched = time.monotonic()
+        self.inflight = 0
+
+
+def _encode(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def _encode_state(user_id: int, data: Dict[str, Any]) -> str:
+    """
+    JSON for a user's state. Keys whose value would not come back unchanged
+    after a reload (datetimes, Decimals, tuples, non-str keys, NaN, ...)
+    stay in memory but are not persisted, and are logged so the handler
+    storing them gets fixed.
+    """
+    try:
+        encoded = _encode(data)
+        if json.loads(encoded) == data:
+            return encoded
+    except (TypeError, ValueError):
+        pass
+
+    kept: Dict[str, Any] = {}
+    dropped: List[str] = []
+    for key, value in data.items():
+        try:
+            if isinstance(key, str) and json.loads(_encode({key: value})) == {key: value}:
+                kept[key] = value
+                continue
+        except (TypeError, ValueError):
+            pass
+        dropped.append(repr(key))
+
+    logger.error(f"❌ Conversation state for {user_id}: not persisting non-JSON value(s) for {', '.join(dropped)}")
+    return _encode(kept)
+
+
+class ConversationStore:
+    """
+    Lazy, write-behind store for PTB user_data.
+
+    - load on demand: a user's state is read (one PK lookup) only when an
+      update from that user is processed — nothing is loaded at startup.
+    - write-behind: after each update the state is compared with what was
+      last saved; changed states are upserted in batches every
+      `flush_interval` seconds (emptied states are deleted).
+    - write-through when `shared`: the next update from this user may land
+      on another worker, so a changed state is written in release(),
+      before the update is acked (inline webhook mode). With the update
+      queue, Telegram is acked on enqueue, so the next update can still
+      overtake an unfinished one; run one queue worker per user (sticky
+      routing) if flows must never see a stale state.
+    - eviction: at most `maxsize` states stay in memory; idle, clean states
+      are unloaded. Rows untouched for `ttl` seconds are purged from the DB
+      and ignored on load, so abandoned flows expire.
+    """
+
+    def __init__(
+        self,
+        ttl: int = CONVERSATION_TTL,
+        flush_interval: float = CONVERSATION_FLUSH_INTERVAL,
+        maxsize: int = CONVERSATION_CACHE_SIZE,
+        idle_evict: float = CONVERSATION_IDLE_EVICT,
+        shared: bool = CONVERSATION_SHARED,
+    ):
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.maxsize = maxsize
+        self.idle_evict = idle_evict
+        self.shared = shared
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._dirty: Dict[int, str] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._flushes = 0
+
+        self.loads = 0
+        self.hits = 0
+        self.writes = 0
+        self.deletes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    # ---------- PTB hook ----------
+    def get(self, user_id: int) -> Dict[str, Any]:
+        """
+        user_data for a user being processed (see StoredCallbackContext).
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            # handler touched a user outside process_update (e.g. a job)
+            entry = self._entries[user_id] = _Entry({}, _encode({}))
+        return entry.data
+
+    def wrap(self, process: Callable[[Update], Awaitable[Any]]) -> Callable[[Update], Awaitable[Any]]:
+        """
+        Wraps Application.process_update: load before, save (or mark dirty) after.
+        """
+        async def process_update(update: Update) -> Any:
+            user = update.effective_user
+            if user is None:
+                return await process(update)
+
+            await self.acquire(user.id)
+            try:
+                return await process(update)
+            finally:
+                await self.release(user.id)
+
+        return process_update
+
+    # ---------- load / release ----------
+    async def acquire(self, user_id: int) -> Dict[str, Any]:
+        entry = self._entries.get(user_id)
+
+        # local copy is authoritative while in use, unflushed, or single-worker
+        if entry is not None and (entry.inflight or user_id in self._dirty or not self.shared):
+            self.hits += 1
+        else:
+            try:
+                raw = await run_db(_load_state, user_id, self.ttl)
+                self.loads += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Conversation state load failed for {user_id} → {e}")
+                raw = None if entry is None else entry.saved
+
+            data = json.loads(raw) if raw else {}
+            if entry is None:
+                entry = self._entries[user_id] = _Entry(data, raw or _encode({}))
+            elif entry.inflight == 0:
+                entry.data.clear()
+                entry.data.update(data)
+                entry.saved = raw or _encode({})
+
+        entry.inflight += 1
+        entry.touched = time.monotonic()
+        self._entries.move_to_end(user_id)
+        return entry.data
+
+    async def release(self, user_id: int) -> None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+
+        entry.inflight -= 1
+        entry.touched = time.monotonic()
+
+        encoded = _encode_state(user_id, entry.data)
+        if encoded != entry.saved:
+            self._dirty[user_id] = encoded
+            entry.saved = encoded
+            if self.shared:
+                await self._write_through(user_id)
+        self._evict()
+
+    async def _write_through(self, user_id: int) -> None:
+        """
+        Writes one user's dirty state now. On failure the state stays dirty
+        for the background flush (the update is still acked).
+        """
+        state = self._dirty.pop(user_id, None)
+        if state is None:
+            return
+
+        upserts = [(user_id, state)] if state != "{}" else []
+        deletes = [] if upserts else [user_id]
+        try:
+            await run_db(_write_states, upserts, deletes, None)
+        except Exception as e:
+            # a newer state dirtied meanwhile wins
+            self._dirty.setdefault(user_id, state)
+            self.errors += 1
+            logger.error(f"❌ Conversation write-through failed for {user_id} → {e}")
+            return
+
+        self.writes += len(upserts)
+        self.deletes += len(deletes)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while len(self._entries) > self.maxsize:
+            user_id, entry = next(iter(self._entries.items()))
+            if entry.inflight or user_id in self._dirty:
+                break
+            del self._entries[user_id]
+            self.evictions += 1
+
+        # oldest first: stop at the first entry that is still fresh
+        while self._entries:
+            user_id, entry = next(iter(self._entries.items()))
+            if now - entry.touched < self.idle_evict or entry.inflight or user_id in self._dirty:
+                break
+            del self._entries[user_id]
+            self.evictions += 1
+
+    # ---------- write-behind ----------
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="conversation-flusher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Conversation flush failed → {e}")
+
+    async def flush(self) -> None:
+        purge = self._flushes % _PURGE_EVERY == 0
+        self._flushes += 1
+        if not self._dirty and not purge:
+            return
+
+        batch, self._dirty = self._dirty, {}
+
+        upserts = [(uid, state) for uid, state in batch.items() if state != "{}"]
+        deletes = [uid for uid, state in batch.items() if state == "{}"]
+
+        try:
+            await run_db(_write_states, upserts, deletes, self.ttl if purge else None)
+        except Exception:
+            # keep the newer of (failed batch, anything dirtied meanwhile)
+            for uid, state in batch.items():
+                self._dirty.setdefault(uid, state)
+            raise
+
+        self.writes += len(upserts)
+        self.deletes += len(deletes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": CONVERSATION_STORE,
+            "shared": self.shared,
+            "loaded": len(self._entries),
+            "dirty": len(self._dirty),
+            "loads": self.loads,
+            "hits": self.hits,
+            "writes": self.writes,
+            "deletes": self.deletes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+# -------------------------------------------------
+# PTB CONTEXT (user_data served from the store)
+# -------------------------------------------------
+class StoredCallbackContext(CallbackContext[ExtBot, Dict[Any, Any], Dict[Any, Any], Dict[Any, Any]]):
+    """
+    context.user_data comes from conversation_store instead of the
+    Application's in-process dict (which would grow without bound).
+    """
+
+    @property
+    def user_data(self) -> Optional[Dict[Any, Any]]:
+        if self._user_id is not None:
+            return conversation_store.get(self._user_id)
+        return None
+
+
+# -------------------------------------------------
+# DB SIDE (conversation_state table)
+# -------------------------------------------------
+def _load_state(user_id: int, ttl: int) -> Optional[str]:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT data::text FROM conversation_state
+            WHERE user_id = %s
+              AND updated_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            """,
+            (user_id, ttl),
+        )
+        row = cur.fetchone()
+        conn.rollback()
+
+    return row[0] if row else None
+
+
+def _write_states(upserts: List[Tuple[int, str]], deletes: List[int], purge_ttl: Optional[int]) -> None:
+    with db_connection() as conn:
+        cur = conn.cursor()
+
+        if upserts:
+            execute_values(
+                cur,
+                """
+                INSERT INTO conversation_state (user_id, data) VALUES %s
+                ON CONFLICT (user_id)
+                DO UPDATE SET data = EXCLUDED.data, updated_at = CURRENT_TIMESTAMP
+                """,
+                upserts,
+                template="(%s, %s::jsonb)",
+                page_size=CONVERSATION_FLUSH_BATCH,
+            )
+
+        if deletes:
+            cur.execute("DELETE FROM conversation_state WHERE user_id = ANY(%s)", (deletes,))
+
+        if purge_ttl is not None:
+            cur.execute(
+                "DELETE FROM conversation_state WHERE updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)",
+                (purge_ttl,),
+            )
+
+        conn.commit()
+
+
+conversation_store = ConversationStore()
@@ -0,0 +1,389 @@
+# backend/app/services/fx_rates.py
+#
+# Live FX rates for the USD (and other foreign-currency) figures next to
+# our NGN prices. A background refresher pulls rates from a pluggable
+# source and installs them as an immutable FxSnapshot; readers just take
+# the current reference (current_fx()), so pricing never waits on a fetch.
+#
+#   FX_SOURCE=""                          → no live rates: usd_* use the
+#                                           pricing config's usd_to_ngn
+#   FX_SOURCE=/path/rates.json            → JSON file, re-read every refresh
+#   FX_SOURCE=https://…                   → JSON over HTTP
+#   FX_SOURCE=static:USD=1550,GBP=1960    → fixed NGN rates (tests / local dev)
+#
+# File and HTTP payloads use the usual {"base": "USD", "rates": {"NGN": 1550,
+# "GBP": 0.79, ...}} shape (units of each currency per one `base`), with any
+# base that has an NGN rate.
+
+import os
+import json
+import math
+import time
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger("creator-backend.fx")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+FX_SOURCE = os.getenv("FX_SOURCE", "").strip()
+FX_CURRENCIES = tuple(
+    c.strip().upper() for c in os.getenv("FX_CURRENCIES", "USD,GBP,EUR,KES,GHS").split(",") if c.strip()
+)
+FX_REFRESH_INTERVAL = float(os.getenv("FX_REFRESH_INTERVAL", "3600"))
+# after a failed refresh, retry sooner than the regular interval
+FX_RETRY_INTERVAL = float(os.getenv("FX_RETRY_INTERVAL", "120"))
+FX_FETCH_TIMEOUT = float(os.getenv("FX_FETCH_TIMEOUT", "10"))
+# rates older than this are still served, but flagged stale
+FX_MAX_AGE = float(os.getenv("FX_MAX_AGE", str(24 * 3600)))
+# a refresh moving any rate by more than this fraction is treated as a bad feed
+FX_MAX_CHANGE = float(os.getenv("FX_MAX_CHANGE", "0.5"))
+
+FX_SYMBOLS = {
+    "USD": "$",
+    "GBP": "£",
+    "EUR": "€",
+    "KES": "KSh ",
+    "GHS": "GH₵",
+}
+
+
+# -------------------------------------------------
+# SNAPSHOT
+# -------------------------------------------------
+class FxSnapshot:
+    """
+    One immutable set of rates: `rates[currency]` is NGN per one unit.
+    `version` fingerprints the rates, so caches of converted figures can
+    key on it; staleness is derived from `fetched_at` at read time.
+    """
+
+    __slots__ = ("rates", "source", "fetched_at", "as_of", "version")
+
+    def __init__(
+        self,
+        rates: Dict[str, float],
+        source: str,
+        fetched_at: Optional[float] = None,
+        as_of: Optional[str] = None,
+    ):
+        self.rates = dict(rates)
+        self.source = source
+        self.fetched_at = fetched_at
+        self.as_of = as_of
+        self.version = hashlib.sha1(json.dumps(self.rates, sort_keys=True).encode()).hexdigest()[:12]
+
+    def rate(self, currency: str) -> Optional[float]:
+        return self.rates.get(currency)
+
+    def convert(self, ngn: Optional[float], currency: str) -> Optional[float]:
+        rate = self.rates.get(currency)
+        if not ngn or not rate:
+            return None
+        return round(ngn / rate, 2)
+
+    def age(self) -> Optional[float]:
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    def is_stale(self, max_age: float = FX_MAX_AGE) -> bool:
+        age = self.age()
+        return age is None or age > max_age
+
+    def to_dict(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            "base": "NGN",
+            "rates": self.rates,
+            "source": self.source,
+            "as_of": self.as_of,
+            "age": round(age, 1) if age is not None else None,
+            "stale": self.is_stale(),
+            "version": self.version,
+        }
+
+
+_snapshot = FxSnapshot({}, source="none")
+
+
+def current_fx() -> FxSnapshot:
+    return _snapshot
+
+
+def install_fx(snapshot: FxSnapshot) -> None:
+    global _snapshot
+    _snapshot = snapshot
+
+
+def convert_all(ngn: Optional[float], currencies: Tuple[str, ...] = FX_CURRENCIES) -> List[Tuple[str, float]]:
+    """
+    (currency, amount) for every currency the current snapshot can convert to.
+    """
+    fx = current_fx()
+    converted = []
+    for currency in currencies:
+        amount = fx.convert(ngn, currency)
+        if amount is not None:
+            converted.append((currency, amount))
+    return converted
+
+
+# -------------------------------------------------
+# SOURCES
+# -------------------------------------------------
+class FxSourceError(RuntimeError):
+    """
+    The source answered, but not with usable rates.
+    """
+
+
+def _positive_rate(value: Any) -> bool:
+    """
+    A usable rate: a finite number above zero (json.load accepts NaN / Infinity).
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) and value > 0
+
+
+def parse_rates(payload: Dict[str, Any], currencies: Tuple[str, ...] = FX_CURRENCIES) -> Tuple[Dict[str, float], Optional[str]]:
+    """
+    {"base": B, "rates": {C: units of C per one B}} → ({C: NGN per one C}, as_of).
+    Currencies the payload doesn't quote are left out.
+    """
+    base = str(payload.get("base") or payload.get("base_code") or "").upper()
+    quoted = payload.get("rates")
+    if not base or not isinstance(quoted, dict):
+        raise FxSourceError("payload needs 'base' and 'rates'")
+
+    per_base = {str(c).upper(): v for c, v in quoted.items()}
+    per_base[base] = 1.0
+
+    ngn = per_base.get("NGN")
+    if not _positive_rate(ngn):
+        raise FxSourceError(f"no NGN rate for base {base}")
+
+    rates: Dict[str, float] = {}
+    for currency in currencies:
+        units = per_base.get(currency)
+        if _positive_rate(units) and _positive_rate(ngn / units):
+            rates[currency] = round(ngn / units, 6)
+
+    if not rates:
+        raise FxSourceError(f"none of {', '.join(currencies)} quoted")
+
+    as_of = payload.get("as_of") or payload.get("date") or payload.get("time_last_update_utc")
+    return rates, str(as_of) if as_of else None
+
+
+class FxSource(ABC):
+    name = "none"
+
+    @abstractmethod
+    async def fetch(self) -> Tuple[Dict[str, float], Optional[str]]:
+        """
+        ({currency: NGN per one unit}, as_of). Raises on failure.
+        """
+
+
+class StaticFxSource(FxSource):
+    """
+    Fixed NGN-per-unit rates (tests, local development).
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self.name = "static"
+        self.rates = dict(rates)
+
+    async def fetch(self) -> Tuple[Dict[str, float], Optional[str]]:
+        return dict(self.rates), None
+
+
+class FileFxSource(FxSource):
+    def __init__(self, path: str):
+        self.name = f"file:{path}"
+        self.path = path
+
+    async def fetch(self) -> Tuple[Dict[str, float], Optional[str]]:
+        # a slow disk / network mount must not stall the event loop
+        return parse_rates(await asyncio.to_thread(self._read))
+
+    def _read(self) -> Dict[str, Any]:
+        with open(self.path) as f:
+            return json.load(f)
+
+
+class HttpFxSource(FxSource):
+    def __init__(self, url: str, timeout: float = FX_FETCH_TIMEOUT):
+        self.name = url.split("?", 1)[0]   # never expose an API key in the query string
+        self.url = url
+        self.timeout = timeout
+
+    async def fetch(self) -> Tuple[Dict[str, float], Optional[str]]:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            resp = await client.get(self.url)
+            resp.raise_for_status()
+            return parse_rates(resp.json())
+
+
+def build_fx_source(spec: str = FX_SOURCE) -> Optional[FxSource]:
+    """
+    FX_SOURCE → source (None when unset). Raises ValueError on a malformed spec.
+    """
+    spec = spec.strip()
+    if not spec or spec.lower() == "none":
+        return None
+    if spec.startswith(("http://", "https://")):
+        return HttpFxSource(spec)
+    if spec.startswith("static:"):
+        rates = {}
+        for pair in spec[len("static:"):].split(","):
+            currency, _, value = pair.partition("=")
+            currency = currency.strip().upper()
+            try:
+                rate = float(value)
+            except ValueError:
+                raise ValueError(f"static rate for {currency or '?'} is not a number: {value!r}")
+            if not currency or not _positive_rate(rate):
+                raise ValueError(f"static rates need CURRENCY=positive number, got {pair.strip()!r}")
+            rates[currency] = rate
+        return StaticFxSource(rates)
+    return FileFxSource(spec[len("file:"):] if spec.startswith("file:") else spec)
+
+
+# -------------------------------------------------
+# REFRESHER
+# -------------------------------------------------
+class FxRefresher:
+    """
+    Background FX refresh.
+
+    - Fetches from `source` every `interval` seconds (every `retry_interval`
+      after a failure) and installs a new FxSnapshot; a failed or rejected
+      fetch keeps the previous snapshot, which then ages into `stale`.
+    - A refresh that moves any rate by more than `max_change` is held back
+      as a likely bad feed (wrong base, decimal slip); it is installed only
+      if the next fetch (after `retry_interval`) returns the same rates.
+    - Readers never wait: current_fx() is a plain reference read.
+    - Without an explicit `source`, `spec` (FX_SOURCE) is parsed in start(),
+      not at import: a malformed spec is logged and FX stays disabled.
+    """
+
+    def __init__(
+        self,
+        source: Optional[FxSource] = None,
+        spec: str = FX_SOURCE,
+        interval: float = FX_REFRESH_INTERVAL,
+        retry_interval: float = FX_RETRY_INTERVAL,
+        fetch_timeout: float = FX_FETCH_TIMEOUT,
+        max_change: float = FX_MAX_CHANGE,
+    ):
+        self.source = source
+        self.spec = spec
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.fetch_timeout = fetch_timeout
+        self.max_change = max_change
+
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup = asyncio.Event()
+
+        self.refreshes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self._held: Optional[str] = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        if self.source is None:
+            try:
+                self.source = build_fx_source(self.spec)
+            except ValueError as e:
+                self.last_error = str(e)
+                logger.error(f"❌ Invalid FX_SOURCE, live FX rates disabled → {e}")
+                return
+        if self.source is None:
+            return
+        # one bounded attempt before serving, then refresh in the background
+        await self._refresh_logged()
+        self._task = asyncio.create_task(self._run(), name="fx-refresher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        ok = True
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.interval if ok else self.retry_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            ok = await self._refresh_logged()
+
+    async def _refresh_logged(self) -> bool:
+        """
+        refresh() with a deadline; failures are counted and logged, never raised.
+        """
+        try:
+            return await asyncio.wait_for(self.refresh(), timeout=self.fetch_timeout)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e) or type(e).__name__
+            logger.error(f"❌ FX refresh failed, keeping rates from {current_fx().as_of or 'startup'} → {self.last_error}")
+            return False
+
+    async def refresh(self) -> bool:
+        """
+        One fetch. Returns True if the new rates were installed.
+        """
+        assert self.source is not None
+        rates, as_of = await self.source.fetch()
+
+        snapshot = FxSnapshot(rates, source=self.source.name, fetched_at=time.time(), as_of=as_of)
+        previous = current_fx()
+
+        for currency, rate in rates.items():
+            old = previous.rate(currency)
+            if old and abs(rate / old - 1) > self.max_change and self._held != snapshot.version:
+                self._held = snapshot.version
+                self.rejected += 1
+                self.last_error = f"{currency} moved {rate / old - 1:+.0%} ({old} → {rate})"
+                logger.error(f"❌ FX update held back until confirmed → {self.last_error}")
+                return False
+
+        install_fx(snapshot)
+        self._held = None
+        self.refreshes += 1
+        self.last_error = None
+        if previous.version != current_fx().version:
+            logger.info(f"💱 FX rates updated: {', '.join(f'{c} {r:,.2f}' for c, r in rates.items())}")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source.name if self.source else "none",
+            "running": self._task is not None,
+            "snapshot": current_fx().to_dict(),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
+fx_refresher = FxRefresher()
+
@@ -1,4 +1,10 @@
-from typing import Optional, Dict, Any
+import json
+import hashlib
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.fx_rates import FxSnapshot, current_fx
 
 # ---------------------------------------------
 # GLOBAL CPM RANGES (USD) — Midpoints used
@@ -80,6 +86,322 @@ PLATFORM_SPREAD = {
 # ---------------------------------------------
 USD_TO_NGN = 1300
 
+# ---------------------------------------------
+# BUILT-IN CONFIG
+# The tables above are the defaults. app.services.pricing_config can
+# install a newer versioned config (file or DB) at runtime; the engine
+# always prices with the currently installed PricingModel.
+# ---------------------------------------------
+BUILTIN_PRICING_TABLES: Dict[str, Any] = {
+    "platform_cpm_usd": PLATFORM_CPM_USD,
+    "floor_platform_mult": FLOOR_PLATFORM_MULT,
+    "niche_mult": NICHE_MULT,
+    "floor_ngn_per_10k": FLOOR_NGN_PER_10K,
+    "africa_discount": AFRICA_DISCOUNT,
+    "usage_mult": USAGE_MULT,
+    "whitelist_mult": WHITELIST_MULT,
+    "platform_spread": PLATFORM_SPREAD,
+    "usd_to_ngn": USD_TO_NGN,
+}
+
+
+def config_version(tables: Dict[str, Any]) -> str:
+    """
+    Content fingerprint of a set of tables. Anything cached from engine
+    output (rendered ratecards, ...) keys on it: a pricing change
+    invalidates it, identical configs share a version.
+    """
+    return hashlib.sha1(json.dumps(tables, sort_keys=True).encode()).hexdigest()[:12]
+
+
+PRICING_CONFIG_VERSION = config_version(BUILTIN_PRICING_TABLES)
+
+
+# ---------------------------------------------
+# USAGE RIGHTS (current offer: 3 months)
+# ---------------------------------------------
+DEFAULT_USAGE_MONTHS = 3
+
+# ---------------------------------------------
+# DEFAULTS FOR UNKNOWN PLATFORM / NICHE
+# ---------------------------------------------
+DEFAULT_CPM_USD = 10
+DEFAULT_SPREAD = 0.25
+DEFAULT_USAGE_MULT = 2.0
+
+
+# ==========================================================
+# COMPILED PRICING MODEL
+# ==========================================================
+class Coefficients:
+    """
+    Everything the engine needs for one (platform, niche, usage, pro) —
+    all table lookups and defaults resolved ahead of time.
+
+    The factors are kept separate (not folded into one product) so pricing
+    multiplies them in the same order as the original formula: float
+    products are not associative, and folding shifts ~1% of prices by
+    a naira / cent.
+    """
+
+    __slots__ = ("platform", "niche", "usage_months", "is_pro",
+                 "cpm_local", "niche_mult", "floor_mult", "usage", "low", "high", "whitelist")
+
+    def __init__(self, platform: str, niche: str, usage_months: int, is_pro: bool,
+                 cpm_local: float, niche_mult: float, floor_mult: float, usage: float,
+                 low: float, high: float, whitelist: float):
+        self.platform = platform
+        self.niche = niche
+        self.usage_months = usage_months
+        self.is_pro = is_pro
+        self.cpm_local = cpm_local    # CPM midpoint (USD) * AFRICA_DISCOUNT
+        self.niche_mult = niche_mult
+        self.floor_mult = floor_mult  # FLOOR_PLATFORM_MULT
+        self.usage = usage            # USAGE_MULT for usage_months
+        self.low = low                # 1 - platform spread
+        self.high = high              # 1 + platform spread
+        self.whitelist = whitelist    # WHITELIST_MULT for PRO, else 0
+
+
+class PricingModel:
+    """
+    The pricing tables compiled into a per-(platform, niche, usage, pro)
+    coefficient table. Pricing one creator is then
+
+        views = (((avg_views / 1000) * c.cpm_local) * c.niche_mult) * usd_to_ngn
+        floor = ((followers / 10_000) * floor_ngn_per_10k) * c.floor_mult
+        mid   = max(views, floor) * c.usage
+
+    plus the spread / whitelist multiplies. Shared by the scalar engine,
+    the batch engine and (through them) the API routes and the bot.
+
+    Unknown platforms / niches fall back to the same defaults as always
+    and are compiled on demand (not stored, so arbitrary input can't grow
+    the table).
+
+    A model is an immutable snapshot of one config version: a config
+    change compiles a new model and swaps it in (install_model), it never
+    edits one in place.
+    """
+
+    def __init__(
+        self,
+        platform_cpm_usd: Dict[str, Tuple[float, float]],
+        floor_platform_mult: Dict[str, float],
+        niche_mult: Dict[str, float],
+        floor_ngn_per_10k: float,
+        africa_discount: float,
+        usage_mult: Dict[int, float],
+        whitelist_mult: float,
+        platform_spread: Dict[str, float],
+        usd_to_ngn: float,
+        version: str,
+    ):
+        self.platform_cpm_usd = platform_cpm_usd
+        self.floor_platform_mult = floor_platform_mult
+        self.niche_mult = niche_mult
+        self.floor_ngn_per_10k = floor_ngn_per_10k
+        self.africa_discount = africa_discount
+        self.usage_mult = usage_mult
+        self.whitelist_mult = whitelist_mult
+        self.platform_spread = platform_spread
+        self.usd_to_ngn = usd_to_ngn
+        self.version = version
+        self.insufficient = {"error": "insufficient_data", "mode": "unknown", "config_version": version}
+
+        platforms = set(platform_cpm_usd) | set(floor_platform_mult) | set(platform_spread)
+        self.table: Dict[Tuple[str, str, int, bool], Coefficients] = {
+            (p, n, months, pro): self._compile(p, n, months, pro)
+            for p in platforms
+            for n in niche_mult
+            for months in usage_mult
+            for pro in (False, True)
+        }
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Any]) -> "PricingModel":
+        return cls(**tables, version=config_version(tables))
+
+    def tables(self) -> Dict[str, Any]:
+        return {
+            "platform_cpm_usd": self.platform_cpm_usd,
+            "floor_platform_mult": self.floor_platform_mult,
+            "niche_mult": self.niche_mult,
+            "floor_ngn_per_10k": self.floor_ngn_per_10k,
+            "africa_discount": self.africa_discount,
+            "usage_mult": self.usage_mult,
+            "whitelist_mult": self.whitelist_mult,
+            "platform_spread": self.platform_spread,
+            "usd_to_ngn": self.usd_to_ngn,
+        }
+
+    def _compile(self, platform: str, niche: str, usage_months: int, is_pro: bool) -> Coefficients:
+        if platform in self.platform_cpm_usd:
+            low, high = self.platform_cpm_usd[platform]
+            cpm_usd = (low + high) / 2.0
+        else:
+            cpm_usd = DEFAULT_CPM_USD
+
+        usage = self.usage_mult.get(usage_months, DEFAULT_USAGE_MULT)
+        spread = self.platform_spread.get(platform, DEFAULT_SPREAD)
+
+        return Coefficients(
+            platform=platform,
+            niche=niche,
+            usage_months=usage_months,
+            is_pro=is_pro,
+            cpm_local=cpm_usd * self.africa_discount,
+            niche_mult=self.niche_mult.get(niche, 1.0),
+            floor_mult=self.floor_platform_mult.get(platform, 1.0),
+            usage=usage,
+            low=1 - spread,
+            high=1 + spread,
+            whitelist=self.whitelist_mult if is_pro else 0.0,
+        )
+
+    def coefficients(self, platform: Optional[str], niche: Optional[str], is_pro: bool,
+                     usage_months: int = DEFAULT_USAGE_MONTHS) -> Coefficients:
+        key = (platform or "", niche or "", usage_months, bool(is_pro))
+        c = self.table.get(key)
+        if c is None:
+            key = (key[0].lower(), key[1].lower(), usage_months, key[3])
+            c = self.table.get(key) or self._compile(*key)
+        return c
+
+    def _views_ngn(self, avg_views: float, c: Coefficients) -> float:
+        return (((avg_views / 1000) * c.cpm_local) * c.niche_mult) * self.usd_to_ngn
+
+    def _floor_ngn(self, followers: float, c: Coefficients) -> float:
+        return ((followers / 10_000) * self.floor_ngn_per_10k) * c.floor_mult
+
+    def price(
+        self,
+        followers: Optional[int],
+        avg_views: Optional[int],
+        engagement: Optional[float],
+        platform: str,
+        niche: str,
+        is_pro: bool,
+        mode: str = "single",
+        fx: Optional[FxSnapshot] = None,
+    ) -> Dict[str, Any]:
+        c = self.table.get((platform, niche, DEFAULT_USAGE_MONTHS, is_pro)) or self.coefficients(platform, niche, is_pro)
+
+        # ---- Hybrid Mode (value already includes usage rights) ----
+        if followers and avg_views and engagement:
+            pricing_mode = "full"
+            base_ngn = max(self._views_ngn(avg_views, c), self._floor_ngn(followers, c))
+        elif followers and not avg_views:
+            pricing_mode = "followers_only"
+            base_ngn = self._floor_ngn(followers, c)
+        elif avg_views and not followers:
+            pricing_mode = "views_only"
+            base_ngn = self._views_ngn(avg_views, c)
+        else:
+            return dict(self.insufficient)
+
+        ngn_usage = base_ngn * c.usage
+
+        fx = fx or current_fx()
+        usd_rate = fx.rate("USD") or self.usd_to_ngn
+
+        whitelist_ngn = ngn_usage * c.whitelist if is_pro else None
+        usd_whitelist = whitelist_ngn / usd_rate if whitelist_ngn else None
+
+        return self.result(
+            pricing_mode, c, followers, avg_views, engagement,
+            int(ngn_usage * c.low), int(ngn_usage), int(ngn_usage * c.high),
+            round(ngn_usage / usd_rate, 2),
+            int(whitelist_ngn) if whitelist_ngn else None,
+            round(usd_whitelist, 2) if usd_whitelist else None,
+            mode, fx.version,
+        )
+
+    def result(
+        self,
+        pricing_mode: str,
+        c: Coefficients,
+        followers: Optional[int],
+        avg_views: Optional[int],
+        engagement: Optional[float],
+        low: int,
+        mid: int,
+        high: int,
+        usd_mid: float,
+        whitelist_ngn: Optional[int],
+        usd_whitelist: Optional[float],
+        mode: str,
+        fx_version: str,
+    ) -> Dict[str, Any]:
+        """
+        Response dict — same keys, order and types as the engine has always returned,
+        plus the config / FX versions the figures were computed with.
+        """
+        # ==========================================================
+        # RANGE MODE OUTPUT (FOR BOT)
+        # ==========================================================
+        if mode == "range":
+            return {
+                "mode": pricing_mode,
+                "platform": c.platform,
+                "niche": c.niche,
+                "followers": followers,
+                "avg_views": avg_views,
+                "engagement": engagement,
+                "currency": "NGN",
+                "min": low,
+                "mid": mid,
+                "max": high,
+                "usd_mid": usd_mid,
+                "whitelist_ngn": whitelist_ngn,
+                "usd_whitelist": usd_whitelist,
+                "usage_months": c.usage_months,
+                "whitelisting_enabled": c.is_pro,
+                "is_pro": c.is_pro,
+                "config_version": self.version,
+                "fx_version": fx_version
+            }
+
+        # ==========================================================
+        # DEFAULT LEGACY OUTPUT
+        # ==========================================================
+        return {
+            "mode": pricing_mode,
+            "platform": c.platform,
+            "niche": c.niche,
+            "followers": followers,
+            "avg_views": avg_views,
+            "engagement": engagement,
+            "usage_months": c.usage_months,
+            "range_low_ngn": low,
+            "range_high_ngn": high,
+            "usd_mid": usd_mid,
+            "whitelist_ngn": whitelist_ngn,
+            "usd_whitelist": usd_whitelist,
+            "is_pro": c.is_pro,
+            "config_version": self.version,
+            "fx_version": fx_version
+        }
+
+
+# ---------------------------------------------
+# ACTIVE MODEL (swapped atomically on config change)
+# ---------------------------------------------
+_model = PricingModel.from_tables(BUILTIN_PRICING_TABLES)
+
+
+def current_model() -> PricingModel:
+    return _model
+
+
+def install_model(model: PricingModel) -> None:
+    """
+    Makes `model` the one every new pricing call uses. A single reference
+    assignment: calls already running finish on the snapshot they started with.
+    """
+    global _model
+    _model = model
+
 
 def hybrid_pricing_engine(
     followers: Optional[int],
@@ -88,108 +410,241 @@ def hybrid_pricing_engine(
     platform: str,
     niche: str,
     is_pro: bool,
-    mode: str = "single"
+    mode: str = "single",
+    model: Optional[PricingModel] = None,
+    fx: Optional[FxSnapshot] = None
 ) -> Dict[str, Any]:
+    """
+    Prices one creator with the installed pricing model. USD figures use the
+    live FX snapshot (app.services.fx_rates) when it has a USD rate, else the
+    model's usd_to_ngn. Both are plain reference reads — nothing here waits.
+    """
+    return (model or _model).price(followers, avg_views, engagement, platform, niche, is_pro, mode, fx)
 
-    platform = (platform or "").lower()
-    niche = (niche or "").lower()
-
-    # ---- CPM Midpoint ----
-    if platform in PLATFORM_CPM_USD:
-        low, high = PLATFORM_CPM_USD[platform]
-        cpm_usd = (low + high) / 2.0
-    else:
-        cpm_usd = 10
-
-    cpm_usd_local = cpm_usd * AFRICA_DISCOUNT
-
-    # ---- Niche Multiplier ----
-    niche_mult = NICHE_MULT.get(niche, 1.0)
-
-    # ---- Followers Floor ----
-    floor_ngn = 0
-    if followers:
-        base_floor = (followers / 10_000) * FLOOR_NGN_PER_10K
-        floor_mult = FLOOR_PLATFORM_MULT.get(platform, 1.0)
-        floor_ngn = base_floor * floor_mult
-
-    # ---- Views Valuation ----
-    views_ngn = 0
-    if avg_views:
-        base_usd = (avg_views / 1000) * cpm_usd_local
-        views_ngn = (base_usd * niche_mult) * USD_TO_NGN
-
-    # ---- Hybrid Mode ----
-    if followers and avg_views and engagement:
-        pricing_mode = "full"
-        base_value_ngn = max(views_ngn, floor_ngn)
-    elif followers and not avg_views:
-        pricing_mode = "followers_only"
-        base_value_ngn = floor_ngn
-    elif avg_views and not followers:
-        pricing_mode = "views_only"
-        base_value_ngn = views_ngn
-    else:
-        return {"error": "insufficient_data", "mode": "unknown"}
-
-    # ---- Usage Rights ----
-    usage_months = 3
-    usage_mult = USAGE_MULT.get(usage_months, 2.0)
-    ngn_usage = base_value_ngn * usage_mult
-
-    # ---- Range Spread ----
-    spread = PLATFORM_SPREAD.get(platform, 0.25)
-    range_low_ngn = ngn_usage * (1 - spread)
-    range_high_ngn = ngn_usage * (1 + spread)
-
-    # ---- USD Conversion ----
-    usd_mid = ngn_usage / USD_TO_NGN
-    usd_whitelist = None
-
-    # ---- Whitelisting for PRO ----
-    whitelist_ngn = None
-    if is_pro:
-        whitelist_ngn = ngn_usage * WHITELIST_MULT
-        usd_whitelist = whitelist_ngn / USD_TO_NGN
 
-    # ==========================================================
-    # RANGE MODE OUTPUT (FOR BOT)
-    # ==========================================================
-    if mode == "range":
-        return {
-            "mode": pricing_mode,
-            "platform": platform,
-            "niche": niche,
-            "followers": followers,
-            "avg_views": avg_views,
-            "engagement": engagement,
-            "currency": "NGN",
-            "min": int(range_low_ngn),
-            "mid": int(ngn_usage),
-            "max": int(range_high_ngn),
-            "usd_mid": round(float(usd_mid), 2),
-            "whitelist_ngn": int(whitelist_ngn) if whitelist_ngn else None,
-            "usd_whitelist": round(float(usd_whitelist), 2) if usd_whitelist else None,
-            "usage_months": usage_months,
-            "whitelisting_enabled": is_pro,
-            "is_pro": is_pro
-        }
+def hybrid_pricing_engine_batch(
+    followers: Sequence[Optional[int]],
+    avg_views: Sequence[Optional[int]],
+    engagement: Sequence[Optional[float]],
+    platform: Sequence[str],
+    niche: Sequence[str],
+    is_pro: Sequence[bool],
+    mode: str = "single",
+    model: Optional[PricingModel] = None,
+    fx: Optional[FxSnapshot] = None
+) -> List[Dict[str, Any]]:
+    """
+    Vectorized counterpart of `hybrid_pricing_engine`.
+
+    Takes one column per input (all the same length) and prices every row
+    in a single NumPy pass. Row i of the output is identical to
+    `hybrid_pricing_engine(followers[i], ..., is_pro[i], mode)`, including
+    the `insufficient_data` error dict for rows that cannot be priced.
+    One model / FX snapshot prices the whole batch.
+
+    Batches under BATCH_SCALAR_CUTOFF rows go through the scalar engine:
+    below that, array setup costs more than the arithmetic it saves.
+    Callers that don't need one dict per row should use
+    hybrid_pricing_engine_columns.
+    """
+    n = _check_columns(followers, avg_views, engagement, platform, niche, is_pro)
+    if n == 0:
+        return []
+
+    model = model or _model
+    fx = fx or current_fx()
+
+    if n < BATCH_SCALAR_CUTOFF:
+        price = model.price
+        return [
+            price(followers[i], avg_views[i], engagement[i], platform[i], niche[i], bool(is_pro[i]), mode, fx)
+            for i in range(n)
+        ]
+
+    rows, columns = _price_columns(followers, avg_views, engagement, platform, niche, is_pro, model, fx)
 
     # ==========================================================
-    # DEFAULT LEGACY OUTPUT
+    # ROW ASSEMBLY (same layout as hybrid_pricing_engine)
     # ==========================================================
-    return {
-        "mode": pricing_mode,
-        "platform": platform,
-        "niche": niche,
-        "followers": followers,
-        "avg_views": avg_views,
-        "engagement": engagement,
-        "usage_months": usage_months,
-        "range_low_ngn": int(range_low_ngn),
-        "range_high_ngn": int(range_high_ngn),
-        "usd_mid": round(float(usd_mid), 2),
-        "whitelist_ngn": int(whitelist_ngn) if whitelist_ngn else None,
-        "usd_whitelist": round(float(usd_whitelist), 2) if usd_whitelist else None,
-        "is_pro": is_pro
+    results: List[Dict[str, Any]] = []
+    append = results.append
+    result = model.result
+
+    for i, pricing_mode in enumerate(columns["mode"]):
+        if pricing_mode is None:
+            append(dict(model.insufficient))
+            continue
+
+        append(result(
+            pricing_mode, rows[i], followers[i], avg_views[i], engagement[i],
+            columns["min"][i], columns["mid"][i], columns["max"][i], columns["usd_mid"][i],
+            columns["whitelist_ngn"][i], columns["usd_whitelist"][i],
+            mode, fx.version,
+        ))
+
+    return results
+
+
+def hybrid_pricing_engine_columns(
+    followers: Sequence[Optional[int]],
+    avg_views: Sequence[Optional[int]],
+    engagement: Sequence[Optional[float]],
+    platform: Sequence[str],
+    niche: Sequence[str],
+    is_pro: Sequence[bool],
+    model: Optional[PricingModel] = None,
+    fx: Optional[FxSnapshot] = None
+) -> Dict[str, List[Any]]:
+    """
+    Columnar form of `hybrid_pricing_engine_batch`: one list per figure
+    ("mode", "min", "mid", "max", "usd_mid", "whitelist_ngn",
+    "usd_whitelist") instead of one dict per row, for bulk writers (roster
+    CSV) that would only take the dicts apart again. Values match the
+    range-mode dicts; "mode" is None (and every figure None) for rows that
+    cannot be priced.
+    """
+    n = _check_columns(followers, avg_views, engagement, platform, niche, is_pro)
+    if n == 0:
+        return {key: [] for key in _COLUMN_KEYS}
+
+    _, columns = _price_columns(
+        followers, avg_views, engagement, platform, niche, is_pro, model or _model, fx or current_fx()
+    )
+    return columns
+
+
+# Rows below which hybrid_pricing_engine_batch loops over the scalar engine.
+# Building one result dict per row costs the same either way, so the NumPy
+# pass only breaks even around 1k rows (benchmarks.engines batch sweep).
+BATCH_SCALAR_CUTOFF = 1024
+
+_COLUMN_KEYS = ("mode", "min", "mid", "max", "usd_mid", "whitelist_ngn", "usd_whitelist")
+
+
+def _check_columns(
+    followers: Sequence[Any],
+    avg_views: Sequence[Any],
+    engagement: Sequence[Any],
+    platform: Sequence[Any],
+    niche: Sequence[Any],
+    is_pro: Sequence[Any],
+) -> int:
+    n = len(followers)
+    if not (len(avg_views) == len(engagement) == len(platform) == len(niche) == len(is_pro) == n):
+        raise ValueError("All input columns must have the same length")
+    return n
+
+
+def _price_columns(
+    followers: Sequence[Optional[int]],
+    avg_views: Sequence[Optional[int]],
+    engagement: Sequence[Optional[float]],
+    platform: Sequence[str],
+    niche: Sequence[str],
+    is_pro: Sequence[bool],
+    model: PricingModel,
+    fx: FxSnapshot,
+) -> Tuple[List[Coefficients], Dict[str, List[Any]]]:
+    """
+    The NumPy pass shared by the batch and columnar engines.
+    Returns (per-row Coefficients, figure columns).
+    """
+    n = len(followers)
+    usd_rate = fx.rate("USD") or model.usd_to_ngn
+
+    # ---- One coefficient row per distinct (platform, niche, pro) ----
+    pro = [bool(x) for x in is_pro]
+    codes, keys = _factorize(list(zip(platform, niche, pro)))
+    coefs = [model.coefficients(p, n_, pr) for p, n_, pr in keys]
+    rows = [coefs[code] for code in codes]
+
+    # one (n, 7) gather instead of seven: columns are views into it
+    kc = np.fromiter(codes, dtype=np.intp, count=n)
+    coef = np.array(
+        [(c.cpm_local, c.niche_mult, c.floor_mult, c.usage, c.low, c.high, c.whitelist) for c in coefs],
+        dtype=np.float64,
+    )[kc]
+    cpm_coef, niche_coef, floor_coef, usage_coef, low_coef, high_coef, wl_coef = coef.T
+
+    # ---- Inputs (None behaves like 0: both are falsy in the scalar engine) ----
+    f = np.fromiter((x or 0 for x in followers), dtype=np.float64, count=n)
+    v = np.fromiter((x or 0 for x in avg_views), dtype=np.float64, count=n)
+    e = np.fromiter((x or 0 for x in engagement), dtype=np.float64, count=n)
+
+    has_followers = f != 0
+    has_views = v != 0
+    has_engagement = e != 0
+
+    # ---- Same operation order as PricingModel.price (bit-identical floats) ----
+    floor_ngn = ((f / 10_000) * model.floor_ngn_per_10k) * floor_coef
+    views_ngn = (((v / 1000) * cpm_coef) * niche_coef) * model.usd_to_ngn
+
+    full = has_followers & has_views & has_engagement
+    followers_only = has_followers & ~has_views
+    views_only = has_views & ~has_followers
+
+    ngn_usage = np.where(
+        full,
+        np.maximum(views_ngn, floor_ngn),
+        np.where(followers_only, floor_ngn, views_ngn),
+    ) * usage_coef
+    whitelist_ngn = ngn_usage * wl_coef
+
+    # ---- Back to Python scalars (int() truncation == astype(int64)) ----
+    # the three masks are disjoint, so this is np.select([...], [1, 2, 3], 0)
+    mode_codes = full.astype(np.int8) + followers_only * np.int8(2) + views_only * np.int8(3)
+    mode_col = [_BATCH_MODES[m] for m in mode_codes.tolist()]
+    low_ngn = ngn_usage * low_coef
+    high_ngn = ngn_usage * high_coef
+
+    # astype(int64) wraps past 2**63: those rows are cast as 0 here and
+    # then take Python int() like the scalar engine
+    too_big = np.maximum(np.maximum(np.abs(low_ngn), np.abs(ngn_usage)), np.abs(high_ngn)) >= _INT64_LIMIT
+    fits = ~too_big
+    low_col = np.where(fits, low_ngn, 0).astype(np.int64).tolist()
+    mid_col = np.where(fits, ngn_usage, 0).astype(np.int64).tolist()
+    high_col = np.where(fits, high_ngn, 0).astype(np.int64).tolist()
+    for i in np.flatnonzero(too_big).tolist():
+        low_col[i], mid_col[i], high_col[i] = int(low_ngn[i]), int(ngn_usage[i]), int(high_ngn[i])
+
+    usd_mid_col = (ngn_usage / usd_rate).tolist()
+    wl_col = whitelist_ngn.tolist()
+    usd_wl_col = (whitelist_ngn / usd_rate).tolist()
+
+    # round() / int() only the rows that are priced (and PRO, for whitelist)
+    for i, pricing_mode in enumerate(mode_col):
+        if pricing_mode is None:
+            low_col[i] = mid_col[i] = high_col[i] = usd_mid_col[i] = wl_col[i] = usd_wl_col[i] = None
+            continue
+        usd_mid_col[i] = round(usd_mid_col[i], 2)
+        if pro[i] and wl_col[i]:
+            wl_col[i] = int(wl_col[i])
+            usd_wl_col[i] = round(usd_wl_col[i], 2) if usd_wl_col[i] else None
+        else:
+            wl_col[i] = usd_wl_col[i] = None
+
+    return rows, {
+        "mode": mode_col,
+        "min": low_col,
+        "mid": mid_col,
+        "max": high_col,
+        "usd_mid": usd_mid_col,
+        "whitelist_ngn": wl_col,
+        "usd_whitelist": usd_wl_col,
     }
+
+
+# first float that no longer fits in int64
+_INT64_LIMIT = float(2 ** 63)
+
+# index → pricing_mode label used by hybrid_pricing_engine_batch (0 = unpriceable)
+_BATCH_MODES = (None, "full", "followers_only", "views_only")
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[List[int], List[Any]]:
+    """
+    Maps values to integer codes. Returns (codes, distinct values in code order).
+    """
+    seen: Dict[Any, int] = {}
+    codes = [seen.setdefault(v, len(seen)) for v in values]
+    return codes, list(seen)
@@ -0,0 +1,282 @@
+# backend/app/services/paystack_client.py
+
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger("creator-backend.paystack-client")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+PAYSTACK_BASE_URL = os.getenv("PAYSTACK_BASE_URL", "https://api.paystack.co").rstrip("/")
+
+# per-operation timeouts (seconds)
+PAYSTACK_TIMEOUTS: Dict[str, float] = {
+    "initialize": 10.0,
+    "verify": 8.0,
+    "list": 15.0,
+}
+
+PAYSTACK_MAX_RETRIES = int(os.getenv("PAYSTACK_MAX_RETRIES", "2"))
+PAYSTACK_BACKOFF_BASE = 0.3          # seconds, doubled per attempt (full jitter)
+
+PAYSTACK_BREAKER_THRESHOLD = int(os.getenv("PAYSTACK_BREAKER_THRESHOLD", "5"))
+PAYSTACK_BREAKER_RESET = float(os.getenv("PAYSTACK_BREAKER_RESET", "30"))
+
+
+# -------------------------------------------------
+# ERRORS
+# -------------------------------------------------
+class PaystackError(RuntimeError):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PaystackUnavailable(PaystackError):
+    """
+    Paystack unreachable, 5xx after retries, or circuit open.
+    """
+
+
+# -------------------------------------------------
+# CIRCUIT BREAKER
+# -------------------------------------------------
+class CircuitBreaker:
+    """
+    closed → (threshold consecutive failures) → open
+    open → (reset_timeout elapsed) → half_open: one trial call
+    half_open → success: closed / failure: open again
+    """
+
+    def __init__(self, threshold: int = PAYSTACK_BREAKER_THRESHOLD, reset_timeout: float = PAYSTACK_BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+
+        # open / half_open: let one trial call through per reset_timeout
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.trips += 1
+                logger.warning(f"⚠️ Paystack circuit opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+# -------------------------------------------------
+# CLIENT
+# -------------------------------------------------
+class PaystackClient:
+    """
+    Shared async Paystack API client.
+
+    - One keep-alive httpx.AsyncClient per process (no TLS handshake per checkout).
+    - Per-operation timeouts.
+    - Idempotent calls (verify, list) retry on timeouts / 5xx / 429 with
+      jittered exponential backoff. initialize only retries when the
+      connection was never established, so a charge is never created twice.
+    - A circuit breaker fails fast while Paystack is down.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        base_url: str = PAYSTACK_BASE_URL,
+        max_retries: int = PAYSTACK_MAX_RETRIES,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.secret_key = secret_key
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.secret_key}",
+                    "Content-Type": "application/json",
+                },
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------- core request loop ----------
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        op: str,
+        idempotent: bool,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            raise PaystackUnavailable("Paystack circuit open")
+
+        timeout = PAYSTACK_TIMEOUTS.get(op, 15.0)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, PAYSTACK_BACKOFF_BASE * (2 ** attempt)))
+
+            self.requests += 1
+            try:
+                resp = await self._http().request(method, path, json=json, params=params, timeout=timeout)
+            except httpx.ConnectError as e:
+                # never reached Paystack → safe to retry any operation
+                last_error = e
+                continue
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = e
+                if idempotent:
+                    continue
+                break
+
+            if resp.status_code >= 500 or resp.status_code == 429:
+                last_error = PaystackError(f"Paystack {op} failed [{resp.status_code}]", resp.status_code)
+                if idempotent:
+                    continue
+                break
+
+            # Paystack answered: the service is healthy even if it rejects the request
+            self.breaker.record_success()
+
+            try:
+                body = resp.json()
+            except ValueError:
+                raise PaystackError(f"Invalid response from Paystack ({op})", resp.status_code)
+
+            if resp.status_code >= 400 or not body.get("status", False):
+                logger.error(f"Paystack {op} rejected [{resp.status_code}] → {resp.text}")
+                raise PaystackError(body.get("message") or f"Paystack {op} failed", resp.status_code)
+
+            return body
+
+        self.failures += 1
+        self.breaker.record_failure()
+        logger.error(f"Paystack {op} unavailable → {last_error}")
+        raise PaystackUnavailable(f"Unable to reach Paystack ({op})") from last_error
+
+    # ---------- API ----------
+    async def initialize_transaction(
+        self,
+        email: str,
+        amount: int,
+        reference: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        POST /transaction/initialize → data {authorization_url, access_code, reference}
+        """
+        body = await self._request(
+            "POST", "/transaction/initialize", op="initialize", idempotent=False,
+            json={
+                "email": email,
+                "amount": amount,
+                "reference": reference,
+                "metadata": metadata or {},
+            },
+        )
+        return body.get("data") or {}
+
+    async def verify_transaction(self, reference: str) -> Dict[str, Any]:
+        """
+        GET /transaction/verify/:reference → data {status, amount, metadata, ...}
+        """
+        body = await self._request("GET", f"/transaction/verify/{reference}", op="verify", idempotent=True)
+        return body.get("data") or {}
+
+    async def list_transactions(
+        self,
+        status: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 50,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        GET /transaction → (transactions, meta)
+        """
+        params: Dict[str, Any] = {"page": page, "perPage": per_page}
+        if status:
+            params["status"] = status
+        if from_date:
+            params["from"] = from_date
+        if to_date:
+            params["to"] = to_date
+
+        body = await self._request("GET", "/transaction", op="list", idempotent=True, params=params)
+        return body.get("data") or [], body.get("meta") or {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+# -------------------------------------------------
+# SHARED INSTANCE
+# -------------------------------------------------
+_client: Optional[PaystackClient] = None
+
+
+def get_paystack_client() -> PaystackClient:
+    global _client
+    if _client is None:
+        secret = os.getenv("PAYSTACK_SECRET_KEY")
+        if not secret or not secret.strip():
+            raise RuntimeError("❌ Missing required env var: PAYSTACK_SECRET_KEY")
+        _client = PaystackClient(secret)
+    return _client
+
+
+async def close_paystack_client() -> None:
+    if _client is not None:
+        await _client.aclose()
@@ -0,0 +1,296 @@
+# backend/app/services/paystack_reconcile.py
+
+import os
+import sys
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.paystack_client import (
+    PaystackClient,
+    PaystackError,
+    PaystackUnavailable,
+    get_paystack_client,
+)
+from app.services.paystack_webhooks import apply_charge_success
+from app.services.pro_service import invalidate_pro_status
+from app.services.checkout_cache import checkout_cache
+
+logger = logging.getLogger("creator-backend.paystack-reconcile")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+PAYSTACK_RECONCILE_INTERVAL = float(os.getenv("PAYSTACK_RECONCILE_INTERVAL", "300"))
+PAYSTACK_RECONCILE_PAGE_SIZE = int(os.getenv("PAYSTACK_RECONCILE_PAGE_SIZE", "100"))
+PAYSTACK_RECONCILE_CONCURRENCY = int(os.getenv("PAYSTACK_RECONCILE_CONCURRENCY", "5"))
+
+# leave fresh checkouts alone: the user may still be on the payment page
+PAYSTACK_RECONCILE_MIN_AGE = int(os.getenv("PAYSTACK_RECONCILE_MIN_AGE", "600"))
+# unpaid checkouts older than this are closed as 'abandoned'
+PAYSTACK_RECONCILE_ABANDON_AFTER = int(os.getenv("PAYSTACK_RECONCILE_ABANDON_AFTER", str(48 * 3600)))
+# a claimed page is left to the worker that claimed it for this long
+# (every uvicorn worker runs a reconciler; claims keep them off each other's rows)
+PAYSTACK_RECONCILE_CLAIM_TTL = int(os.getenv("PAYSTACK_RECONCILE_CLAIM_TTL", "120"))
+
+# Paystack transaction status → payments.status
+_FAILED_STATUSES = {"failed", "reversed"}
+
+# (reference, telegram_id, amount, plan, age_seconds)
+PendingRow = Tuple[str, Optional[str], Optional[int], Optional[str], float]
+
+
+# -------------------------------------------------
+# DB SIDE
+# -------------------------------------------------
+def claim_pending_page(
+    after: str,
+    limit: int,
+    min_age: int = PAYSTACK_RECONCILE_MIN_AGE,
+    claim_ttl: int = PAYSTACK_RECONCILE_CLAIM_TTL,
+) -> List[PendingRow]:
+    """
+    Claims the next keyset page of pending payments (reference > after),
+    served by the partial index on pending references — no OFFSET, no
+    full-table scan.
+
+    Rows locked or recently claimed by another worker are skipped
+    (FOR UPDATE SKIP LOCKED + reconcile_claimed_at), so concurrent
+    reconcilers split the work instead of verifying every payment twice.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE payments p
+            SET reconcile_claimed_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT reference
+                FROM payments
+                WHERE status = 'pending'
+                  AND reference > %s
+                  AND (created_at IS NULL OR created_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                  AND (reconcile_claimed_at IS NULL
+                       OR reconcile_claimed_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                ORDER BY reference
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ) claimed
+            WHERE p.reference = claimed.reference
+            RETURNING p.reference, p.telegram_id, p.amount, p.plan,
+                      EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - COALESCE(p.created_at, CURRENT_TIMESTAMP))
+            """,
+            (after, min_age, claim_ttl, limit),
+        )
+        rows = cur.fetchall()
+        conn.commit()
+
+    # RETURNING has no order; the keyset cursor needs one
+    return sorted((r[0], r[1], r[2], r[3], float(r[4] or 0)) for r in rows)
+
+
+def apply_reconciliation(outcomes: List[Tuple[str, str]]) -> Set[str]:
+    """
+    Applies one page of (reference, new_status) outcomes in a single
+    transaction. Only rows still 'pending' are touched, so a webhook that
+    landed in the meantime wins. Returns telegram_ids whose PRO state changed.
+    """
+    touched: Set[str] = set()
+
+    with db_connection() as conn:
+        cur = conn.cursor()
+        for reference, status in outcomes:
+            if status == "success":
+                cur.execute(
+                    "SELECT 1 FROM payments WHERE reference=%s AND status='pending' FOR UPDATE",
+                    (reference,),
+                )
+                if cur.fetchone() is None:
+                    continue
+                telegram_id = apply_charge_success(cur, reference, None, None)
+                if telegram_id:
+                    touched.add(telegram_id)
+            else:
+                cur.execute(
+                    "UPDATE payments SET status=%s WHERE reference=%s AND status='pending'",
+                    (status, reference),
+                )
+        conn.commit()
+
+    return touched
+
+
+# -------------------------------------------------
+# PAYSTACK SIDE
+# -------------------------------------------------
+def _outcome(row: PendingRow, data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Maps a verify result to the new payments.status, or None to keep pending.
+    `data` is None when Paystack has no transaction for the reference.
+    """
+    reference, _, amount, _, age = row
+    status = (data or {}).get("status")
+
+    if status == "success":
+        paid = (data or {}).get("amount")
+        if amount is not None and paid is not None and int(paid) < int(amount):
+            logger.warning(f"⚠️ Paystack amount mismatch for {reference}: paid {paid}, expected {amount}")
+            return "mismatch"
+        return "success"
+
+    if status in _FAILED_STATUSES:
+        return "failed"
+
+    if age >= PAYSTACK_RECONCILE_ABANDON_AFTER:
+        return "abandoned"
+    return None
+
+
+def _is_not_found(e: PaystackError) -> bool:
+    """
+    Paystack answers an unknown reference with 400 "Transaction reference
+    not found" (404 on some endpoints / API versions).
+    """
+    return e.status_code == 404 or (e.status_code == 400 and "not found" in str(e).lower())
+
+
+async def _verify(client: PaystackClient, row: PendingRow, limit: asyncio.Semaphore) -> Optional[str]:
+    async with limit:
+        try:
+            data: Optional[Dict[str, Any]] = await client.verify_transaction(row[0])
+        except PaystackUnavailable:
+            raise
+        except PaystackError as e:
+            if not _is_not_found(e):
+                logger.error(f"❌ Verify failed for {row[0]} → {e}")
+                return None
+            data = None
+    return _outcome(row, data)
+
+
+async def reconcile_pending_payments(
+    client: Optional[PaystackClient] = None,
+    page_size: int = PAYSTACK_RECONCILE_PAGE_SIZE,
+    concurrency: int = PAYSTACK_RECONCILE_CONCURRENCY,
+    min_age: int = PAYSTACK_RECONCILE_MIN_AGE,
+) -> Dict[str, int]:
+    """
+    One reconciliation pass over all pending payments.
+
+    Claims pending references page by page in keyset order, verifies each page
+    against Paystack with at most `concurrency` requests in flight, and
+    applies the page's outcomes in one transaction. Stops early (leaving the
+    rest pending) if Paystack becomes unavailable.
+    """
+    client = client or get_paystack_client()
+    limit = asyncio.Semaphore(concurrency)
+    summary = {"checked": 0, "success": 0, "failed": 0, "abandoned": 0, "mismatch": 0, "unchanged": 0}
+
+    after = ""
+    while True:
+        rows = await run_db(claim_pending_page, after, page_size, min_age)
+        if not rows:
+            break
+        after = rows[-1][0]
+
+        try:
+            results = await asyncio.gather(*(_verify(client, row, limit) for row in rows))
+        except PaystackUnavailable as e:
+            logger.warning(f"⚠️ Reconciliation paused, Paystack unavailable → {e}")
+            break
+
+        outcomes = [(row[0], status) for row, status in zip(rows, results) if status]
+        if outcomes:
+            touched = await run_db(apply_reconciliation, outcomes)
+            for telegram_id in touched:
+                invalidate_pro_status(telegram_id)
+                checkout_cache.invalidate_user(telegram_id)
+
+        summary["checked"] += len(rows)
+        summary["unchanged"] += len(rows) - len(outcomes)
+        for _, status in outcomes:
+            summary[status] += 1
+
+        if len(rows) < page_size:
+            break
+
+    if summary["checked"]:
+        logger.info(f"🔁 Paystack reconciliation: {summary}")
+    return summary
+
+
+# -------------------------------------------------
+# BACKGROUND WORKER
+# -------------------------------------------------
+class PaymentReconciler:
+    """
+    Runs reconcile_pending_payments() every `interval` seconds.
+    """
+
+    def __init__(self, interval: float = PAYSTACK_RECONCILE_INTERVAL):
+        self.interval = interval
+        self._task: Optional["asyncio.Task[None]"] = None
+
+        self.runs = 0
+        self.errors = 0
+        self.last_summary: Dict[str, int] = {}
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="paystack-reconciler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.last_summary = await reconcile_pending_payments()
+                self.runs += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Paystack reconciliation error → {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "last": self.last_summary,
+        }
+
+
+payment_reconciler = PaymentReconciler()
+
+
+# -------------------------------------------------
+# CLI (one-off catch-up)
+#   python -m app.services.paystack_reconcile [min_age_seconds]
+# -------------------------------------------------
+async def _main_async(min_age: int) -> Dict[str, int]:
+    from app.services.paystack_client import close_paystack_client
+
+    try:
+        return await reconcile_pending_payments(min_age=min_age)
+    finally:
+        await close_paystack_client()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO)
+
+    min_age = int(argv[0]) if argv else PAYSTACK_RECONCILE_MIN_AGE
+    summary = asyncio.run(_main_async(min_age))
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,455 @@
+# backend/app/services/paystack_webhooks.py
+
+import os
+import re
+import hmac
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from psycopg2.extras import Json
+
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.pro_service import invalidate_pro_status
+from app.services.checkout_cache import checkout_cache
+
+logger = logging.getLogger("creator-backend.paystack-webhooks")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+def get_required_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value or not value.strip():
+        raise RuntimeError(f"❌ Missing required env var: {name}")
+    return value
+
+PAYSTACK_SECRET_KEY = get_required_env("PAYSTACK_SECRET_KEY")
+
+WEBHOOK_POLL_INTERVAL = float(os.getenv("PAYSTACK_WEBHOOK_POLL_INTERVAL", "30"))
+WEBHOOK_BATCH_SIZE = 50
+# a failing event is retried after RETRY_BASE, 2×, 4×, ... seconds (capped
+# at RETRY_MAX) and dead-lettered (status 'failed') after MAX_ATTEMPTS
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("PAYSTACK_WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_RETRY_BASE = float(os.getenv("PAYSTACK_WEBHOOK_RETRY_BASE", "30"))
+WEBHOOK_RETRY_MAX = float(os.getenv("PAYSTACK_WEBHOOK_RETRY_MAX", "3600"))
+
+# emails synthesized at checkout: user<telegram_id>@gmail.com
+_SYNTH_EMAIL = re.compile(r"^user(\d+)@gmail\.com$")
+
+
+# =================================================
+# EVENT HANDLER REGISTRY
+# =================================================
+# handler(cur, data) -> telegram_id whose cached state must be dropped, or None.
+# Runs inside the inbox transaction: raise to roll back and retry later.
+WebhookHandler = Callable[[Any, Dict[str, Any]], Optional[str]]
+
+WEBHOOK_HANDLERS: Dict[str, WebhookHandler] = {}
+
+
+def webhook_handler(event: str) -> Callable[[WebhookHandler], WebhookHandler]:
+    def register(fn: WebhookHandler) -> WebhookHandler:
+        WEBHOOK_HANDLERS[event] = fn
+        return fn
+    return register
+
+
+def _telegram_id(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Finds the telegram_id in a Paystack payload (metadata first, then the
+    synthesized checkout email).
+    """
+    customer = data.get("customer") or {}
+    for meta in (data.get("metadata"), customer.get("metadata")):
+        if isinstance(meta, dict) and meta.get("telegram_id"):
+            return str(meta["telegram_id"])
+
+    match = _SYNTH_EMAIL.match(str(customer.get("email") or ""))
+    return match.group(1) if match else None
+
+
+# -------------------------------------------------
+# SHARED STATE CHANGES (also used by reconciliation)
+# -------------------------------------------------
+def apply_charge_success(
+    cur,
+    reference: str,
+    telegram_id: Optional[str],
+    plan: Optional[str],
+    paid_amount: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Marks a *pending* payment successful and grants 30 days of PRO for PRO payments.
+    The plan / telegram_id fall back to the payments row when metadata lacks them.
+
+    Only a pending row whose amount was paid in full is resolved: a late
+    charge.success must not overturn a verdict the reconciler already
+    reached (e.g. 'mismatch') nor re-grant PRO for a payment already applied.
+    An underpaid pending payment is marked 'mismatch' instead.
+    """
+    cur.execute(
+        """
+        UPDATE payments SET status='success', paid_at=CURRENT_TIMESTAMP
+        WHERE reference=%s
+          AND status='pending'
+          AND (%s::bigint IS NULL OR amount IS NULL OR %s::bigint >= amount)
+        RETURNING plan, telegram_id
+        """,
+        (reference, paid_amount, paid_amount),
+    )
+    row = cur.fetchone()
+    if row is None:
+        if paid_amount is not None:
+            cur.execute(
+                """
+                UPDATE payments SET status='mismatch'
+                WHERE reference=%s AND status='pending' AND amount > %s
+                RETURNING amount
+                """,
+                (reference, paid_amount),
+            )
+            underpaid = cur.fetchone()
+            if underpaid:
+                logger.warning(f"⚠️ Paystack amount mismatch for {reference}: paid {paid_amount}, expected {underpaid[0]}")
+        return None
+
+    plan = plan or row[0]
+    telegram_id = telegram_id or row[1]
+
+    if not telegram_id:
+        return None
+
+    # Enable PRO for 30 days
+    if plan == "PRO":
+        cur.execute(
+            """
+            INSERT INTO creators (telegram_id, is_pro, pro_activated_at, pro_expires_at)
+            VALUES (%s, TRUE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + INTERVAL '30 days')
+            ON CONFLICT (telegram_id)
+            DO UPDATE SET
+                is_pro = TRUE,
+                pro_activated_at = CURRENT_TIMESTAMP,
+                pro_expires_at = CURRENT_TIMESTAMP + INTERVAL '30 days'
+            """,
+            (telegram_id,)
+        )
+
+    return str(telegram_id)
+
+
+def revoke_pro(cur, telegram_id: str) -> None:
+    cur.execute(
+        """
+        UPDATE creators
+        SET is_pro = FALSE,
+            pro_expires_at = LEAST(pro_expires_at, CURRENT_TIMESTAMP)
+        WHERE telegram_id = %s
+        """,
+        (telegram_id,),
+    )
+
+
+# -------------------------------------------------
+# HANDLERS
+# -------------------------------------------------
+@webhook_handler("charge.success")
+def _on_charge_success(cur, data: Dict[str, Any]) -> Optional[str]:
+    reference = data.get("reference")
+    if not reference:
+        return None
+
+    metadata = data.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        metadata = {}
+
+    paid = data.get("amount")
+    return apply_charge_success(
+        cur, reference, _telegram_id(data), metadata.get("plan"),
+        paid_amount=int(paid) if paid is not None else None,
+    )
+
+
+@webhook_handler("refund.processed")
+def _on_refund_processed(cur, data: Dict[str, Any]) -> Optional[str]:
+    reference = data.get("transaction_reference") or (data.get("transaction") or {}).get("reference")
+    if not reference:
+        return None
+
+    cur.execute(
+        "UPDATE payments SET status='refunded' WHERE reference=%s RETURNING plan, telegram_id",
+        (reference,),
+    )
+    row = cur.fetchone()
+    if not row:
+        return None
+
+    plan, telegram_id = row
+    if plan == "PRO" and telegram_id:
+        revoke_pro(cur, telegram_id)
+        return str(telegram_id)
+    return None
+
+
+@webhook_handler("subscription.create")
+def _on_subscription_create(cur, data: Dict[str, Any]) -> Optional[str]:
+    telegram_id = _telegram_id(data)
+    if not telegram_id:
+        return None
+
+    cur.execute(
+        """
+        INSERT INTO creators (telegram_id, is_pro, pro_activated_at, pro_expires_at)
+        VALUES (%s, TRUE, CURRENT_TIMESTAMP,
+                COALESCE(%s::timestamptz, CURRENT_TIMESTAMP + INTERVAL '30 days'))
+        ON CONFLICT (telegram_id)
+        DO UPDATE SET
+            is_pro = TRUE,
+            pro_activated_at = CURRENT_TIMESTAMP,
+            pro_expires_at = EXCLUDED.pro_expires_at
+        """,
+        (telegram_id, data.get("next_payment_date")),
+    )
+    return telegram_id
+
+
+@webhook_handler("subscription.disable")
+def _on_subscription_disable(cur, data: Dict[str, Any]) -> Optional[str]:
+    telegram_id = _telegram_id(data)
+    if not telegram_id:
+        return None
+
+    revoke_pro(cur, telegram_id)
+    return telegram_id
+
+
+# =================================================
+# INBOX (RECEIVE SIDE)
+# =================================================
+def _event_key(event: str, data: Dict[str, Any], raw_body: bytes) -> str:
+    ident = data.get("id") or data.get("reference")
+    if ident is None:
+        ident = hashlib.sha256(raw_body).hexdigest()
+    return f"{event}:{ident}"
+
+
+def store_event(event_key: str, event: str, reference: Optional[str], payload: Dict[str, Any]) -> bool:
+    """
+    Persists a webhook event once. Returns False for a duplicate delivery.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO paystack_events (event_key, event, reference, payload)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (event_key) DO NOTHING
+            RETURNING id
+            """,
+            (event_key, event, reference, Json(payload)),
+        )
+        inserted = cur.fetchone() is not None
+        conn.commit()
+        return inserted
+
+
+async def receive_paystack_webhook(request: Request) -> Dict[str, Any]:
+    """
+    Shared /paystack/webhook handler: verify HMAC, persist the raw event
+    (insert-on-conflict), return. State changes happen in WebhookProcessor.
+    """
+    raw_body = await request.body()
+    signature = request.headers.get("x-paystack-signature")
+
+    if not signature:
+        raise HTTPException(400, "Missing Paystack signature")
+
+    expected = hmac.new(
+        PAYSTACK_SECRET_KEY.encode(),
+        raw_body,
+        hashlib.sha512
+    ).hexdigest()
+
+    if not hmac.compare_digest(expected, signature):
+        raise HTTPException(400, "Invalid Paystack signature")
+
+    try:
+        payload = json.loads(raw_body)
+    except ValueError:
+        raise HTTPException(400, "Invalid JSON")
+
+    event = payload.get("event")
+    data = payload.get("data") or {}
+    if not event or not isinstance(data, dict):
+        return {"status": "ignored"}
+
+    event_key = _event_key(event, data, raw_body)
+
+    try:
+        inserted = await run_db(store_event, event_key, event, data.get("reference"), payload)
+    except Exception as e:
+        # Not persisted → let Paystack retry
+        logger.error(f"Webhook inbox error: {e}")
+        raise HTTPException(500, "Internal Error")
+
+    if not inserted:
+        return {"status": "duplicate"}
+
+    webhook_processor.notify()
+    return {"status": "accepted", "event": event}
+
+
+# =================================================
+# PROCESSOR (APPLY SIDE)
+# =================================================
+def retry_delay(attempts: int) -> float:
+    """
+    Seconds before an event that has failed `attempts` + 1 times is retried.
+    """
+    return min(WEBHOOK_RETRY_BASE * 2 ** attempts, WEBHOOK_RETRY_MAX)
+
+
+def process_pending_events(limit: int = WEBHOOK_BATCH_SIZE) -> int:
+    """
+    Applies up to `limit` due inbox events in one transaction.
+    Rows are claimed with SKIP LOCKED so several workers can run this safely;
+    each event runs in a savepoint so one bad event doesn't block the batch.
+    A failed event backs off exponentially (next_attempt_at) and is
+    dead-lettered after WEBHOOK_MAX_ATTEMPTS, so a poisoned event is not
+    reclaimed on every pass.
+    Returns the number of events claimed.
+    """
+    touched: List[str] = []
+
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT id, event, payload, attempts
+            FROM paystack_events
+            WHERE processed_at IS NULL
+              AND status = 'pending'
+              AND attempts < %s
+              AND (next_attempt_at IS NULL OR next_attempt_at <= CURRENT_TIMESTAMP)
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (WEBHOOK_MAX_ATTEMPTS, limit),
+        )
+        rows = cur.fetchall()
+
+        for event_id, event, payload, attempts in rows:
+            handler = WEBHOOK_HANDLERS.get(event)
+            if handler is None:
+                cur.execute(
+                    "UPDATE paystack_events SET processed_at=CURRENT_TIMESTAMP, status='ignored' WHERE id=%s",
+                    (event_id,),
+                )
+                continue
+
+            cur.execute("SAVEPOINT paystack_event")
+            try:
+                telegram_id = handler(cur, payload.get("data") or {})
+                cur.execute(
+                    """
+                    UPDATE paystack_events
+                    SET processed_at=CURRENT_TIMESTAMP, status='processed', attempts=attempts + 1
+                    WHERE id=%s
+                    """,
+                    (event_id,),
+                )
+                cur.execute("RELEASE SAVEPOINT paystack_event")
+                if telegram_id:
+                    touched.append(telegram_id)
+            except Exception as e:
+                cur.execute("ROLLBACK TO SAVEPOINT paystack_event")
+                dead = attempts + 1 >= WEBHOOK_MAX_ATTEMPTS
+                delay = retry_delay(attempts)
+                cur.execute(
+                    """
+                    UPDATE paystack_events
+                    SET attempts=attempts + 1, last_error=%s, status=%s,
+                        next_attempt_at=CURRENT_TIMESTAMP + make_interval(secs => %s)
+                    WHERE id=%s
+                    """,
+                    (str(e)[:500], "failed" if dead else "pending", delay, event_id),
+                )
+                outcome = f"dead-lettered after {attempts + 1} attempts" if dead else f"retry in {delay:.0f}s"
+                logger.error(f"❌ Paystack event {event_id} ({event}) failed, {outcome} → {e}")
+
+        conn.commit()
+
+    for telegram_id in touched:
+        invalidate_pro_status(telegram_id)
+        checkout_cache.invalidate_user(telegram_id)
+        logger.info(f"🎉 PRO state updated for Telegram User {telegram_id}")
+
+    return len(rows)
+
+
+class WebhookProcessor:
+    """
+    Background task that drains the paystack_events inbox.
+    Woken by notify() on each new event; also polls so events stored by
+    other workers (or left over from a crash) are picked up.
+    """
+
+    def __init__(self, poll_interval: float = WEBHOOK_POLL_INTERVAL, batch_size: int = WEBHOOK_BATCH_SIZE):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+        self.processed = 0
+        self.errors = 0
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._wakeup.set()  # drain anything left from before the restart
+            self._task = asyncio.create_task(self._run(), name="paystack-webhook-processor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                while True:
+                    claimed = await run_db(process_pending_events, self.batch_size)
+                    self.processed += claimed
+                    if claimed < self.batch_size:
+                        break
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Paystack webhook processor error → {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "handlers": sorted(WEBHOOK_HANDLERS),
+            "processed": self.processed,
+            "errors": self.errors,
+        }
+
+
+webhook_processor = WebhookProcessor()
@@ -0,0 +1,147 @@
+# backend/app/services/pricing_cache.py
+#
+# Memoized hybrid_pricing_engine results. Bot users mostly send round
+# numbers, so the same (followers, views, engagement, platform, niche, pro)
+# tuples come back again and again; a hit skips the engine and, for the
+# HTTP routes, JSON serialization too.
+#
+# Keys include the pricing config version and the FX snapshot version, so
+# a config publish or FX refresh never serves an old price — old entries
+# simply stop being looked up and age out.
+
+import os
+import json
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.utils.cache import TTLCache, MISSING
+from app.services.fx_rates import current_fx
+from app.services.hybrid_pricing_engine import current_model, hybrid_pricing_engine
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# 0 disables the cache (every call goes to the engine)
+PRICING_CACHE_SIZE = int(os.getenv("PRICING_CACHE_SIZE", "50000"))
+PRICING_CACHE_TTL = float(os.getenv("PRICING_CACHE_TTL", "600"))
+# Optional bucketing: round followers / views / engagement to this many
+# significant digits before pricing (3 → 51,234 prices as 51,200).
+# Off by default: bucketed inputs are priced (and echoed) as the bucket value.
+PRICING_CACHE_QUANTIZE_DIGITS = int(os.getenv("PRICING_CACHE_QUANTIZE_DIGITS", "0"))
+
+
+def quantize(value: Any, digits: int) -> Any:
+    """
+    Rounds to `digits` significant digits; keeps ints ints. Never turns a
+    non-zero value into zero (that would change the pricing mode).
+    """
+    if not value or digits <= 0:
+        return value
+    rounded = float(f"{value:.{digits}g}")
+    return int(rounded) if isinstance(value, int) else rounded
+
+
+class CachedQuote:
+    """
+    One engine result plus its JSON body, serialized on first use.
+    Shared between callers: treat `result` as read-only.
+    """
+
+    __slots__ = ("result", "_body")
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+        self._body: Optional[bytes] = None
+
+    def body(self) -> bytes:
+        if self._body is None:
+            # same encoding as FastAPI's JSONResponse
+            self._body = json.dumps(
+                self.result, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+            ).encode("utf-8")
+        return self._body
+
+
+class PricingCache:
+    """
+    Bounded LRU/TTL cache in front of hybrid_pricing_engine.
+
+    Key: normalized inputs (platform / niche lower-cased, as the engine
+    does; optional significant-digit buckets) + PRO + output mode + config
+    version + FX version. The model and FX snapshot read for the key are
+    the ones passed to the engine, so a concurrent swap can't file a
+    result under the wrong version.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PRICING_CACHE_SIZE,
+        ttl: float = PRICING_CACHE_TTL,
+        quantize_digits: int = PRICING_CACHE_QUANTIZE_DIGITS,
+    ):
+        self.enabled = maxsize > 0
+        self.quantize_digits = quantize_digits
+        self._cache: TTLCache[CachedQuote] = TTLCache(maxsize=max(maxsize, 1), ttl=ttl)
+
+    def quote(
+        self,
+        followers: Optional[int],
+        avg_views: Optional[int],
+        engagement: Optional[float],
+        platform: str,
+        niche: str,
+        is_pro: bool,
+        mode: str = "single",
+    ) -> CachedQuote:
+        digits = self.quantize_digits
+        if digits > 0:
+            followers = quantize(followers, digits)
+            avg_views = quantize(avg_views, digits)
+            engagement = quantize(engagement, digits)
+
+        model = current_model()
+        fx = current_fx()
+
+        key: Hashable = None
+        if self.enabled:
+            key = self.key(followers, avg_views, engagement, platform, niche, is_pro, mode, model.version, fx.version)
+            cached = self._cache.get(key)
+            if cached is not MISSING:
+                return cached
+
+        quote = CachedQuote(hybrid_pricing_engine(
+            followers, avg_views, engagement, platform, niche, is_pro, mode, model=model, fx=fx
+        ))
+        if self.enabled:
+            self._cache.set(key, quote)
+        return quote
+
+    @staticmethod
+    def key(
+        followers: Optional[int],
+        avg_views: Optional[int],
+        engagement: Optional[float],
+        platform: Optional[str],
+        niche: Optional[str],
+        is_pro: bool,
+        mode: str,
+        config_version: str,
+        fx_version: str,
+    ) -> Tuple[Any, ...]:
+        return (
+            followers, avg_views, engagement,
+            (platform or "").lower(), (niche or "").lower(),
+            bool(is_pro), mode == "range", config_version, fx_version,
+        )
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "quantize_digits": self.quantize_digits,
+            **self._cache.stats(),
+        }
+
+
+pricing_cache = PricingCache()
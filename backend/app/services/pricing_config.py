@@ -0,0 +1,374 @@
+# backend/app/services/pricing_config.py
+#
+# Versioned pricing config: the engine tables (CPM ranges, multipliers,
+# floor, discount, FX rate) live in a store instead of module constants,
+# so re-tuning them is a publish, not a redeploy.
+#
+#   db      → newest row of the pricing_config table (default)
+#   file    → JSON file at PRICING_CONFIG_FILE (reloaded when it changes)
+#   builtin → the constants in hybrid_pricing_engine, never reloaded
+#
+# A config only has to list what it overrides; everything else keeps the
+# built-in value. Each loaded config is compiled into a PricingModel and
+# swapped in with install_model(), so a pricing call sees either the old
+# snapshot or the new one, never a mix.
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import Json
+
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.hybrid_pricing_engine import (
+    BUILTIN_PRICING_TABLES,
+    PricingModel,
+    current_model,
+    install_model,
+)
+
+logger = logging.getLogger("creator-backend.pricing-config")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+PRICING_CONFIG_SOURCE = os.getenv("PRICING_CONFIG_SOURCE", "db").strip().lower()
+PRICING_CONFIG_FILE = os.getenv("PRICING_CONFIG_FILE", "pricing_config.json")
+# how often every worker checks the store for a newer revision
+PRICING_CONFIG_POLL_INTERVAL = float(os.getenv("PRICING_CONFIG_POLL_INTERVAL", "15"))
+
+PRICING_CONFIG_SOURCES = ("db", "file", "builtin")
+
+_RANGE_KEYS = ("platform_cpm_usd",)
+_MAP_KEYS = ("floor_platform_mult", "niche_mult", "platform_spread")
+_SCALAR_KEYS = ("floor_ngn_per_10k", "africa_discount", "whitelist_mult", "usd_to_ngn")
+
+
+# -------------------------------------------------
+# VALIDATION
+# -------------------------------------------------
+class PricingConfigError(ValueError):
+    """
+    A config that must not be installed; the message says which field is wrong.
+    """
+
+
+def _number(value: Any, field: str, allow_zero: bool = False) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PricingConfigError(f"{field}: expected a number, got {value!r}")
+    # json.load accepts NaN / Infinity, and NaN slips past the comparisons below
+    if not math.isfinite(value):
+        raise PricingConfigError(f"{field}: must be a finite number, got {value!r}")
+    if value < 0 or (value == 0 and not allow_zero):
+        raise PricingConfigError(f"{field}: must be {'>= 0' if allow_zero else '> 0'}, got {value!r}")
+    return value
+
+
+def _mapping(value: Any, field: str) -> Dict[str, Any]:
+    if not isinstance(value, dict) or not value:
+        raise PricingConfigError(f"{field}: expected a non-empty object")
+    return value
+
+
+def parse_config(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates a (partial) config and merges it over the built-in tables,
+    entry by entry for the per-platform / per-niche maps (so `{"niche_mult":
+    {"tech": 1.5}}` only re-tunes tech). Returns complete tables, ready for
+    PricingModel.from_tables().
+    """
+    if not isinstance(raw, dict):
+        raise PricingConfigError("config must be a JSON object")
+
+    unknown = sorted(set(raw) - set(BUILTIN_PRICING_TABLES))
+    if unknown:
+        raise PricingConfigError(f"unknown keys: {', '.join(unknown)}")
+
+    tables = dict(BUILTIN_PRICING_TABLES)
+
+    for key in _RANGE_KEYS:
+        if key in raw:
+            ranges = {}
+            for name, pair in _mapping(raw[key], key).items():
+                field = f"{key}.{name}"
+                if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                    raise PricingConfigError(f"{field}: expected [low, high]")
+                low, high = _number(pair[0], field), _number(pair[1], field)
+                if low > high:
+                    raise PricingConfigError(f"{field}: low {low} is above high {high}")
+                ranges[str(name).lower()] = (low, high)
+            tables[key] = {**BUILTIN_PRICING_TABLES[key], **ranges}
+
+    for key in _MAP_KEYS:
+        if key in raw:
+            tables[key] = {
+                **BUILTIN_PRICING_TABLES[key],
+                **{
+                    str(name).lower(): _number(value, f"{key}.{name}", allow_zero=key == "platform_spread")
+                    for name, value in _mapping(raw[key], key).items()
+                },
+            }
+
+    if "usage_mult" in raw:
+        usage = {}
+        for months, value in _mapping(raw["usage_mult"], "usage_mult").items():
+            if not str(months).isdigit():
+                raise PricingConfigError(f"usage_mult: month keys must be integers, got {months!r}")
+            usage[int(months)] = _number(value, f"usage_mult.{months}")
+        tables["usage_mult"] = {**BUILTIN_PRICING_TABLES["usage_mult"], **usage}
+
+    for key in _SCALAR_KEYS:
+        if key in raw:
+            tables[key] = _number(raw[key], key)
+
+    if tables["africa_discount"] > 1:
+        raise PricingConfigError(f"africa_discount: must be <= 1, got {tables['africa_discount']}")
+
+    return tables
+
+
+# -------------------------------------------------
+# DB SIDE
+# -------------------------------------------------
+def latest_db_revision() -> Optional[int]:
+    """
+    Newest published revision (cheap: primary-key max), or None if none yet.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT MAX(version) FROM pricing_config")
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def load_db_config() -> Optional[Tuple[int, Dict[str, Any]]]:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT version, config FROM pricing_config ORDER BY version DESC LIMIT 1")
+        row = cur.fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def publish_config(raw: Dict[str, Any], note: Optional[str] = None) -> int:
+    """
+    Validates and stores a new revision. Every worker picks it up on its
+    next poll. Returns the new revision number.
+    """
+    parse_config(raw)
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO pricing_config (config, note) VALUES (%s, %s) RETURNING version",
+            (Json(raw), note),
+        )
+        revision = cur.fetchone()[0]
+        conn.commit()
+    return revision
+
+
+# -------------------------------------------------
+# FILE SIDE
+# -------------------------------------------------
+def _file_revision(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_file_config(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+# -------------------------------------------------
+# MANAGER
+# -------------------------------------------------
+class PricingConfigManager:
+    """
+    Keeps this worker's pricing model in step with the config store.
+
+    - Polls the store's revision every `poll_interval` seconds (a one-row
+      primary-key lookup, or a stat() for the file source) and only loads
+      and compiles the config when the revision moved.
+    - notify() wakes the poller immediately (after a publish from this process).
+    - A config that fails validation is logged and skipped; the current
+      snapshot stays installed, so a bad publish cannot take pricing down.
+
+    Other workers / instances are reached through the store itself: each one
+    runs its own manager. Postgres LISTEN/NOTIFY is not used on purpose —
+    it needs a session-pinned connection, which the pooled (transaction
+    mode) DATABASE_URL does not give us.
+    """
+
+    def __init__(
+        self,
+        source: str = PRICING_CONFIG_SOURCE,
+        path: str = PRICING_CONFIG_FILE,
+        poll_interval: float = PRICING_CONFIG_POLL_INTERVAL,
+    ):
+        if source not in PRICING_CONFIG_SOURCES:
+            raise RuntimeError(f"❌ PRICING_CONFIG_SOURCE must be one of {', '.join(PRICING_CONFIG_SOURCES)}")
+
+        self.source = source
+        self.path = path
+        self.poll_interval = poll_interval
+
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup = asyncio.Event()
+
+        self.revision: Optional[int] = None
+        self.loaded_at: Optional[float] = None
+
+        self.checks = 0
+        self.reloads = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        if self.source == "builtin" or self._task is not None:
+            return
+        # first load inline: the app should not serve a single price on a stale config
+        try:
+            await self.reload()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"❌ Pricing config load failed, using built-in tables → {e}")
+        if self.poll_interval > 0:
+            self._task = asyncio.create_task(self._run(), name="pricing-config")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.reload()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Pricing config poll error → {e}")
+
+    async def reload(self) -> bool:
+        """
+        Installs the store's newest config if its revision changed.
+        Returns True if a new model was installed.
+        """
+        self.checks += 1
+
+        if self.source == "db":
+            revision = await run_db(latest_db_revision)
+            if revision is None or revision == self.revision:
+                return False
+            loaded = await run_db(load_db_config)
+            if loaded is None:
+                return False
+            revision, raw = loaded
+        else:
+            revision = _file_revision(self.path)
+            if revision is None or revision == self.revision:
+                return False
+            raw = None
+
+        try:
+            if raw is None:
+                raw = load_file_config(self.path)
+            model = PricingModel.from_tables(parse_config(raw))
+        except ValueError as e:
+            # PricingConfigError, or a file that is not valid JSON:
+            # remember the revision so a bad one is reported once, not every poll
+            self.revision = revision
+            self.rejected += 1
+            logger.error(f"❌ Pricing config revision {revision} rejected, keeping {current_model().version} → {e}")
+            return False
+
+        previous = current_model().version
+        self.revision = revision
+        self.loaded_at = time.time()
+        if model.version == previous:
+            return False
+
+        install_model(model)
+        self.reloads += 1
+        logger.info(f"🔧 Pricing config revision {revision} installed ({previous} → {model.version})")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "running": self._task is not None,
+            "revision": self.revision,
+            "config_version": current_model().version,
+            "loaded_age": round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+pricing_config_manager = PricingConfigManager()
+
+
+# -------------------------------------------------
+# CLI
+#   python -m app.services.pricing_config show
+#   python -m app.services.pricing_config validate FILE
+#   python -m app.services.pricing_config publish FILE [note]
+# -------------------------------------------------
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO)
+
+    command = argv[0] if argv else "show"
+
+    if command == "show":
+        loaded = load_db_config()
+        if loaded is None:
+            print("no published config, built-in tables in use")
+            tables = BUILTIN_PRICING_TABLES
+        else:
+            print(f"revision {loaded[0]}")
+            tables = parse_config(loaded[1])
+        model = PricingModel.from_tables(tables)
+        print(json.dumps({"config_version": model.version, "tables": model.tables()}, indent=2))
+        return 0
+
+    if command in ("validate", "publish") and len(argv) >= 2:
+        raw = load_file_config(argv[1])
+        try:
+            model = PricingModel.from_tables(parse_config(raw))
+        except PricingConfigError as e:
+            print(f"❌ {e}")
+            return 1
+
+        if command == "validate":
+            print(f"✅ valid, config_version {model.version}")
+            return 0
+
+        revision = publish_config(raw, note=" ".join(argv[2:]) or None)
+        print(f"✅ published revision {revision}, config_version {model.version}")
+        return 0
+
+    print("usage: python -m app.services.pricing_config show | validate FILE | publish FILE [note]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
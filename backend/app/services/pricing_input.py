@@ -0,0 +1,97 @@
+# backend/app/services/pricing_input.py
+#
+# Creator stats as users type them (bot messages, roster cells) → engine
+# inputs. Kept free of telegram imports so roster worker processes can use it.
+
+import math
+from typing import Dict
+
+# -------------------------------------------------
+# LIMITS
+# -------------------------------------------------
+# above any real audience; keeps prices well inside int64
+MAX_COUNT = 10_000_000_000
+
+# -------------------------------------------------
+# PLATFORM NORMALIZATION MAP
+# -------------------------------------------------
+PLATFORM_MAP: Dict[str, str] = {
+    "instagram": "instagram",
+    "tiktok": "tiktok",
+    "ytshorts": "youtube",
+    "youtube": "youtube",
+    "twitter": "twitter",
+    "facebook": "facebook",
+    "other": "instagram"
+}
+
+# -------------------------------------------------
+# NICHE NORMALIZATION MAP
+# -------------------------------------------------
+NICHE_MAP: Dict[str, str] = {
+    "fashion": "beauty",
+    "beauty": "beauty",
+    "tech": "tech",
+    "comedy": "comedy",
+    "lifestyle": "lifestyle",
+    "food": "lifestyle",
+    "music": "entertainment",
+    "fitness": "fitness",
+    "other": "general"
+}
+
+
+# -------------------------------------------------
+# PARSER HELPERS
+# -------------------------------------------------
+def parse_number(value: str) -> int:
+    """
+    Parses: 50k, 12k, 1.2m, 10000, 500,000
+    Raises ValueError for junk, nan/inf, negatives and counts above MAX_COUNT.
+    """
+    raw = value.strip()
+    value = raw.replace(",", "").lower()
+    scale = 1
+    if value.endswith("k"):
+        value, scale = value[:-1], 1_000
+    elif value.endswith("m"):
+        value, scale = value[:-1], 1_000_000
+
+    try:
+        number = float(value) * scale
+    except ValueError:
+        raise ValueError(f"bad number '{raw}'")
+
+    if not math.isfinite(number) or not 0 <= number <= MAX_COUNT:
+        raise ValueError(f"number out of range '{raw}'")
+    return int(number)
+
+
+def parse_engagement(er_raw: str) -> float:
+    """
+    Converts engagement into a proper decimal rate (0 < x <= 1)
+    Handles:
+        - 0.08  => 0.08
+        - 8%    => 0.08
+        - 8     => 0.08
+        - 0.8%  => 0.008
+    """
+    er_str = er_raw.strip().replace("%", "")
+
+    try:
+        er = float(er_str)
+    except:
+        raise ValueError("Invalid engagement")
+
+    # If user typed `8%` → 0.08, `0.8%` → 0.008
+    if "%" in er_raw:
+        er = er / 100.0
+
+    # If user typed `8` meaning 8%
+    elif er > 1:
+        er = er / 100.0
+
+    if not (0 < er <= 1):
+        raise ValueError("Engagement must be between 0 and 1")
+
+    return er
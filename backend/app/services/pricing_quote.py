@@ -0,0 +1,91 @@
+# backend/app/services/pricing_quote.py
+
+from typing import Optional, Dict, Any, List, Sequence
+
+from app.services.pro_service import is_user_pro
+from app.services.hybrid_pricing_engine import hybrid_pricing_engine_batch
+from app.services.pricing_cache import CachedQuote, pricing_cache
+
+
+def resolve_pro(telegram_id: Optional[str]) -> bool:
+    """
+    PRO lookup used by every pricing entry point.
+    Any DB failure degrades to FREE pricing instead of failing the quote.
+    """
+    if not telegram_id:
+        return False
+
+    try:
+        return is_user_pro(str(telegram_id))
+    except Exception:
+        return False
+
+
+def quote_creator(
+    telegram_id: Optional[str],
+    followers: Optional[int],
+    avg_views: Optional[int],
+    engagement: Optional[float],
+    platform: str,
+    niche: str,
+    mode: str = "range",
+    is_pro: Optional[bool] = None
+) -> CachedQuote:
+    """
+    In-process pricing quote: PRO lookup + memoized hybrid engine.
+    The returned quote is shared (result + pre-serialized JSON body); don't mutate it.
+    Pass `is_pro` when it is already known to skip the (blocking) PRO lookup.
+    """
+    return pricing_cache.quote(
+        followers=followers,
+        avg_views=avg_views,
+        engagement=engagement,
+        platform=platform,
+        niche=niche,
+        is_pro=resolve_pro(telegram_id) if is_pro is None else is_pro,
+        mode=mode
+    )
+
+
+def price_creator(
+    telegram_id: Optional[str],
+    followers: Optional[int],
+    avg_views: Optional[int],
+    engagement: Optional[float],
+    platform: str,
+    niche: str,
+    mode: str = "range",
+    is_pro: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Result dict of quote_creator (a private copy).
+    Shared by the /pricing routes and the Telegram bot so both return the same payload.
+    """
+    return dict(quote_creator(telegram_id, followers, avg_views, engagement, platform, niche, mode, is_pro).result)
+
+
+def price_creators(
+    telegram_id: Optional[str],
+    followers: Sequence[Optional[int]],
+    avg_views: Sequence[Optional[int]],
+    engagement: Sequence[Optional[float]],
+    platform: Sequence[str],
+    niche: Sequence[str],
+    mode: str = "range",
+    is_pro: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    """
+    Batch counterpart of price_creator: one PRO lookup for the caller
+    (skipped when `is_pro` is given), one vectorized engine pass for every row.
+    """
+    pro_user = resolve_pro(telegram_id) if is_pro is None else is_pro
+
+    return hybrid_pricing_engine_batch(
+        followers=followers,
+        avg_views=avg_views,
+        engagement=engagement,
+        platform=platform,
+        niche=niche,
+        is_pro=[pro_user] * len(followers),
+        mode=mode
+    )
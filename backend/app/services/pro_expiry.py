@@ -0,0 +1,206 @@
+# backend/app/services/pro_expiry.py
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import Forbidden, BadRequest, RetryAfter, TelegramError
+
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.pro_service import invalidate_pro_status
+from bot.callback_data import encode
+
+logger = logging.getLogger("creator-backend.pro-expiry")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+PRO_EXPIRY_SWEEP_INTERVAL = float(os.getenv("PRO_EXPIRY_SWEEP_INTERVAL", "60"))
+PRO_EXPIRY_BATCH_SIZE = int(os.getenv("PRO_EXPIRY_BATCH_SIZE", "500"))
+
+# renewal reminders per second (well under Telegram's ~30 msg/s bot limit)
+PRO_EXPIRY_NOTIFY_RATE = float(os.getenv("PRO_EXPIRY_NOTIFY_RATE", "10"))
+PRO_EXPIRY_NOTIFY = os.getenv("PRO_EXPIRY_NOTIFY", "true").strip().lower() != "false"
+# only remind users whose PRO lapsed within this many days (a backlog of
+# long-expired users, e.g. after downtime, is expired silently)
+PRO_EXPIRY_NOTIFY_WINDOW_DAYS = int(os.getenv("PRO_EXPIRY_NOTIFY_WINDOW_DAYS", "3"))
+
+RENEWAL_TEXT = (
+    "⏰ *Your PRO plan has expired*\n\n"
+    "Your account is back on the FREE plan.\n"
+    "Renew now to keep PRO pricing, whitelisting and deal tools."
+)
+
+RENEWAL_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🚀 Renew PRO (₦10,000)", callback_data=encode("upgrade_pro"))]]
+)
+
+
+# -------------------------------------------------
+# DB SIDE
+# -------------------------------------------------
+def expire_pro_batch(
+    limit: int = PRO_EXPIRY_BATCH_SIZE,
+    notify_window_days: int = PRO_EXPIRY_NOTIFY_WINDOW_DAYS,
+) -> List[Tuple[str, bool]]:
+    """
+    Flips is_pro off for up to `limit` users whose PRO has lapsed, in one
+    set-based UPDATE ... RETURNING. SKIP LOCKED lets several workers sweep
+    without blocking each other (or a concurrent upgrade).
+
+    Returns (telegram_id, remind) pairs: `remind` is True only for users
+    whose PRO lapsed within the last `notify_window_days`.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE creators
+            SET is_pro = FALSE
+            WHERE telegram_id IN (
+                SELECT telegram_id
+                FROM creators
+                WHERE is_pro = TRUE
+                  AND (pro_expires_at IS NULL OR pro_expires_at <= CURRENT_TIMESTAMP)
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING telegram_id,
+                      COALESCE(pro_expires_at > CURRENT_TIMESTAMP - make_interval(days => %s), FALSE)
+            """,
+            (limit, notify_window_days),
+        )
+        expired = [(str(row[0]), bool(row[1])) for row in cur.fetchall()]
+        conn.commit()
+
+    return expired
+
+
+# -------------------------------------------------
+# SWEEPER
+# -------------------------------------------------
+class ProExpirySweeper:
+    """
+    Periodic PRO expiry sweep.
+
+    - Expires lapsed users batch by batch (expire_pro_batch) until none are left.
+    - Drops their cached PRO flag, so is_user_pro() is a plain read of is_pro.
+    - Sends renewal reminders through the bot, paced to `notify_rate` msg/s,
+      to users whose PRO lapsed recently (PRO_EXPIRY_NOTIFY_WINDOW_DAYS);
+      users who blocked the bot are skipped, RetryAfter is honoured once.
+    """
+
+    def __init__(
+        self,
+        interval: float = PRO_EXPIRY_SWEEP_INTERVAL,
+        batch_size: int = PRO_EXPIRY_BATCH_SIZE,
+        notify_rate: float = PRO_EXPIRY_NOTIFY_RATE,
+        notify: bool = PRO_EXPIRY_NOTIFY,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.notify_rate = notify_rate
+        self.notify = notify
+
+        self._bot: Optional[Bot] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+        self.sweeps = 0
+        self.expired = 0
+        self.notified = 0
+        self.notify_failed = 0
+        self.errors = 0
+
+    async def start(self, bot: Optional[Bot] = None) -> None:
+        self._bot = bot
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="pro-expiry-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ PRO expiry sweep error → {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> int:
+        """
+        One full pass. Returns the number of users expired.
+        """
+        total = 0
+        while True:
+            expired = await run_db(expire_pro_batch, self.batch_size)
+            for telegram_id, _ in expired:
+                invalidate_pro_status(telegram_id)
+
+            total += len(expired)
+            remind = [telegram_id for telegram_id, recent in expired if recent]
+            if remind and self.notify and self._bot is not None:
+                await self._send_reminders(remind)
+
+            if len(expired) < self.batch_size:
+                break
+
+        self.sweeps += 1
+        self.expired += total
+        if total:
+            logger.info(f"⌛ PRO expired for {total} users")
+        return total
+
+    async def _send_reminders(self, telegram_ids: List[str]) -> None:
+        assert self._bot is not None
+        gap = 1.0 / self.notify_rate if self.notify_rate > 0 else 0.0
+
+        for telegram_id in telegram_ids:
+            for _ in range(2):
+                try:
+                    await self._bot.send_message(
+                        chat_id=int(telegram_id),
+                        text=RENEWAL_TEXT,
+                        parse_mode="Markdown",
+                        reply_markup=RENEWAL_KEYBOARD,
+                    )
+                    self.notified += 1
+                    break
+                except RetryAfter as e:
+                    retry_after = e.retry_after
+                    await asyncio.sleep(
+                        retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+                    )
+                except (Forbidden, BadRequest, ValueError):
+                    # bot blocked / chat gone / non-numeric id: nothing to retry
+                    self.notify_failed += 1
+                    break
+                except TelegramError as e:
+                    self.notify_failed += 1
+                    logger.warning(f"⚠️ Renewal reminder to {telegram_id} failed → {e}")
+                    break
+            else:
+                # rate-limited again after waiting once: give up on this one
+                self.notify_failed += 1
+            await asyncio.sleep(gap)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "sweeps": self.sweeps,
+            "expired": self.expired,
+            "notified": self.notified,
+            "notify_failed": self.notify_failed,
+            "errors": self.errors,
+        }
+
+
+pro_expiry_sweeper = ProExpirySweeper()
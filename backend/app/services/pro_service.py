@@ -1,8 +1,20 @@
 # backend/app/services/pro_service.py
 
+import os
 import datetime
-from typing import Optional
-from app.db import get_db
+from typing import Optional, Dict, Any, Tuple, Union
+from app.db import db_connection
+from app.utils.cache import TTLCache, MISSING
+
+# -------------------------------------------------
+# PRO STATUS CACHE
+# Entries live PRO_CACHE_TTL seconds, never past pro_expires_at,
+# and are dropped by invalidate_pro_status() on payment webhooks.
+# -------------------------------------------------
+PRO_CACHE_TTL = float(os.getenv("PRO_CACHE_TTL", "300"))
+PRO_CACHE_SIZE = int(os.getenv("PRO_CACHE_SIZE", "10000"))
+
+_pro_cache: TTLCache[bool] = TTLCache(maxsize=PRO_CACHE_SIZE, ttl=PRO_CACHE_TTL)
 
 
 def normalize_dt(value: Optional[object]) -> Optional[datetime.datetime]:
@@ -29,31 +41,59 @@ def normalize_dt(value: Optional[object]) -> Optional[datetime.datetime]:
         return None
 
 
-def is_user_pro(telegram_id: str) -> bool:
-    conn = get_db()
-    cur = conn.cursor()
+def is_user_pro(telegram_id: Union[str, int]) -> bool:
+    """
+    Cached PRO check. Hits the DB at most once per TTL per user.
+    """
+    key = str(telegram_id)
+
+    cached = _pro_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    # a webhook may invalidate while we read: then the result is not cached
+    token = _pro_cache.token()
+    is_pro, ttl = _load_pro_status(key)
+    _pro_cache.set(key, is_pro, ttl, token=token)
+    return is_pro
+
+
+def invalidate_pro_status(telegram_id: Union[str, int]) -> None:
+    """
+    Drops the cached PRO flag (call after upgrades, refunds and expiry sweeps).
+    """
+    _pro_cache.invalidate(str(telegram_id))
+
+
+def pro_cache_stats() -> Dict[str, Any]:
+    return _pro_cache.stats()
 
-    cur.execute("""
-        SELECT is_pro, pro_expires_at
-        FROM creators
-        WHERE telegram_id = %s
-    """, (telegram_id,))
 
-    row = cur.fetchone()
-    conn.close()
+def _load_pro_status(telegram_id: str) -> Tuple[bool, Optional[float]]:
+    """
+    Reads PRO status from the DB.
+
+    creators.is_pro is authoritative: the expiry sweeper (pro_expiry.py)
+    flips it off once pro_expires_at passes. The seconds left are only used
+    to cap the cache TTL (and cover the gap until the next sweep).
+    Returns (is_pro, cache_ttl).
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT is_pro, EXTRACT(EPOCH FROM pro_expires_at - CURRENT_TIMESTAMP)
+            FROM creators
+            WHERE telegram_id = %s
+        """, (telegram_id,))
 
-    if not row:
-        return False
+        row = cur.fetchone()
 
-    is_pro, expires = row
-    if not is_pro:
-        return False
+    if not row or not row[0]:
+        return False, None
 
-    expires_dt = normalize_dt(expires)
-    if expires_dt is None:
-        # Invalid timestamp means treat as expired
-        return False
+    remaining = row[1]
+    if remaining is None or remaining <= 0:
+        return False, None
 
-    # Compare using UTC-aware current time
-    now = datetime.datetime.now(datetime.timezone.utc)
-    return expires_dt > now
+    return True, min(PRO_CACHE_TTL, float(remaining))
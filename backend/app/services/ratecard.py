@@ -0,0 +1,149 @@
+# backend/app/services/ratecard.py
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from telegram import Bot, Message
+from telegram.error import BadRequest
+
+from app.utils.cache import TTLCache, MISSING
+from app.services.hybrid_pricing_engine import current_model
+from app.services.ratecard_render import render_ratecard
+
+logger = logging.getLogger("creator-backend.ratecard")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+RATECARD_WORKERS = int(os.getenv("RATECARD_WORKERS", "1"))
+# rendered bytes kept for re-uploads (a card is ~20–60 KB)
+RATECARD_CACHE_SIZE = int(os.getenv("RATECARD_CACHE_SIZE", "256"))
+RATECARD_CACHE_TTL = float(os.getenv("RATECARD_CACHE_TTL", str(24 * 3600)))
+# Telegram file_ids of sent cards (re-sends cost no upload at all)
+RATECARD_FILE_ID_CACHE_SIZE = int(os.getenv("RATECARD_FILE_ID_CACHE_SIZE", "20000"))
+RATECARD_FILE_ID_TTL = float(os.getenv("RATECARD_FILE_ID_TTL", str(30 * 24 * 3600)))
+
+# PNG needs Pillow; PDF is always available
+RATECARD_FORMATS = ("png", "pdf") if importlib.util.find_spec("PIL") else ("pdf",)
+RATECARD_DEFAULT_FORMAT = RATECARD_FORMATS[0]
+
+
+def ratecard_key(card: Dict[str, Any], fmt: str) -> str:
+    """
+    Cache key: card fields + format. The card carries the config_version
+    its prices came from (not the live one, which may have moved on since),
+    so a config change never serves a card priced under the old one.
+    """
+    raw = json.dumps([card, fmt], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class RatecardExporter:
+    """
+    Sends ratecards with as little work as possible:
+
+    1. file_id cached for the key → send_document(file_id), no bytes uploaded;
+    2. rendered bytes cached       → upload them, remember the new file_id;
+    3. otherwise render on the process pool (never on the event loop),
+       concurrent requests for the same key share one render.
+    """
+
+    def __init__(self, workers: int = RATECARD_WORKERS):
+        self.workers = workers
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+        self.file_ids: TTLCache[str] = TTLCache(RATECARD_FILE_ID_CACHE_SIZE, RATECARD_FILE_ID_TTL)
+        self.rendered: TTLCache[bytes] = TTLCache(RATECARD_CACHE_SIZE, RATECARD_CACHE_TTL)
+
+        self.renders = 0
+        self.render_seconds = 0.0
+        self.uploads = 0
+        self.reused = 0
+        self.stale_file_ids = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawned, not forked: the parent runs an event loop and DB threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def render(self, key: str, card: Dict[str, Any], fmt: str) -> bytes:
+        cached = self.rendered.get(key)
+        if cached is not MISSING:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = loop.run_in_executor(self._pool(), render_ratecard, card, fmt)
+        self._inflight[key] = future
+        try:
+            data = await future
+        finally:
+            self._inflight.pop(key, None)
+
+        self.renders += 1
+        self.render_seconds += time.perf_counter() - started
+        self.rendered.set(key, data)
+        return data
+
+    async def send(self, bot: Bot, chat_id: int, card: Dict[str, Any], fmt: str, filename: str, **kwargs: Any) -> Message:
+        key = ratecard_key(card, fmt)
+
+        file_id = self.file_ids.get(key)
+        if file_id is not MISSING:
+            try:
+                message = await bot.send_document(chat_id, document=file_id, **kwargs)
+                self.reused += 1
+                return message
+            except BadRequest as e:
+                # file_id no longer valid (e.g. bot token changed) → upload again
+                self.stale_file_ids += 1
+                self.file_ids.invalidate(key)
+                logger.warning(f"⚠️ Cached ratecard file_id rejected → {e}")
+
+        data = await self.render(key, card, fmt)
+        message = await bot.send_document(chat_id, document=data, filename=filename, **kwargs)
+        self.uploads += 1
+
+        if message.document is not None:
+            self.file_ids.set(key, message.document.file_id)
+        return message
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("🛑 Ratecard workers stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "formats": list(RATECARD_FORMATS),
+            "config_version": current_model().version,
+            "renders": self.renders,
+            "render_ms_avg": round(self.render_seconds / self.renders * 1000, 2) if self.renders else 0.0,
+            "uploads": self.uploads,
+            "file_id_reused": self.reused,
+            "stale_file_ids": self.stale_file_ids,
+            "file_id_cache": self.file_ids.stats(),
+            "render_cache": self.rendered.stats(),
+        }
+
+
+ratecard_exporter = RatecardExporter()
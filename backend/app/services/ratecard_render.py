@@ -0,0 +1,156 @@
+# backend/app/services/ratecard_render.py
+#
+# Pure rendering: card dict in, file bytes out. Runs inside the ratecard
+# worker processes, so it must stay free of DB / bot imports.
+
+import io
+from typing import Any, Dict, List, Tuple
+
+CARD_WIDTH, CARD_HEIGHT = 1200, 675          # PNG pixels (16:9)
+PDF_WIDTH, PDF_HEIGHT = 595, 420             # PDF points (A5 landscape)
+
+HEADER_RGB = (28, 33, 51)
+ACCENT_RGB = (46, 160, 103)
+TEXT_RGB = (30, 30, 30)
+MUTED_RGB = (110, 110, 110)
+
+
+def _money(value: Any) -> str:
+    return f"NGN {value:,}" if value else "-"
+
+
+def ratecard_lines(card: Dict[str, Any]) -> Tuple[str, str, List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Returns (title, subtitle, stats rows, price rows) shared by both formats.
+    """
+    title = f"{card.get('name') or 'Creator'} · Ratecard"
+    subtitle = f"{str(card['platform']).title()} · {str(card['niche']).title()}"
+
+    stats: List[Tuple[str, str]] = []
+    if card.get("followers"):
+        stats.append(("Followers", f"{card['followers']:,}"))
+    if card.get("avg_views"):
+        stats.append(("Avg views", f"{card['avg_views']:,}"))
+    if card.get("engagement"):
+        stats.append(("Engagement", f"{card['engagement']:.2%}"))
+    stats.append(("Usage rights", f"{card.get('usage_months', 3)} months"))
+
+    prices = [
+        ("Minimum", _money(card["min"])),
+        ("Midline", _money(card["mid"])),
+        ("Premium", _money(card["max"])),
+    ]
+    if card.get("whitelist_ngn"):
+        prices.append(("Whitelisting", _money(card["whitelist_ngn"])))
+
+    return title, subtitle, stats, prices
+
+
+# -------------------------------------------------
+# PNG (Pillow, optional dependency)
+# -------------------------------------------------
+def render_png(card: Dict[str, Any]) -> bytes:
+    from PIL import Image, ImageDraw, ImageFont
+
+    title, subtitle, stats, prices = ratecard_lines(card)
+
+    image = Image.new("RGB", (CARD_WIDTH, CARD_HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+
+    def font(size: int) -> Any:
+        return ImageFont.load_default(size=size)
+
+    draw.rectangle((0, 0, CARD_WIDTH, 150), fill=HEADER_RGB)
+    draw.text((60, 38), title, font=font(48), fill="white")
+    draw.text((60, 100), subtitle, font=font(28), fill=(200, 205, 220))
+
+    y = 200
+    for label, value in stats:
+        draw.text((60, y), label, font=font(26), fill=MUTED_RGB)
+        draw.text((280, y), value, font=font(26), fill=TEXT_RGB)
+        y += 50
+
+    y = 200
+    draw.text((640, y - 10), "Pricing per post", font=font(26), fill=MUTED_RGB)
+    y += 40
+    for label, value in prices:
+        draw.text((640, y), label, font=font(30), fill=TEXT_RGB)
+        draw.text((860, y), value, font=font(30), fill=ACCENT_RGB)
+        y += 58
+
+    draw.text((60, CARD_HEIGHT - 60), "Prices in NGN · generated by Creator Monetization Bot", font=font(20), fill=MUTED_RGB)
+
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+# -------------------------------------------------
+# PDF (hand-written, standard Helvetica fonts — no dependency)
+# -------------------------------------------------
+def _pdf_text(x: float, y: float, text: str, size: int, bold: bool = False, rgb: Tuple[int, int, int] = TEXT_RGB) -> str:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    r, g, b = (c / 255 for c in rgb)
+    return f"BT /{'F2' if bold else 'F1'} {size} Tf {r:.3f} {g:.3f} {b:.3f} rg {x} {y} Td ({escaped}) Tj ET\n"
+
+
+def render_pdf(card: Dict[str, Any]) -> bytes:
+    title, subtitle, stats, prices = ratecard_lines(card)
+
+    r, g, b = (c / 255 for c in HEADER_RGB)
+    content = f"{r:.3f} {g:.3f} {b:.3f} rg 0 {PDF_HEIGHT - 90} {PDF_WIDTH} 90 re f\n"
+    content += _pdf_text(30, PDF_HEIGHT - 45, title, 22, bold=True, rgb=(255, 255, 255))
+    content += _pdf_text(30, PDF_HEIGHT - 72, subtitle, 13, rgb=(200, 205, 220))
+
+    y = PDF_HEIGHT - 130
+    for label, value in stats:
+        content += _pdf_text(30, y, label, 12, rgb=MUTED_RGB)
+        content += _pdf_text(140, y, value, 12)
+        y -= 24
+
+    y = PDF_HEIGHT - 125
+    content += _pdf_text(310, y, "Pricing per post", 12, rgb=MUTED_RGB)
+    y -= 26
+    for label, value in prices:
+        content += _pdf_text(310, y, label, 14, bold=True)
+        content += _pdf_text(420, y, value, 14, bold=True, rgb=ACCENT_RGB)
+        y -= 28
+
+    content += _pdf_text(30, 24, "Prices in NGN - generated by Creator Monetization Bot", 9, rgb=MUTED_RGB)
+    stream = content.encode("cp1252", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PDF_WIDTH} {PDF_HEIGHT}] "
+            f"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>"
+        ).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"endstream",
+    ]
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+RENDERERS = {
+    "png": render_png,
+    "pdf": render_pdf,
+}
+
+
+def render_ratecard(card: Dict[str, Any], fmt: str) -> bytes:
+    return RENDERERS[fmt](card)
@@ -0,0 +1,375 @@
+# backend/app/services/roster_pricing.py
+
+import os
+import csv
+import asyncio
+import logging
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from app.services.fx_rates import FxSnapshot, current_fx
+from app.services.hybrid_pricing_engine import PricingModel, current_model, hybrid_pricing_engine_columns
+from app.services.pricing_input import PLATFORM_MAP, NICHE_MAP, parse_number, parse_engagement
+
+logger = logging.getLogger("creator-backend.roster")
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# Bot API getFile only serves files up to 20 MB
+ROSTER_MAX_BYTES = int(os.getenv("ROSTER_MAX_BYTES", str(20 * 1024 * 1024)))
+ROSTER_MAX_ROWS = int(os.getenv("ROSTER_MAX_ROWS", "200000"))
+# rows held in memory at once (one engine pass each)
+ROSTER_CHUNK_ROWS = int(os.getenv("ROSTER_CHUNK_ROWS", "2000"))
+ROSTER_WORKERS = int(os.getenv("ROSTER_WORKERS", "2"))
+# jobs running + waiting for a worker; further uploads are turned away
+ROSTER_MAX_PENDING = int(os.getenv("ROSTER_MAX_PENDING", "8"))
+
+ROSTER_EXTENSIONS = (".csv", ".xlsx")
+
+# header aliases → engine input (headers are lowercased, spaces/dashes → "_")
+COLUMN_ALIASES: Dict[str, Sequence[str]] = {
+    "followers": ("followers", "follower_count", "followers_count", "subscribers"),
+    "avg_views": ("avg_views", "views", "average_views", "avg_view"),
+    "engagement": ("engagement", "engagement_rate", "er"),
+    "platform": ("platform",),
+    "niche": ("niche", "category"),
+}
+
+PRICED_COLUMNS = [
+    "min_ngn",
+    "mid_ngn",
+    "max_ngn",
+    "usd_mid",
+    "whitelist_ngn",
+    "usd_whitelist",
+    "pricing_status",
+]
+
+
+class RosterError(ValueError):
+    """
+    Roster cannot be priced at all (bad header, unreadable file). User-facing.
+    """
+
+
+# -------------------------------------------------
+# ROW SOURCES (streamed, one row at a time)
+# -------------------------------------------------
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _csv_rows(path: str) -> Iterator[List[str]]:
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect: Any = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        for row in csv.reader(f, dialect):
+            yield [cell.strip() for cell in row]
+
+
+def _xlsx_rows(path: str) -> Iterator[List[str]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterError("XLSX support is not installed on this server — please send a CSV")
+
+    # read_only streams the sheet XML instead of building the whole workbook
+    try:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        raise RosterError("could not open the XLSX file")
+
+    try:
+        sheet = workbook.active
+        if sheet is None:
+            raise RosterError("the workbook has no sheets")
+        for row in sheet.iter_rows(values_only=True):
+            yield [_cell_text(cell) for cell in row]
+    finally:
+        workbook.close()
+
+
+def read_rows(path: str, filename: str) -> Iterator[List[str]]:
+    if filename.lower().endswith(".xlsx"):
+        return _xlsx_rows(path)
+    return _csv_rows(path)
+
+
+# -------------------------------------------------
+# HEADER + ROW PARSING
+# -------------------------------------------------
+def map_columns(header: List[str]) -> Dict[str, int]:
+    """
+    Header row → {engine input: column index}. Raises RosterError if the
+    roster cannot be priced.
+    """
+    normalized = [h.strip().lower().replace(" ", "_").replace("-", "_") for h in header]
+
+    columns: Dict[str, int] = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[field] = normalized.index(alias)
+                break
+
+    missing = [field for field in ("platform", "niche") if field not in columns]
+    if "followers" not in columns and "avg_views" not in columns:
+        missing.append("followers or avg_views")
+    if missing:
+        raise RosterError(f"missing column(s): {', '.join(missing)}")
+
+    return columns
+
+
+def _normalize(value: str, mapping: Dict[str, str], what: str) -> str:
+    key = value.strip().lower()
+    if key in mapping:
+        return mapping[key]
+    if key in mapping.values():
+        return key
+    raise ValueError(f"unknown {what} '{value}'" if key else f"missing {what}")
+
+
+def parse_roster_row(row: List[str], columns: Dict[str, int]) -> Dict[str, Any]:
+    """
+    One roster row → engine inputs. Raises ValueError with a short reason.
+    """
+    def cell(field: str) -> str:
+        index = columns.get(field)
+        return row[index] if index is not None and index < len(row) else ""
+
+    followers = cell("followers")
+    avg_views = cell("avg_views")
+    engagement = cell("engagement")
+
+    return {
+        "followers": parse_number(followers) if followers else None,
+        "avg_views": parse_number(avg_views) if avg_views else None,
+        "engagement": parse_engagement(engagement) if engagement else None,
+        "platform": _normalize(cell("platform"), PLATFORM_MAP, "platform"),
+        "niche": _normalize(cell("niche"), NICHE_MAP, "niche"),
+    }
+
+
+# -------------------------------------------------
+# CHUNKED PRICING (runs inside a worker process)
+# -------------------------------------------------
+def _price_chunk(
+    chunk: List[List[str]],
+    columns: Dict[str, int],
+    width: int,
+    is_pro: bool,
+    writer: Any,
+    model: PricingModel,
+    fx: FxSnapshot,
+) -> int:
+    parsed: List[Optional[Dict[str, Any]]] = []
+    errors: Dict[int, str] = {}
+
+    for i, row in enumerate(chunk):
+        try:
+            parsed.append(parse_roster_row(row, columns))
+        except ValueError as e:
+            parsed.append(None)
+            errors[i] = str(e)
+
+    valid = [p for p in parsed if p is not None]
+    columns = hybrid_pricing_engine_columns(
+        followers=[p["followers"] for p in valid],
+        avg_views=[p["avg_views"] for p in valid],
+        engagement=[p["engagement"] for p in valid],
+        platform=[p["platform"] for p in valid],
+        niche=[p["niche"] for p in valid],
+        is_pro=[is_pro] * len(valid),
+        model=model,
+        fx=fx,
+    )
+    figures = iter(zip(
+        columns["mode"],
+        columns["min"],
+        columns["mid"],
+        columns["max"],
+        columns["usd_mid"],
+        columns["whitelist_ngn"],
+        columns["usd_whitelist"],
+    ))
+
+    priced = 0
+    for i, row in enumerate(chunk):
+        cells = (row + [""] * width)[:width]
+        result = next(figures) if parsed[i] is not None else None
+
+        if result is None:
+            cells += [""] * (len(PRICED_COLUMNS) - 1) + [errors[i]]
+        elif result[0] is None:
+            cells += [""] * (len(PRICED_COLUMNS) - 1) + ["not enough data (followers or views needed)"]
+        else:
+            priced += 1
+            _, low, mid, high, usd_mid, whitelist_ngn, usd_whitelist = result
+            cells += [
+                low,
+                mid,
+                high,
+                usd_mid,
+                whitelist_ngn or "",
+                usd_whitelist or "",
+                "ok" if is_pro else "ok (whitelisting: PRO only)",
+            ]
+        writer.writerow(cells)
+
+    return priced
+
+
+def price_roster(
+    src_path: str,
+    dst_path: str,
+    filename: str,
+    is_pro: bool,
+    chunk_rows: int = ROSTER_CHUNK_ROWS,
+    max_rows: int = ROSTER_MAX_ROWS,
+    model: Optional[PricingModel] = None,
+    fx: Optional[FxSnapshot] = None,
+) -> Dict[str, Any]:
+    """
+    Streams the roster at `src_path`, prices it `chunk_rows` rows at a time
+    and appends each chunk to a CSV at `dst_path` (input columns + PRICED_COLUMNS).
+    Memory stays at one chunk regardless of file size.
+
+    `model` / `fx` are the pricing config and FX snapshots to use; worker
+    processes only know the built-in ones, so the pool passes the parent's.
+    """
+    model = model or current_model()
+    fx = fx or current_fx()
+    rows = read_rows(src_path, filename)
+    header = next(rows, None)
+    if not header or not any(header):
+        raise RosterError("the file is empty")
+
+    columns = map_columns(header)
+    width = len(header)
+
+    total = priced = 0
+    truncated = False
+
+    with open(dst_path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(header + PRICED_COLUMNS)
+
+        chunk: List[List[str]] = []
+        for row in rows:
+            if not any(row):
+                continue
+            if total >= max_rows:
+                truncated = True
+                break
+
+            chunk.append(row)
+            total += 1
+            if len(chunk) >= chunk_rows:
+                priced += _price_chunk(chunk, columns, width, is_pro, writer, model, fx)
+                chunk = []
+
+        if chunk:
+            priced += _price_chunk(chunk, columns, width, is_pro, writer, model, fx)
+
+    return {
+        "rows": total,
+        "priced": priced,
+        "skipped": total - priced,
+        "truncated": truncated,
+        "config_version": model.version,
+        "fx_version": fx.version,
+    }
+
+
+# -------------------------------------------------
+# WORKER POOL
+# -------------------------------------------------
+class RosterBusy(RuntimeError):
+    """
+    Too many roster jobs in flight.
+    """
+
+
+class RosterPricer:
+    """
+    Runs price_roster on a small process pool so CSV parsing and the engine
+    never hold the event loop (or its GIL) while other chats are served.
+    Workers are spawned, not forked: the parent runs an event loop and DB threads.
+    """
+
+    def __init__(self, workers: int = ROSTER_WORKERS, max_pending: int = ROSTER_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+
+        self.jobs = 0
+        self.rows = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, src_path: str, dst_path: str, filename: str, is_pro: bool) -> Dict[str, Any]:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise RosterBusy("roster queue is full")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            job = partial(price_roster, src_path, dst_path, filename, is_pro, model=current_model(), fx=current_fx())
+            summary = await loop.run_in_executor(self._pool(), job)
+        except RosterError:
+            self.failed += 1
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"❌ Roster pricing failed → {e}")
+            raise
+        finally:
+            self.pending -= 1
+
+        self.jobs += 1
+        self.rows += summary["rows"]
+        return summary
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("🛑 Roster workers stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "pending": self.pending,
+            "jobs": self.jobs,
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+roster_pricer = RosterPricer()
@@ -0,0 +1,216 @@
+# backend/app/services/telegram_rate_limiter.py
+
+import os
+import time
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Coroutine, Dict, Optional, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger("telegram-outbound")
+
+# -------------------------------------------------
+# CONFIG (Telegram Bot API limits)
+# -------------------------------------------------
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))      # msg/s, whole bot
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))           # msg/s, private chat
+TELEGRAM_CHAT_BURST = int(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+# Longest a request waits for its chat's bucket. Sends run inside update
+# handlers, so in queued mode this wait blocks a whole shard worker (every
+# chat on that shard); past the cap we send anyway and let a 429 pause us.
+TELEGRAM_CHAT_MAX_WAIT = float(os.getenv("TELEGRAM_CHAT_MAX_WAIT", "0.25"))
+TELEGRAM_GROUP_RATE = 20 / 60                                              # msg/s, group chat
+TELEGRAM_SEND_MAX_RETRIES = int(os.getenv("TELEGRAM_SEND_MAX_RETRIES", "2"))
+
+# idle per-chat buckets kept in memory
+_MAX_CHAT_BUCKETS = 10_000
+
+JSONResult = Union[bool, Dict[str, Any], list]
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens/s, up to `capacity` stored.
+    acquire() reserves a token and sleeps until it is due, so waiters are
+    served in arrival order without polling.
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_stamp")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """
+        Takes one token (possibly going negative) and returns the wait in seconds.
+        With `max_wait`, a longer wait is cut to `max_wait` and the debt beyond
+        it forgiven, so a burst never books waits further out than that.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        if max_wait is not None and -self._tokens > max_wait * self.rate:
+            self._tokens = -max_wait * self.rate
+        return -self._tokens / self.rate
+
+    async def acquire(self, max_wait: Optional[float] = None) -> float:
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def idle(self) -> bool:
+        return self._tokens + (time.monotonic() - self._stamp) * self.rate >= self.capacity
+
+
+class TelegramRateLimiter(BaseRateLimiter[int]):
+    """
+    Outbound scheduler for every Bot API call made through telegram_app.bot.
+
+    - Requests addressed to a chat take a per-chat token (1 msg/s with a
+      small burst, 20 msg/min for groups) and then a global token (30 msg/s).
+      The per-chat wait is capped at `chat_max_wait`: it runs on the
+      handler's task, i.e. on an update-queue shard worker, and stalls every
+      chat on that shard. Time spent there is reported as chat_wait_s_*.
+    - On RetryAfter the whole bot pauses for the requested time, then the
+      request is retried (up to `max_retries`, or rate_limit_args per call).
+    - Calls without a chat_id (answerCallbackQuery, getMe, ...) pass through.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        chat_burst: int = TELEGRAM_CHAT_BURST,
+        group_rate: float = TELEGRAM_GROUP_RATE,
+        max_retries: int = TELEGRAM_SEND_MAX_RETRIES,
+        chat_max_wait: float = TELEGRAM_CHAT_MAX_WAIT,
+    ):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self.chat_max_wait = chat_max_wait
+
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: "OrderedDict[Union[int, str], TokenBucket]" = OrderedDict()
+        self._resume = asyncio.Event()
+        self._resume.set()
+
+        # Bot API calls by endpoint (sendMessage, editMessageText, ...)
+        self.calls: Counter = Counter()
+        self.requests = 0
+        self.throttled = 0
+        self.retry_after = 0
+        self.wait_total = 0.0
+        # per-chat part of the wait: time update handlers (shard workers) sat blocked
+        self.chat_wait_total = 0.0
+        self.chat_wait_max = 0.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is not None:
+            self._chats.move_to_end(chat_id)
+            return bucket
+
+        group = isinstance(chat_id, str) or chat_id < 0
+        bucket = (
+            TokenBucket(self.group_rate, 1) if group
+            else TokenBucket(self.chat_rate, self.chat_burst)
+        )
+        self._chats[chat_id] = bucket
+
+        if len(self._chats) > _MAX_CHAT_BUCKETS:
+            oldest, old_bucket = next(iter(self._chats.items()))
+            if old_bucket.idle():
+                del self._chats[oldest]
+        return bucket
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, JSONResult]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> JSONResult:
+        max_retries = self.max_retries if rate_limit_args is None else rate_limit_args
+        self.requests += 1
+        self.calls[endpoint] += 1
+
+        chat_id = data.get("chat_id")
+        if chat_id is not None:
+            try:
+                chat_id = int(chat_id)
+            except (TypeError, ValueError):
+                pass  # @channelusername
+
+        for attempt in range(max_retries + 1):
+            await self._resume.wait()
+
+            if chat_id is not None:
+                chat_waited = await self._chat_bucket(chat_id).acquire(self.chat_max_wait)
+                if chat_waited > 0:
+                    self.chat_wait_total += chat_waited
+                    self.chat_wait_max = max(self.chat_wait_max, chat_waited)
+                waited = chat_waited + await self._global.acquire()
+                if waited > 0:
+                    self.throttled += 1
+                    self.wait_total += waited
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                self.retry_after += 1
+                if attempt == max_retries:
+                    logger.error(f"❌ Telegram {endpoint} still rate limited after {max_retries} retries")
+                    raise
+
+                delay = e.retry_after
+                seconds = delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+                logger.warning(f"⚠️ Telegram 429 on {endpoint}, pausing sends for {seconds:.1f}s")
+
+                # hold every outbound request, not just this one
+                self._resume.clear()
+                try:
+                    await asyncio.sleep(seconds + 0.1)
+                finally:
+                    self._resume.set()
+
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "global_rate": self.global_rate,
+            "chat_rate": self.chat_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retry_after": self.retry_after,
+            "wait_s_total": round(self.wait_total, 3),
+            "chat_max_wait_s": self.chat_max_wait,
+            "chat_wait_s_total": round(self.chat_wait_total, 3),
+            "chat_wait_s_max": round(self.chat_wait_max, 3),
+            "paused": not self._resume.is_set(),
+            "chat_buckets": len(self._chats),
+            "calls": dict(self.calls),
+        }
+
+
+telegram_rate_limiter = TelegramRateLimiter()
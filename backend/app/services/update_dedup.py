@@ -0,0 +1,160 @@
+# backend/app/services/update_dedup.py
+
+import logging
+from typing import Any, Dict
+
+from app.db import db_connection
+from app.db_async import run_db
+
+logger = logging.getLogger("telegram-dedup")
+
+# prune the shared table every N claims
+_PRUNE_EVERY = 1000
+
+
+class UpdateDeduplicator:
+    """
+    Drops redelivered Telegram updates by update_id.
+
+    Local fast path: a sliding-window bitmap over the last `window` update_ids
+    (window / 8 bytes, O(1) check-and-set). Telegram update_ids increase
+    monotonically and redeliveries are recent, so a jump back by more than
+    the window is not a replay: Telegram restarts the sequence at a random
+    value after a week without updates, and the bitmap is reset to follow it.
+
+    Optional shared path (multi-worker): ids that pass the local bitmap are
+    claimed with one INSERT ... ON CONFLICT DO NOTHING in `telegram_updates`,
+    so a redelivery landing on another worker is dropped too.
+    """
+
+    def __init__(self, window: int = 65536, shared: bool = False):
+        if window < 8 or window % 8:
+            raise ValueError("window must be a positive multiple of 8")
+
+        self.window = window
+        self.shared = shared
+
+        self._bits = bytearray(window // 8)
+        self._high = -1
+
+        self.checked = 0
+        self.duplicates = 0
+        self.resets = 0
+        self._claims = 0
+
+    # ---------- local bitmap ----------
+    def _test_and_set(self, update_id: int) -> bool:
+        """
+        Returns True if update_id was already seen, else marks it.
+        """
+        if self._high >= 0:
+            if update_id <= self._high - self.window:
+                # sequence reset, not a redelivery (those are well inside the window)
+                logger.warning(f"⚠️ update_id went back from {self._high} to {update_id}: sequence reset")
+                self._bits[:] = bytes(len(self._bits))
+                self._high = update_id
+                self.resets += 1
+
+            if update_id > self._high:
+                self._clear_range(self._high + 1, update_id)
+                self._high = update_id
+        else:
+            self._high = update_id
+
+        slot = update_id % self.window
+        byte, mask = slot >> 3, 1 << (slot & 7)
+        if self._bits[byte] & mask:
+            return True
+        self._bits[byte] |= mask
+        return False
+
+    def _clear_range(self, start: int, end: int) -> None:
+        # slots entering the window must not carry bits from ids a full window ago
+        if end - start + 1 >= self.window:
+            self._bits[:] = bytes(len(self._bits))
+            return
+        for update_id in range(start, end + 1):
+            slot = update_id % self.window
+            self._bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    def forget(self, update_id: int) -> None:
+        """
+        Un-marks an update we did not actually accept (e.g. queue full → 503),
+        so Telegram's redelivery is processed.
+        """
+        if self._high - self.window < update_id <= self._high:
+            slot = update_id % self.window
+            self._bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    # ---------- public API ----------
+    async def is_duplicate(self, update_id: int) -> bool:
+        self.checked += 1
+
+        if self._test_and_set(update_id):
+            self.duplicates += 1
+            return True
+
+        if self.shared:
+            try:
+                claimed = await run_db(_claim_update, update_id, self._claims % _PRUNE_EVERY == 0)
+                self._claims += 1
+            except Exception as e:
+                # fail open: processing twice beats dropping an update
+                logger.error(f"❌ Shared dedup unavailable → {e}")
+                return False
+
+            if not claimed:
+                self.duplicates += 1
+                return True
+
+        return False
+
+    async def release(self, update_id: int) -> None:
+        self.forget(update_id)
+        if self.shared:
+            try:
+                await run_db(_release_update, update_id)
+            except Exception as e:
+                logger.error(f"❌ Shared dedup release failed → {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "shared": self.shared,
+            "highest_update_id": self._high,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "sequence_resets": self.resets,
+        }
+
+
+# -------------------------------------------------
+# SHARED STORE (telegram_updates table)
+# -------------------------------------------------
+def _claim_update(update_id: int, prune: bool) -> bool:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO telegram_updates (update_id) VALUES (%s)
+            ON CONFLICT (update_id) DO NOTHING
+            RETURNING update_id
+            """,
+            (update_id,),
+        )
+        claimed = cur.fetchone() is not None
+
+        if prune:
+            cur.execute(
+                "DELETE FROM telegram_updates WHERE received_at < CURRENT_TIMESTAMP - INTERVAL '1 day'"
+            )
+
+        conn.commit()
+        return claimed
+
+
+def _release_update(update_id: int) -> None:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM telegram_updates WHERE update_id = %s", (update_id,))
+        conn.commit()
@@ -0,0 +1,162 @@
+# backend/app/services/update_queue.py
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from telegram import Update
+
+logger = logging.getLogger("telegram-queue")
+
+
+class UpdateQueue:
+    """
+    Bounded, sharded worker queue for Telegram updates.
+
+    - The webhook acks immediately and submit()s the update.
+    - Each update is routed to shard `chat_id % workers`, and each shard has
+      exactly one worker, so updates from one chat are processed in order
+      while different chats run concurrently.
+    - Shards are bounded; submit() waits up to `put_timeout` for room
+      (backpressure) and returns False if the queue stays full.
+    - stop() drains queued updates before cancelling workers.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Update], Awaitable[Any]],
+        workers: int = 8,
+        maxsize: int = 1000,
+        put_timeout: float = 2.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        self._process = process
+        self.workers = workers
+        self.maxsize = maxsize
+        self.put_timeout = put_timeout
+
+        per_shard = max(1, -(-maxsize // workers))
+        self._per_shard = per_shard
+        self._shards: List["asyncio.Queue[Optional[tuple]]"] = []
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._accepting = False
+
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._shards = [asyncio.Queue(maxsize=self._per_shard) for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"telegram-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._accepting = True
+        logger.info(f"📥 Update queue started ({self.workers} workers, maxsize={self.maxsize})")
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """
+        Stops accepting updates, waits for queued ones to finish, then stops workers.
+        """
+        if not self._tasks:
+            return
+
+        self._accepting = False
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(q.join() for q in self._shards)),
+                timeout=drain_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Update queue drain timed out with {self.depth()} updates left")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("🛑 Update queue stopped")
+
+    # ---------- producer ----------
+    async def submit(self, update: Update) -> bool:
+        """
+        Enqueues an update. Returns False if the queue is stopped or stays full.
+        """
+        if not self._accepting:
+            return False
+
+        shard = self._shards[self._shard_key(update) % self.workers]
+        try:
+            await asyncio.wait_for(shard.put((update, time.monotonic())), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+
+        self.submitted += 1
+        return True
+
+    @staticmethod
+    def _shard_key(update: Update) -> int:
+        chat = update.effective_chat
+        if chat is not None:
+            return chat.id
+        user = update.effective_user
+        if user is not None:
+            return user.id
+        return update.update_id
+
+    # ---------- consumer ----------
+    async def _worker(self, index: int) -> None:
+        queue = self._shards[index]
+        while True:
+            update, enqueued_at = await queue.get()
+            try:
+                await self._process(update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Error processing Telegram update {update.update_id}: {e}")
+            finally:
+                self._latencies.append(time.monotonic() - enqueued_at)
+                queue.task_done()
+
+    # ---------- metrics ----------
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._shards)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "running": self._accepting,
+            "workers": self.workers,
+            "maxsize": self.maxsize,
+            "depth": self.depth(),
+            "max_shard_depth": max((q.qsize() for q in self._shards), default=0),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p95": pct(0.95),
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
@@ -0,0 +1,124 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# sentinel returned by TTLCache.get() on a miss (cached values may be falsy)
+MISSING: Any = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded, thread-safe LRU cache with per-entry expiry.
+
+    - `maxsize` caps the number of entries (least recently used is evicted).
+    - `ttl` is the default lifetime in seconds; set() can override it per entry.
+    - Tracks hits / misses / evictions / expirations for metrics endpoints.
+    - Read-through callers take token() before loading and pass it to set():
+      the value is dropped if the key was invalidated meanwhile, so a load
+      that raced an invalidation cannot cache the old value.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # invalidation sequence: key → seq of its last invalidate(), bounded
+        # like the entries; keys pushed out fall under _floor
+        self._seq = 0
+        self._floor = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def token(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None, token: Optional[int] = None) -> None:
+        lifetime = self.ttl if ttl is None else ttl
+        if lifetime <= 0:
+            self.invalidate(key)
+            return
+
+        expires_at = time.monotonic() + lifetime
+        with self._lock:
+            if token is not None and self._invalidated.get(key, self._floor) > token:
+                self.stale_sets += 1
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            self._seq += 1
+            self._invalidated[key] = self._seq
+            self._invalidated.move_to_end(key)
+            if len(self._invalidated) > self.maxsize:
+                _, self._floor = self._invalidated.popitem(last=False)
+
+            if self._data.pop(key, None) is None:
+                return False
+            self.invalidations += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._seq += 1
+            self._floor = self._seq
+            self._invalidated.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+            }
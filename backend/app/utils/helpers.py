@@ -1,7 +1,8 @@
 import os
-import psycopg2
 from typing import Union
 
+from app.services.pro_service import is_user_pro
+
 
 # -------------------------------------------------
 # ENV
@@ -13,37 +14,11 @@ def get_required_env(name: str) -> str:
     return value
 
 
-DATABASE_URL = get_required_env("DATABASE_URL")
-
-
-# -------------------------------------------------
-# DB
-# -------------------------------------------------
-def get_db():
-    return psycopg2.connect(
-        DATABASE_URL,
-        sslmode="require",
-        connect_timeout=5,
-    )
-
-
 # -------------------------------------------------
 # PRO CHECK
 # -------------------------------------------------
 def is_pro_user(telegram_id: Union[str, int]) -> bool:
     """
-    Returns True if the user is a PRO user.
+    Returns True if the user is a PRO user (cached, expiry-aware).
     """
-    conn = get_db()
-    cur = conn.cursor()
-
-    cur.execute(
-        "SELECT is_pro FROM creators WHERE telegram_id = %s",
-        (str(telegram_id),),
-    )
-    row = cur.fetchone()
-
-    cur.close()
-    conn.close()
-
-    return bool(row and row[0] is True)
+    return is_user_pro(telegram_id)
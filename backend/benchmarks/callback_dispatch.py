@@ -0,0 +1,118 @@
+# backend/benchmarks/callback_dispatch.py
+#
+# Micro-benchmark: cost of routing one callback query.
+#
+#   legacy  → the old chain: three regex CallbackQueryHandlers + catch-all
+#             router doing string compares (PTB checks handlers in order)
+#   current → one CallbackQueryHandler + decode + dict lookup + validation
+#
+# Run from backend/ (imports the bot, so the usual env vars must be set;
+# no DB or network connection is made):
+#   python -m benchmarks.callback_dispatch [iterations]
+
+import sys
+import time
+from typing import Callable, List
+
+from telegram import Bot, Update
+from telegram.ext import CallbackQueryHandler
+
+from bot.callback_data import CallbackDispatcher, encode
+from app.services.pricing_input import PLATFORM_MAP, NICHE_MAP
+
+
+async def _noop(*args) -> None:
+    return None
+
+
+def _update(bot: Bot, data: str) -> Update:
+    user = {"id": 42, "is_bot": False, "first_name": "u"}
+    return Update.de_json({
+        "update_id": 1,
+        "callback_query": {
+            "id": "1",
+            "from": user,
+            "chat_instance": "c",
+            "data": data,
+            "message": {"message_id": 1, "date": 0, "chat": {"id": 42, "type": "private"}, "text": "k"},
+        },
+    }, bot)
+
+
+def _legacy_router(data: str) -> str:
+    # the old callback_router's if-chain
+    if data == "upgrade_pro":
+        return "upgrade_pro"
+    if data == "elite_package":
+        return "elite_package"
+    if data == "export_ratecard":
+        return "export_ratecard"
+    return "unknown"
+
+
+def legacy_dispatch(handlers: List[CallbackQueryHandler]) -> Callable[[Update], str]:
+    def route(update: Update) -> str:
+        for handler in handlers:
+            if handler.check_update(update):
+                if handler.pattern is None:
+                    return _legacy_router(update.callback_query.data)
+                return handler.pattern.pattern
+        return "unhandled"
+    return route
+
+
+def current_dispatch(dispatcher: CallbackDispatcher, handler: CallbackQueryHandler) -> Callable[[Update], object]:
+    def route(update: Update) -> object:
+        if handler.check_update(update):
+            return dispatcher.route(update.callback_query.data)
+        return None
+    return route
+
+
+def bench(fn: Callable[[Update], object], updates: List[Update], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for update in updates:
+            fn(update)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(updates)) * 1e9
+
+
+def main(argv: List[str]) -> int:
+    iterations = int(argv[0]) if argv else 20_000
+    bot = Bot("123:abc")
+
+    legacy_handlers = [
+        CallbackQueryHandler(_noop, pattern=r"^platform_"),
+        CallbackQueryHandler(_noop, pattern=r"^niche_"),
+        CallbackQueryHandler(_noop, pattern=r"^elite_package"),
+        CallbackQueryHandler(_noop),
+    ]
+    legacy_updates = [_update(bot, d) for d in (
+        "platform_tiktok", "niche_tech", "elite_package", "upgrade_pro", "export_ratecard",
+    )]
+
+    dispatcher = CallbackDispatcher()
+    dispatcher.register("platform", _noop, validate=PLATFORM_MAP.__contains__)
+    dispatcher.register("niche", _noop, validate=NICHE_MAP.__contains__)
+    dispatcher.register("elite_package", _noop)
+    dispatcher.register("upgrade_pro", _noop)
+    dispatcher.register("export_ratecard", _noop)
+    current_updates = [_update(bot, d) for d in (
+        encode("platform", "tiktok"), encode("niche", "tech"), encode("elite_package"),
+        encode("upgrade_pro"), encode("export_ratecard"),
+    )]
+
+    legacy_ns = bench(legacy_dispatch(legacy_handlers), legacy_updates, iterations)
+    current_ns = bench(current_dispatch(dispatcher, CallbackQueryHandler(_noop)), current_updates, iterations)
+    # old-format buttons still in chats go through the v0 decoder
+    compat_ns = bench(current_dispatch(dispatcher, CallbackQueryHandler(_noop)), legacy_updates, iterations)
+
+    print(f"legacy regex chain   : {legacy_ns:8.0f} ns/callback")
+    print(f"dict dispatcher      : {current_ns:8.0f} ns/callback  ({legacy_ns / current_ns:.2f}x)")
+    print(f"dispatcher (v0 data) : {compat_ns:8.0f} ns/callback")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
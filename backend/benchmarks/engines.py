@@ -0,0 +1,141 @@
+# backend/benchmarks/engines.py
+#
+# Micro-benchmarks for the three pricing implementations and a PricingCache
+# hit, plus a batch-size sweep of hybrid_pricing_engine_batch (and the
+# columnar hybrid_pricing_engine_columns) against a loop of scalar calls.
+#
+# Pure CPU, no env vars / DB needed. Run from backend/:
+#   python -m benchmarks.engines [--quick]
+
+import sys
+import time
+import random
+from typing import Any, Callable, Dict, List, Sequence
+
+from app.services.hybrid_pricing_engine import (
+    hybrid_pricing_engine,
+    hybrid_pricing_engine_batch,
+    hybrid_pricing_engine_columns,
+)
+from app.services.pricing_cache import PricingCache
+from app.services.pricing_service import calculate_price
+from app.services.pricing_engine import calculate_pricing
+
+Results = Dict[str, Dict[str, Any]]
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000)
+
+_PLATFORMS = ("instagram", "tiktok", "youtube", "twitter", "facebook")
+_NICHES = ("tech", "beauty", "comedy", "lifestyle", "fitness", "general")
+
+
+def best_ns(fn: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """
+    Best-of-`repeat` time for `number` calls, in ns per call
+    (the minimum is the least noisy estimate on a shared machine).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def synthetic_rows(n: int, seed: int = 7) -> Dict[str, List[Any]]:
+    rng = random.Random(seed)
+    return {
+        "followers": [rng.choice([None, rng.randint(1_000, 2_000_000)]) for _ in range(n)],
+        "avg_views": [rng.choice([None, rng.randint(500, 500_000)]) for _ in range(n)],
+        "engagement": [rng.choice([None, round(rng.uniform(0.005, 0.2), 4)]) for _ in range(n)],
+        "platform": [rng.choice(_PLATFORMS) for _ in range(n)],
+        "niche": [rng.choice(_NICHES) for _ in range(n)],
+        "is_pro": [rng.random() < 0.3 for _ in range(n)],
+    }
+
+
+def _metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def bench_scalar(number: int) -> Results:
+    cache = PricingCache(maxsize=1_000, ttl=3600)
+    return {
+        "engines.hybrid_range_ns": _metric(best_ns(
+            lambda: hybrid_pricing_engine(50_000, 12_000, 0.08, "tiktok", "tech", True, mode="range"), number
+        ), "ns/call"),
+        "engines.hybrid_single_ns": _metric(best_ns(
+            lambda: hybrid_pricing_engine(50_000, 12_000, 0.08, "tiktok", "tech", False), number
+        ), "ns/call"),
+        "engines.hybrid_cached_hit_ns": _metric(best_ns(
+            lambda: cache.quote(50_000, 12_000, 0.08, "tiktok", "tech", True, mode="range"), number
+        ), "ns/call"),
+        "engines.pricing_service_ns": _metric(best_ns(
+            lambda: calculate_price(50_000, 12_000, 0.08), number
+        ), "ns/call"),
+        "engines.pricing_engine_ns": _metric(best_ns(
+            lambda: calculate_pricing(50_000, 12_000, 0.08), number
+        ), "ns/call"),
+    }
+
+
+def bench_batch_sweep(sizes: Sequence[int], budget_rows: int, max_calls: int = 2_000) -> Results:
+    """
+    ns/row for each batch size: vectorized batch (dict per row) and
+    columnar output vs. a loop of scalar calls.
+    Every size prices roughly `budget_rows` rows per repeat (at most
+    `max_calls` calls, so tiny batches don't take forever).
+    """
+    results: Results = {}
+
+    for size in sizes:
+        rows = synthetic_rows(size)
+        calls = max(1, min(max_calls, budget_rows // size))
+
+        def batch() -> None:
+            hybrid_pricing_engine_batch(
+                rows["followers"], rows["avg_views"], rows["engagement"],
+                rows["platform"], rows["niche"], rows["is_pro"], mode="range",
+            )
+
+        def columns() -> None:
+            hybrid_pricing_engine_columns(
+                rows["followers"], rows["avg_views"], rows["engagement"],
+                rows["platform"], rows["niche"], rows["is_pro"],
+            )
+
+        def scalar_loop() -> None:
+            for i in range(size):
+                hybrid_pricing_engine(
+                    rows["followers"][i], rows["avg_views"][i], rows["engagement"][i],
+                    rows["platform"][i], rows["niche"][i], rows["is_pro"][i], mode="range",
+                )
+
+        batch_ns = best_ns(batch, calls, repeat=3) / size
+        columns_ns = best_ns(columns, calls, repeat=3) / size
+        scalar_ns = best_ns(scalar_loop, calls, repeat=3) / size
+
+        results[f"batch.size_{size}.batch_ns_per_row"] = _metric(batch_ns, "ns/row")
+        results[f"batch.size_{size}.scalar_ns_per_row"] = _metric(scalar_ns, "ns/row")
+        results[f"batch.size_{size}.speedup"] = _metric(scalar_ns / batch_ns, "x", better="higher")
+        results[f"batch.size_{size}.columns_ns_per_row"] = _metric(columns_ns, "ns/row")
+        results[f"batch.size_{size}.columns_speedup"] = _metric(scalar_ns / columns_ns, "x", better="higher")
+
+    return results
+
+
+def run(quick: bool = False) -> Results:
+    results = bench_scalar(number=5_000 if quick else 20_000)
+    results.update(bench_batch_sweep(BATCH_SIZES, budget_rows=10_000 if quick else 50_000))
+    return results
+
+
+def main(argv: List[str]) -> int:
+    for name, metric in run(quick="--quick" in argv).items():
+        print(f"{name:<40} {metric['value']:>12,.2f} {metric['unit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,174 @@
+# backend/benchmarks/run.py
+#
+# Benchmark suite runner: runs every suite, writes one JSON result file and
+# (optionally) compares it with a baseline result file using the relative
+# tolerances in thresholds.json. Exits 1 if any metric regressed.
+#
+# Run from backend/:
+#   python -m benchmarks.run                                  # full run
+#   python -m benchmarks.run --quick --only engines           # fast subset
+#   python -m benchmarks.run --baseline benchmarks/results/<old>.json
+#
+# Result files go to benchmarks/results/<git sha>.json unless --out is given.
+
+import os
+import sys
+import json
+import fnmatch
+import argparse
+import platform
+import datetime
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.hybrid_pricing_engine import current_model
+
+Results = Dict[str, Dict[str, Any]]
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, "thresholds.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def _engines(quick: bool) -> Tuple[Results, Dict[str, Any]]:
+    from benchmarks import engines
+    return engines.run(quick), {}
+
+
+def _webhook(quick: bool) -> Tuple[Results, Dict[str, Any]]:
+    # imported lazily: importing the app sets dummy env vars (see webhook_replay)
+    from benchmarks import webhook_replay
+    return webhook_replay.run(quick)
+
+
+SUITES: Dict[str, Callable[[bool], Tuple[Results, Dict[str, Any]]]] = {
+    "engines": _engines,
+    "webhook": _webhook,
+}
+
+
+def _git_sha() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+# -------------------------------------------------
+# REGRESSION CHECK
+# -------------------------------------------------
+def load_thresholds(path: str = THRESHOLDS_PATH) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def tolerance_for(name: str, thresholds: Dict[str, Any]) -> float:
+    for pattern, tolerance in thresholds.get("metrics", {}).items():
+        if fnmatch.fnmatch(name, pattern):
+            return float(tolerance)
+    return float(thresholds.get("default", 0.25))
+
+
+def compare(current: Results, baseline: Results, thresholds: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    One row per metric present in both runs. `change` is signed so that
+    positive always means worse; `regressed` when it exceeds the tolerance.
+    """
+    rows: List[Dict[str, Any]] = []
+
+    for name, metric in current.items():
+        base = baseline.get(name)
+        if base is None or not base.get("value"):
+            continue
+
+        ratio = metric["value"] / base["value"]
+        change = ratio - 1 if metric.get("better", "lower") == "lower" else 1 - ratio
+        tolerance = tolerance_for(name, thresholds)
+
+        rows.append({
+            "metric": name,
+            "baseline": base["value"],
+            "current": metric["value"],
+            "unit": metric.get("unit", ""),
+            "change": round(change, 4),
+            "tolerance": tolerance,
+            "regressed": change > tolerance,
+        })
+
+    return rows
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (smoke run)")
+    parser.add_argument("--only", default=",".join(SUITES), help="comma-separated suites: " + ", ".join(SUITES))
+    parser.add_argument("--out", help="result file (default: benchmarks/results/<git sha>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    info: Dict[str, Any] = {}
+    for suite in args.only.split(","):
+        suite = suite.strip()
+        if suite not in SUITES:
+            parser.error(f"unknown suite: {suite}")
+        print(f"▶ {suite}", flush=True)
+        suite_results, suite_info = SUITES[suite](args.quick)
+        results.update(suite_results)
+        if suite_info:
+            info[suite] = suite_info
+
+    sha = _git_sha()
+    report = {
+        "meta": {
+            "git_sha": sha,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+            "pricing_config_version": current_model().version,
+        },
+        "results": results,
+        "info": info,
+    }
+
+    for name, metric in results.items():
+        print(f"  {name:<40} {metric['value']:>12,.2f} {metric['unit']}")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        rows = compare(results, baseline["results"], load_thresholds(args.thresholds))
+        report["comparison"] = {"baseline": baseline.get("meta", {}), "metrics": rows}
+
+        regressed = [r for r in rows if r["regressed"]]
+        print(f"\n⚖️  vs {baseline.get('meta', {}).get('git_sha', args.baseline)}:")
+        for r in rows:
+            flag = "❌" if r["regressed"] else "  "
+            print(f"  {flag} {r['metric']:<40} {r['change']:+8.1%} (limit {r['tolerance']:.0%})")
+        if regressed:
+            print(f"\n❌ {len(regressed)} metric(s) regressed beyond threshold")
+            exit_code = 1
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{sha}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 {out}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+# backend/benchmarks/webhook_replay.py
+#
+# End-to-end replay: synthetic Telegram updates are POSTed to
+# /telegram/webhook (real FastAPI router, real handlers, real
+# conversation store) with two stand-ins:
+#
+#   FakeBotAPI → answers every Bot API call locally (no network)
+#   MemoryDB   → replaces the DB helpers the update path uses
+#                (conversation state, PRO status) with dicts
+#
+# Outbound pacing is lifted so the numbers measure our code, not Telegram's
+# rate limits. Run from backend/:
+#   python -m benchmarks.webhook_replay [--quick]
+
+import os
+import sys
+
+# dummy config (nothing connects); must be set before the app is imported
+for _name, _value in {
+    "DATABASE_URL": "postgresql://bench@localhost/bench",
+    "PAYSTACK_SECRET_KEY": "sk_bench",
+    "TELEGRAM_BOT_TOKEN": "123:bench",
+    "CONVERSATION_STORE": "postgres",
+    "PRICING_TRANSPORT": "local",
+    "TELEGRAM_GLOBAL_RATE": "1000000",
+    "TELEGRAM_CHAT_RATE": "1000000",
+    "TELEGRAM_CHAT_BURST": "1000000",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import json
+import time
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI
+from telegram.request import BaseRequest, RequestData
+
+import app.services.conversation_store as conversation_module
+import app.services.pro_service as pro_module
+from app.routes import telegram_webhook as webhook_module
+from bot.callback_data import encode
+
+Results = Dict[str, Dict[str, Any]]
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench_bot"}
+
+
+# -------------------------------------------------
+# STAND-INS
+# -------------------------------------------------
+class FakeBotAPI(BaseRequest):
+    """
+    Bot API that never leaves the process: every method succeeds and
+    message-returning methods get a plausible Message back.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self._message_id = 1000
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return 5.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout: Any = None,
+        write_timeout: Any = None,
+        connect_timeout: Any = None,
+        pool_timeout: Any = None,
+    ) -> Tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+
+        params = request_data.parameters if request_data is not None else {}
+        if endpoint == "getMe":
+            result: Any = BOT_USER
+        elif endpoint in ("sendMessage", "editMessageText", "sendDocument"):
+            self._message_id += 1
+            result = {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "from": BOT_USER,
+                "text": str(params.get("text", "")),
+            }
+        else:
+            result = True
+
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+class MemoryDB:
+    """
+    In-memory stand-in for the tables touched while handling an update.
+    """
+
+    def __init__(self, pro_users: Optional[set] = None) -> None:
+        self.conversations: Dict[int, str] = {}
+        self.pro_users = pro_users or set()
+        self.queries: Counter = Counter()
+
+    def load_state(self, user_id: int, ttl: int) -> Optional[str]:
+        self.queries["conversation_load"] += 1
+        return self.conversations.get(user_id)
+
+    def write_states(self, upserts: List[Tuple[int, str]], deletes: List[int], purge_ttl: Optional[int]) -> None:
+        self.queries["conversation_write"] += 1
+        self.conversations.update(upserts)
+        for user_id in deletes:
+            self.conversations.pop(user_id, None)
+
+    def load_pro_status(self, telegram_id: str) -> Tuple[bool, Optional[float]]:
+        self.queries["pro_status"] += 1
+        return (True, 300.0) if telegram_id in self.pro_users else (False, None)
+
+    def install(self) -> None:
+        conversation_module._load_state = self.load_state
+        conversation_module._write_states = self.write_states
+        pro_module._load_pro_status = self.load_pro_status
+
+
+# -------------------------------------------------
+# SYNTHETIC TRAFFIC
+# -------------------------------------------------
+def _message(update_id: int, user_id: int, text: str) -> Dict[str, Any]:
+    user = {"id": user_id, "is_bot": False, "first_name": f"u{user_id}"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": user,
+            "text": text,
+        },
+    }
+
+
+def _callback(update_id: int, user_id: int, data: str) -> Dict[str, Any]:
+    user = {"id": user_id, "is_bot": False, "first_name": f"u{user_id}"}
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": user,
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": user_id, "type": "private"},
+                "from": BOT_USER,
+                "text": "menu",
+            },
+        },
+    }
+
+
+def conversation(first_update_id: int, user_id: int) -> List[Dict[str, Any]]:
+    """
+    One user's session: stats → platform → niche → pricing card, then a bulk quote.
+    """
+    uid = first_update_id
+    return [
+        _message(uid, user_id, "/start"),
+        _message(uid + 1, user_id, "50k 12k 8%"),
+        _callback(uid + 2, user_id, encode("platform", "tiktok")),
+        _callback(uid + 3, user_id, encode("niche", "tech")),
+        _message(uid + 4, user_id, "@a 50k 12k 8% tiktok tech\n@b 1.2m instagram beauty\n@c 30k 4% youtube comedy"),
+    ]
+
+
+# -------------------------------------------------
+# REPLAY
+# -------------------------------------------------
+def _pct(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+async def _replay(users: int, queued: bool, first_update_id: int) -> Dict[str, float]:
+    api = FastAPI()
+    api.include_router(webhook_module.router)
+
+    queue = webhook_module.update_queue
+    submitted_before = queue.submitted
+    done_before = queue.processed + queue.failed
+    if queued:
+        await queue.start()
+
+    latencies: List[float] = []
+    sessions = [conversation(first_update_id + i * 10, 10_000 + i) for i in range(users)]
+    total = sum(len(s) for s in sessions)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://bench") as client:
+        async def run_session(updates: List[Dict[str, Any]]) -> None:
+            for payload in updates:
+                start = time.perf_counter()
+                resp = await client.post("/telegram/webhook", json=payload)
+                latencies.append(time.perf_counter() - start)
+                resp.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run_session(s) for s in sessions))
+        if queued:
+            # acked ≠ done: wait until every submitted update has been handled
+            while queue.processed + queue.failed - done_before < queue.submitted - submitted_before:
+                await asyncio.sleep(0.001)
+            await queue.stop()
+        elapsed = time.perf_counter() - started
+
+    return {
+        "updates_per_s": total / elapsed,
+        "p50_ms": _pct(latencies, 0.50) * 1000,
+        "p95_ms": _pct(latencies, 0.95) * 1000,
+    }
+
+
+async def _run(users: int) -> Tuple[Results, Dict[str, Any]]:
+    logging.disable(logging.WARNING)
+
+    fake_api = FakeBotAPI()
+    db = MemoryDB(pro_users={str(10_000 + i) for i in range(0, users, 3)})
+    db.install()
+
+    bot = webhook_module.telegram_app.bot
+    bot._request = (fake_api, fake_api)   # no public hook to swap the transport after build()
+    await webhook_module.telegram_app.initialize()
+
+    store = conversation_module.conversation_store
+    try:
+        inline = await _replay(users, queued=False, first_update_id=1)
+        queued = await _replay(users, queued=True, first_update_id=1_000_000)
+        await store.flush()
+    finally:
+        await webhook_module.telegram_app.shutdown()
+        logging.disable(logging.NOTSET)
+
+    results: Results = {
+        "webhook.inline.updates_per_s": {"value": round(inline["updates_per_s"], 1), "unit": "updates/s", "better": "higher"},
+        "webhook.inline.p50_ms": {"value": round(inline["p50_ms"], 3), "unit": "ms", "better": "lower"},
+        "webhook.inline.p95_ms": {"value": round(inline["p95_ms"], 3), "unit": "ms", "better": "lower"},
+        "webhook.queued.updates_per_s": {"value": round(queued["updates_per_s"], 1), "unit": "updates/s", "better": "higher"},
+        "webhook.queued.ack_p95_ms": {"value": round(queued["p95_ms"], 3), "unit": "ms", "better": "lower"},
+    }
+    info = {
+        "users": users,
+        "bot_api_calls": dict(fake_api.calls),
+        "db_queries": dict(db.queries),
+        "conversation_store": store.stats(),
+    }
+    return results, info
+
+
+def run(quick: bool = False) -> Tuple[Results, Dict[str, Any]]:
+    return asyncio.run(_run(users=50 if quick else 400))
+
+
+def main(argv: List[str]) -> int:
+    results, info = run(quick="--quick" in argv)
+    for name, metric in results.items():
+        print(f"{name:<40} {metric['value']:>12,.2f} {metric['unit']}")
+    print(json.dumps(info, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
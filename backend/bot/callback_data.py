@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from telegram import Update
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------
+# CALLBACK DATA SCHEME
+#   "<prefix>:<action>:<payload>"   e.g.  "c1:platform:tiktok"
+# prefix = "c" + scheme version. Bump the version when the layout changes
+# and add a decoder: keyboards already sitting in chats keep working.
+# -------------------------------------------------
+CALLBACK_PREFIX = "c"
+CALLBACK_VERSION = 1
+
+_CURRENT = f"{CALLBACK_PREFIX}{CALLBACK_VERSION}"
+_MAX_BYTES = 64   # Telegram limit for callback_data
+
+# v0: the original underscore strings ("platform_tiktok", "upgrade_pro", ...)
+_LEGACY_PREFIXES: Tuple[Tuple[str, str], ...] = (
+    ("platform_", "platform"),
+    ("niche_", "niche"),
+)
+_LEGACY_ACTIONS: Dict[str, str] = {
+    "upgrade_pro": "upgrade_pro",
+    "elite_package": "elite_package",
+    "export_ratecard": "export_ratecard",
+}
+
+
+class CallbackData(NamedTuple):
+    version: int
+    action: str
+    payload: str
+
+
+def encode(action: str, payload: str = "") -> str:
+    data = f"{_CURRENT}:{action}:{payload}"
+    if len(data.encode()) > _MAX_BYTES:
+        raise ValueError(f"callback_data too long: {data!r}")
+    return data
+
+
+def _decode_v1(rest: str) -> Optional[CallbackData]:
+    action, _, payload = rest.partition(":")
+    return CallbackData(1, action, payload) if action else None
+
+
+def _decode_v0(data: str) -> Optional[CallbackData]:
+    action = _LEGACY_ACTIONS.get(data)
+    if action is not None:
+        return CallbackData(0, action, "")
+    for prefix, legacy_action in _LEGACY_PREFIXES:
+        if data.startswith(prefix):
+            return CallbackData(0, legacy_action, data[len(prefix):].lower())
+    return None
+
+
+_DECODERS: Dict[str, Callable[[str], Optional[CallbackData]]] = {
+    f"{CALLBACK_PREFIX}1": _decode_v1,
+}
+
+
+def decode(data: Optional[str]) -> Optional[CallbackData]:
+    """
+    Parses callback_data of any known version; None if unrecognised.
+    """
+    if not data:
+        return None
+
+    prefix, sep, rest = data.partition(":")
+    if sep:
+        decoder = _DECODERS.get(prefix)
+        return decoder(rest) if decoder is not None else None
+    return _decode_v0(data)
+
+
+# -------------------------------------------------
+# DISPATCHER
+# -------------------------------------------------
+CallbackHandlerFn = Callable[[Update, ContextTypes.DEFAULT_TYPE, str], Awaitable[Any]]
+Validator = Callable[[str], bool]
+
+
+class CallbackDispatcher:
+    """
+    One CallbackQueryHandler for every inline button:
+    decode → dict lookup by action → validate payload → handler(update, context, payload).
+
+    The query is answered here (once), so handlers must not answer it again.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, Tuple[CallbackHandlerFn, Optional[Validator]]] = {}
+        self.dispatched = 0
+        self.rejected = 0
+
+    def register(self, action: str, handler: CallbackHandlerFn, validate: Optional[Validator] = None) -> None:
+        self._routes[action] = (handler, validate)
+
+    def route(self, data: Optional[str]) -> Optional[Tuple[CallbackHandlerFn, str]]:
+        """
+        Resolves callback_data to (handler, payload), or None if invalid.
+        """
+        decoded = decode(data)
+        if decoded is None:
+            return None
+
+        route = self._routes.get(decoded.action)
+        if route is None:
+            return None
+
+        handler, validate = route
+        if validate is not None and not validate(decoded.payload):
+            return None
+        return handler, decoded.payload
+
+    async def dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+        if query is None:
+            return
+
+        try:
+            await query.answer()
+        except BadRequest as e:
+            # expired query (e.g. redelivered after a restart) — still handle the tap
+            logger.warning(f"Callback answer failed → {e}")
+
+        resolved = self.route(query.data)
+        if resolved is None:
+            self.rejected += 1
+            logger.warning(f"⚠️ Unknown callback data: {query.data!r}")
+            if query.message is not None and query.message.chat is not None:
+                await context.bot.send_message(query.message.chat.id, "⚠️ Unknown action.")
+            return
+
+        handler, payload = resolved
+        self.dispatched += 1
+        await handler(update, context, payload)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "actions": sorted(self._routes),
+            "dispatched": self.dispatched,
+            "rejected": self.rejected,
+        }
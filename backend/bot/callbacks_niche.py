@@ -1,84 +1,77 @@
 from __future__ import annotations
-from typing import Optional, Dict, Any, cast
+import os
+from typing import Optional, Dict, Any, List, cast
 
 from telegram import Update, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 import httpx
 
 from bot.handlers.subscribe import get_backend_url
-from app.services.pro_service import is_user_pro
+from bot.progress import ProgressMessage
+from bot.callback_data import encode
+from bot.config import TELEGRAM_EDIT_IN_PLACE
+from app.db_async import run_db
+from app.services.pricing_input import PLATFORM_MAP, NICHE_MAP
+from app.services.pricing_quote import price_creator, price_creators, resolve_pro
+from app.services.ratecard import RATECARD_FORMATS
+from app.services.fx_rates import FX_SYMBOLS, convert_all, current_fx
 
 # -------------------------------------------------
-# PLATFORM NORMALIZATION MAP
+# PRICING TRANSPORT
+# "local" → price in-process (default, bot + API in one service)
+# "http"  → POST to get_backend_url()/pricing/range (split deployments)
 # -------------------------------------------------
-PLATFORM_MAP: Dict[str, str] = {
-    "instagram": "instagram",
-    "tiktok": "tiktok",
-    "ytshorts": "youtube",
-    "youtube": "youtube",
-    "twitter": "twitter",
-    "facebook": "facebook",
-    "other": "instagram"
-}
-
-# -------------------------------------------------
-# NICHE NORMALIZATION MAP
-# -------------------------------------------------
-NICHE_MAP: Dict[str, str] = {
-    "fashion": "beauty",
-    "beauty": "beauty",
-    "tech": "tech",
-    "comedy": "comedy",
-    "lifestyle": "lifestyle",
-    "food": "lifestyle",
-    "music": "entertainment",
-    "fitness": "fitness",
-    "other": "general"
-}
+PRICING_TRANSPORT = os.getenv("PRICING_TRANSPORT", "local").strip().lower()
 
 
 # =================================================
 # CALLBACK: NICHE SELECTED
 # =================================================
-async def niche_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def niche_selected(update: Update, context: ContextTypes.DEFAULT_TYPE, raw_niche: str) -> None:
+    """
+    Called by the callback dispatcher with a validated NICHE_MAP key
+    (query already answered).
+    """
     query: Optional[CallbackQuery] = update.callback_query
     if query is None:
         return
 
-    await query.answer()
-
     msg = query.message
     if msg is None or msg.chat is None:
         return
 
     chat_id = msg.chat.id
-    data = query.data or ""
-
-    if not data.startswith("niche_"):
-        await context.bot.send_message(chat_id, "⚠️ Unknown niche selection.")
-        return
-
-    raw_niche = data.replace("niche_", "").lower()
     normalized_niche = NICHE_MAP.get(raw_niche, "general")
 
     ud = cast(Dict[str, Any], context.user_data)
     ud["niche"] = normalized_niche
 
-    await context.bot.send_message(
-        chat_id,
-        f"🎯 Niche selected: *{raw_niche.title()}*",
-        parse_mode="Markdown"
-    )
+    progress_text = f"🎯 Niche selected: *{raw_niche.title()}*\n\n📈 Generating pricing insights..."
+
+    # progress message is edited into the result by generate_pricing
+    if not TELEGRAM_EDIT_IN_PLACE:
+        progress = await ProgressMessage.send(context.bot, chat_id, progress_text, parse_mode="Markdown")
+    else:
+        # edit-in-place: the niche keyboard message becomes the pricing card.
+        # In-process pricing is instant, so the progress edit is only worth
+        # a call when pricing goes over HTTP.
+        progress = ProgressMessage(context.bot, chat_id, msg)
+        if PRICING_TRANSPORT == "http":
+            await progress.finish(progress_text, parse_mode="Markdown")
 
-    await context.bot.send_message(chat_id, "📈 Generating pricing insights...")
-    await generate_pricing(chat_id, context)
+    await generate_pricing(chat_id, context, progress)
 
 
 # =================================================
 # GENERATE PRICING (RANGE MODE)
 # =================================================
-async def generate_pricing(chat_id: int, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def generate_pricing(
+    chat_id: int,
+    context: ContextTypes.DEFAULT_TYPE,
+    progress: Optional[ProgressMessage] = None,
+) -> None:
     ud = cast(Dict[str, Any], context.user_data)
+    reply = progress or ProgressMessage(context.bot, chat_id)
 
     followers = ud.get("stats", {}).get("followers")
     avg_views = ud.get("stats", {}).get("avg_views")
@@ -92,15 +85,9 @@ async def generate_pricing(chat_id: int, context: ContextTypes.DEFAULT_TYPE) ->
     platform = PLATFORM_MAP.get(raw, "instagram")
 
     if not platform or not niche:
-        await context.bot.send_message(chat_id, "⚠️ Missing platform or niche. Start again with /start.")
+        await reply.finish("⚠️ Missing platform or niche. Start again with /start.")
         return
 
-    # ---- PRO STATUS ----
-    is_pro_user = is_user_pro(str(chat_id))
-
-    backend_url = get_backend_url()
-    url = f"{backend_url}/pricing/range"   # <--- RANGE ENDPOINT
-
     payload = {
         "telegram_id": str(chat_id),
         "followers": followers,
@@ -110,26 +97,27 @@ async def generate_pricing(chat_id: int, context: ContextTypes.DEFAULT_TYPE) ->
         "niche": niche
     }
 
-    # ---- BACKEND CALL ----
+    # ---- PRICING CALL ----
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.post(url, json=payload)
-            resp.raise_for_status()
-            result = resp.json()
+        result = await fetch_pricing_range(payload)
     except Exception as e:
-        await context.bot.send_message(chat_id, f"⚠️ Backend pricing error: {e}")
+        await reply.finish(f"⚠️ Backend pricing error: {e}")
         return
 
     # ---- BACKEND ERROR HANDLING ----
     if result.get("error"):
-        await context.bot.send_message(chat_id, "⚠️ Not enough data to compute pricing. Provide followers or avg views.")
+        await reply.finish("⚠️ Not enough data to compute pricing. Provide followers or avg views.")
         return
 
+    # inputs of the last priced card (Export Ratecard re-prices from these)
+    ud["ratecard"] = {k: v for k, v in payload.items() if k != "telegram_id"}
+
     mode = result.get("mode", "unknown")
     min_ngn = result.get("min")
     mid_ngn = result.get("mid")
     max_ngn = result.get("max")
     usage_months = result.get("usage_months", 3)
+    is_pro_user = bool(result.get("is_pro"))
 
     # ---- MESSAGE BUILD ----
     text = (
@@ -165,14 +153,86 @@ async def generate_pricing(chat_id: int, context: ContextTypes.DEFAULT_TYPE) ->
             "🔒 *Whitelisting Rights:* Locked (PRO only)\n"
             "✨ Unlock PRO for usage + whitelisting + export."
         )
-        buttons.append([InlineKeyboardButton("🔐 Unlock PRO", callback_data="upgrade_pro")])
+        buttons.append([InlineKeyboardButton("🔐 Unlock PRO", callback_data=encode("upgrade_pro"))])
     else:
         text += "💼 *PRO Unlocked:* Whitelisting available\n"
-        buttons.append([InlineKeyboardButton("📁 Export Ratecard", callback_data="export_ratecard")])
 
-    await context.bot.send_message(
-        chat_id,
+        # ---- FOREIGN-CURRENCY MIDLINE (live FX, never fetched here) ----
+        if result.get("usd_mid"):
+            text += f"💵 *Midline (USD):* ${result['usd_mid']:,.2f}\n"
+        abroad = [(c, v) for c, v in convert_all(mid_ngn) if c != "USD"]
+        if abroad:
+            text += "🌍 *Also:* " + " · ".join(f"{FX_SYMBOLS.get(c, c + ' ')}{v:,.0f}" for c, v in abroad)
+            text += " _(rates may be out of date)_\n" if current_fx().is_stale() else "\n"
+        buttons.append([
+            InlineKeyboardButton(f"📁 Ratecard {fmt.upper()}", callback_data=encode("export_ratecard", fmt))
+            for fmt in RATECARD_FORMATS
+        ])
+
+    await reply.finish(
         text,
         parse_mode="Markdown",
         reply_markup=InlineKeyboardMarkup(buttons)
     )
+
+
+# =================================================
+# PRICING TRANSPORT (IN-PROCESS OR HTTP FALLBACK)
+# =================================================
+async def fetch_pricing_range(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the /pricing/range payload for the bot.
+    Prices in-process unless PRICING_TRANSPORT=http: only the PRO lookup
+    goes to the DB executor, the (CPU-only) engine runs inline.
+    """
+    if PRICING_TRANSPORT != "http":
+        is_pro = await run_db(resolve_pro, payload["telegram_id"])
+        return price_creator(
+            telegram_id=payload["telegram_id"],
+            followers=payload["followers"],
+            avg_views=payload["avg_views"],
+            engagement=payload["engagement_rate"],
+            platform=payload["platform"],
+            niche=payload["niche"],
+            mode="range",
+            is_pro=is_pro
+        )
+
+    url = f"{get_backend_url()}/pricing/range"
+    async with httpx.AsyncClient(timeout=20) as client:
+        resp = await client.post(url, json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+
+async def fetch_pricing_batch(telegram_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Prices many creators in one engine call (bulk input).
+    rows: dicts with followers / avg_views / engagement_rate / platform / niche.
+    """
+    columns = {
+        "followers": [r["followers"] for r in rows],
+        "avg_views": [r["avg_views"] for r in rows],
+        "engagement_rate": [r["engagement_rate"] for r in rows],
+        "platform": [r["platform"] for r in rows],
+        "niche": [r["niche"] for r in rows],
+    }
+
+    if PRICING_TRANSPORT != "http":
+        is_pro = await run_db(resolve_pro, telegram_id)
+        return price_creators(
+            telegram_id=telegram_id,
+            followers=columns["followers"],
+            avg_views=columns["avg_views"],
+            engagement=columns["engagement_rate"],
+            platform=columns["platform"],
+            niche=columns["niche"],
+            mode="range",
+            is_pro=is_pro
+        )
+
+    url = f"{get_backend_url()}/pricing/batch"
+    async with httpx.AsyncClient(timeout=20) as client:
+        resp = await client.post(url, json={"telegram_id": telegram_id, "mode": "range", **columns})
+        resp.raise_for_status()
+        return resp.json()["results"]
@@ -15,3 +15,7 @@ def get_required_env(name: str) -> str:
 # TELEGRAM CONFIG
 # -------------------------------------------------
 TELEGRAM_BOT_TOKEN: str = get_required_env("TELEGRAM_BOT_TOKEN")
+
+# "true" → the stats → platform → niche flow edits one message in place
+# (keyboard steps + final pricing card) instead of posting new messages
+TELEGRAM_EDIT_IN_PLACE: bool = os.getenv("TELEGRAM_EDIT_IN_PLACE", "true").strip().lower() != "false"
@@ -4,21 +4,23 @@ from typing import Optional, Dict, Any, cast
 from telegram import Update, CallbackQuery
 from telegram.ext import ContextTypes
 from bot.keyboards.niches import niche_keyboard
+from bot.config import TELEGRAM_EDIT_IN_PLACE
+from bot.progress import ProgressMessage
 
 
-async def platform_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def platform_selected(update: Update, context: ContextTypes.DEFAULT_TYPE, platform: str) -> None:
     """
     Handles platform button selection safely.
     Avoids MaybeInaccessibleMessage issues.
+
+    Called by the callback dispatcher with the validated platform key
+    (already answered).
     """
 
     query: Optional[CallbackQuery] = update.callback_query
     if query is None:
         return
 
-    await query.answer()
-
-    data = query.data
     msg = query.message  # no type annotation (critical)
 
     # validate message access
@@ -27,28 +29,15 @@ async def platform_selected(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     chat_id = msg.chat.id  # correct way to get chat id
 
-    if data is None:
-        await context.bot.send_message(chat_id, "⚠️ Missing platform data.")
-        return
-
-    if not data.startswith("platform_"):
-        await context.bot.send_message(chat_id, "⚠️ Unknown platform selection.")
-        return
-
-    platform = data.replace("platform_", "").lower()
-
     # safe user_data update
     ud = cast(Dict[str, Any], context.user_data)
     ud["platform"] = platform
 
-    await context.bot.send_message(
-        chat_id,
-        f"🎯 Platform selected: *{platform.title()}*",
-        parse_mode="Markdown"
-    )
-
-    await context.bot.send_message(
-        chat_id,
+    # one message: confirmation + next step
+    # (edit-in-place: the platform keyboard message becomes the niche step)
+    step = ProgressMessage(context.bot, chat_id, msg if TELEGRAM_EDIT_IN_PLACE else None)
+    await step.finish(
+        f"🎯 Platform selected: *{platform.title()}*\n\n"
         "📂 Now select your *niche:*",
         parse_mode="Markdown",
         reply_markup=niche_keyboard()
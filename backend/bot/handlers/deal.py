@@ -3,7 +3,10 @@ from telegram.ext import ContextTypes
 from datetime import datetime
 from typing import Dict, Any
 
-from app.db import get_db
+from app.db import db_connection
+from app.db_async import run_db
+from app.services.pro_service import is_user_pro
+from bot.callback_data import encode
 
 
 # =================================================
@@ -12,27 +15,16 @@ from app.db import get_db
 
 def is_pro_user(telegram_id: int) -> bool:
     """
-    Returns True if user has PRO access.
+    Returns True if user has PRO access (cached, expiry-aware).
     """
-    conn = get_db()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT is_pro FROM creators WHERE telegram_id = %s",
-            (str(telegram_id),),
-        )
-        row = cur.fetchone()
-        return bool(row and row[0])
-    finally:
-        conn.close()
+    return is_user_pro(telegram_id)
 
 
 def save_pro_request(data: Dict[str, Any]) -> None:
     """
     Persists PRO delivery request.
     """
-    conn = get_db()
-    try:
+    with db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -50,8 +42,6 @@ def save_pro_request(data: Dict[str, Any]) -> None:
             ),
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
 # =================================================
@@ -67,9 +57,9 @@ async def deal_script(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     # -----------------------------
     # PRO GATE
     # -----------------------------
-    if not is_pro_user(user.id):
+    if not await run_db(is_pro_user, user.id):
         keyboard = InlineKeyboardMarkup(
-            [[InlineKeyboardButton("🚀 Upgrade to PRO", callback_data="upgrade_pro")]]
+            [[InlineKeyboardButton("🚀 Upgrade to PRO", callback_data=encode("upgrade_pro"))]]
         )
 
         await message.reply_text(
@@ -166,7 +156,8 @@ async def deal_step_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if step == "phone":
         user_data["phone"] = None if text.lower() == "skip" else text
 
-        save_pro_request(
+        await run_db(
+            save_pro_request,
             {
                 "telegram_id": str(user.id),
                 "email": user_data["email"],
@@ -7,15 +7,15 @@ from datetime import datetime
 from telegram import Update, Message, CallbackQuery
 from telegram.ext import ContextTypes
 
-from app.db import get_db
+from app.db import db_connection
+from app.db_async import run_db
 
 
 # =================================================
 # DB SAVE FUNCTION
 # =================================================
 def save_elite_request(data: Dict[str, Any]) -> None:
-    conn = get_db()
-    try:
+    with db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -33,21 +33,17 @@ def save_elite_request(data: Dict[str, Any]) -> None:
             ),
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
 # =================================================
 # ENTRY POINT (Triggered via Inline Button)
 # =================================================
-async def elite_package_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def elite_package_start(update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str = ""):
 
     query: Optional[CallbackQuery] = update.callback_query
     if query is None:
         return
 
-    await query.answer()
-
     raw_msg = query.message
     if raw_msg is None:
         return
@@ -135,7 +131,8 @@ async def elite_package_step(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if step == "phone":
         state["phone"] = None if text.lower() == "skip" else text
 
-        save_elite_request(
+        await run_db(
+            save_elite_request,
             {
                 "telegram_id": str(user.id),
                 "email": state["email"],
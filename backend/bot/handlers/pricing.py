@@ -1,56 +1,13 @@
 # backend/bot/handlers/pricing.py
 
 import re
-from typing import cast, Dict, Any, Optional
+from typing import cast, Dict, Any, List, Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from bot.keyboards.platforms import platform_keyboard
-
-
-# -------------------------------------------------
-# PARSER HELPERS
-# -------------------------------------------------
-def parse_number(value: str) -> int:
-    """
-    Parses: 50k, 12k, 1.2m, 10000, 500,000
-    """
-    value = value.strip().replace(",", "").lower()
-    if value.endswith("k"):
-        return int(float(value[:-1]) * 1_000)
-    if value.endswith("m"):
-        return int(float(value[:-1]) * 1_000_000)
-    return int(float(value))
-
-
-def parse_engagement(er_raw: str) -> float:
-    """
-    Converts engagement into a proper decimal rate (0 < x <= 1)
-    Handles:
-        - 0.08  => 0.08
-        - 8%    => 0.08
-        - 8     => 0.08
-        - 0.8%  => 0.008
-    """
-    er_str = er_raw.strip().replace("%", "")
-
-    try:
-        er = float(er_str)
-    except:
-        raise ValueError("Invalid engagement")
-
-    # If user typed `8` meaning 8%
-    if er > 1:
-        er = er / 100.0
-
-    # If user typed `0.8%` → 0.008
-    if 0 < er <= 100 and "%" in er_raw:
-        er = er / 100.0
-
-    if not (0 < er <= 1):
-        raise ValueError("Engagement must be between 0 and 1")
-
-    return er
+from bot.callbacks_niche import fetch_pricing_batch
+from app.services.pricing_input import PLATFORM_MAP, NICHE_MAP, parse_number, parse_engagement
 
 
 # -------------------------------------------------
@@ -60,6 +17,10 @@ async def pricing_calc(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Parses raw user text into stats and stores them for the hybrid pricing pipeline.
     After parsing, the bot asks for PLATFORM selection.
+
+    Bulk mode only when at least one line is a complete creator row (with
+    platform + niche); other multi-line input ("50k\n12000\n8%") is read
+    as one creator, the same as if it were typed on one line.
     """
 
     message = update.effective_message
@@ -69,6 +30,11 @@ async def pricing_calc(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = message.text.strip()
     parts = re.split(r"\s+", text)
 
+    lines = text.splitlines()
+    if (len(lines) > 1 or len(parts) > 3) and has_bulk_row(lines):
+        await bulk_pricing(update, lines)
+        return
+
     followers: Optional[int] = None
     avg_views: Optional[int] = None
     engagement: Optional[float] = None
@@ -133,9 +99,197 @@ async def _invalid_format(message):
         "`50k` — followers only\n"
         "`12000 0.08` — views + engagement\n"
         "`50k 12000 0.08` — followers + views + engagement\n\n"
+        "*Bulk:* one creator per line with platform + niche\n"
+        "`@ada 50k 12k 8% tiktok tech`\n\n"
         "*Examples:*\n"
         "`50k`\n"
         "`12000 0.08`\n"
         "`50k 12000 0.08`\n",
         parse_mode="Markdown",
     )
+
+
+# -------------------------------------------------
+# BULK MODE (one creator per line)
+#   "@ada 50k 12k 8% tiktok tech"
+#   numbers keep the single-creator meaning (1 → followers,
+#   2 → views + engagement, 3 → followers + views + engagement);
+#   platform / niche are words from PLATFORM_MAP / NICHE_MAP;
+#   an optional @label names the row.
+# -------------------------------------------------
+BULK_MAX_ROWS = 50
+
+
+def parse_bulk_line(line: str) -> Dict[str, Any]:
+    """
+    Single pass over the tokens of one line. Raises ValueError with a
+    user-facing reason.
+    """
+    label: Optional[str] = None
+    platform: Optional[str] = None
+    niche: Optional[str] = None
+    numbers: List[str] = []
+
+    for token in line.split():
+        word = token.lower()
+        if token.startswith("@"):
+            label = token
+        elif word in PLATFORM_MAP and platform is None:
+            platform = word
+        elif word in NICHE_MAP and niche is None:
+            niche = word
+        elif token[0].isdigit() or token[0] == ".":
+            numbers.append(token)
+        else:
+            raise ValueError(f"unknown word '{token}'")
+
+    if platform is None:
+        raise ValueError("missing platform")
+    if niche is None:
+        raise ValueError("missing niche")
+
+    if not 1 <= len(numbers) <= 3:
+        raise ValueError(f"expected 1–3 numbers, got {len(numbers)}")
+
+    followers: Optional[int] = None
+    avg_views: Optional[int] = None
+    engagement: Optional[float] = None
+
+    try:
+        if len(numbers) == 1:
+            followers = parse_number(numbers[0])
+        elif len(numbers) == 2:
+            avg_views = parse_number(numbers[0])
+            engagement = parse_engagement(numbers[1])
+        else:
+            followers = parse_number(numbers[0])
+            avg_views = parse_number(numbers[1])
+            engagement = parse_engagement(numbers[2])
+    except ValueError:
+        raise ValueError(f"bad number in '{' '.join(numbers)}'")
+
+    return {
+        "label": label,
+        "followers": followers,
+        "avg_views": avg_views,
+        "engagement_rate": engagement,
+        "platform": PLATFORM_MAP[platform],
+        "niche": NICHE_MAP[niche],
+    }
+
+
+def has_bulk_row(lines: List[str]) -> bool:
+    """
+    True if any line parses as a complete bulk row.
+    """
+    for line in lines:
+        try:
+            parse_bulk_line(line)
+        except ValueError:
+            continue
+        return True
+    return False
+
+
+def parse_bulk(lines: List[str]) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, str]]]:
+    """
+    Returns ([(line_no, row)], [(line_no, error)]); bad lines never abort the batch.
+    Blank lines are skipped but still counted, so line numbers match the message.
+    """
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Tuple[int, str]] = []
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append((line_no, parse_bulk_line(line)))
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+
+    return rows, errors
+
+
+def _compact(value: Optional[int]) -> str:
+    if not value:
+        return "-"
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 1_000:
+        return f"{value / 1_000:.0f}K"
+    return str(value)
+
+
+def format_bulk_table(
+    priced: List[Tuple[int, Dict[str, Any], Dict[str, Any]]],
+    errors: List[Tuple[int, str]],
+    is_pro: bool,
+) -> str:
+    header = f"{'#':>2} {'Creator':<10} {'Platform':<9} {'Niche':<9} {'Min':>6} {'Mid':>6} {'Max':>6}"
+    if is_pro:
+        header += f" {'WL':>6}"
+
+    table = [header]
+    for line_no, row, result in priced:
+        name = (row["label"] or f"line {line_no}").replace("`", "")[:10]
+        cells = (
+            f"{line_no:>2} {name:<10} {result['platform'][:9]:<9} {result['niche'][:9]:<9} "
+            f"{_compact(result['min']):>6} {_compact(result['mid']):>6} {_compact(result['max']):>6}"
+        )
+        if is_pro:
+            cells += f" {_compact(result.get('whitelist_ngn')):>6}"
+        table.append(cells)
+
+    text = f"📊 *Bulk Pricing (NGN)* — {len(priced)} creator{'s' if len(priced) != 1 else ''}\n"
+    if priced:
+        text += "```\n" + "\n".join(table) + "\n```\n"
+
+    if not is_pro and priced:
+        text += "🔒 Whitelisting: PRO only\n"
+
+    if errors:
+        text += "\n⚠️ *Skipped lines:*\n"
+        text += "\n".join(
+            f"• Line {line_no}: {reason.replace('`', '').replace('*', '').replace('_', ' ')}"
+            for line_no, reason in errors
+        )
+
+    return text
+
+
+async def bulk_pricing(update: Update, lines: List[str]) -> None:
+    message = update.effective_message
+    user = update.effective_user
+    if not message or not user:
+        return
+
+    if sum(1 for line in lines if line.strip()) > BULK_MAX_ROWS:
+        await message.reply_text(f"❌ Bulk mode takes at most {BULK_MAX_ROWS} creators per message.")
+        return
+
+    rows, errors = parse_bulk(lines)
+
+    priced: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+    is_pro = False
+
+    if rows:
+        try:
+            results = await fetch_pricing_batch(str(user.id), [row for _, row in rows])
+        except Exception as e:
+            await message.reply_text(f"⚠️ Backend pricing error: {e}")
+            return
+
+        for (line_no, row), result in zip(rows, results):
+            if result.get("error"):
+                errors.append((line_no, "not enough data (followers or views needed)"))
+            else:
+                priced.append((line_no, row, result))
+                is_pro = bool(result.get("is_pro"))
+
+        errors.sort()
+
+    if not priced and not errors:
+        await _invalid_format(message)
+        return
+
+    await message.reply_text(format_bulk_table(priced, errors, is_pro), parse_mode="Markdown")
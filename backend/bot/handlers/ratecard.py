@@ -0,0 +1,86 @@
+# backend/bot/handlers/ratecard.py
+
+import logging
+from typing import Any, Dict, cast
+
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import ContextTypes
+
+from bot.callback_data import encode
+from bot.callbacks_niche import fetch_pricing_range
+from app.services.ratecard import RATECARD_FORMATS, RATECARD_DEFAULT_FORMAT, ratecard_exporter
+
+logger = logging.getLogger(__name__)
+
+
+def valid_format(payload: str) -> bool:
+    # "" → legacy button without a format
+    return payload == "" or payload in RATECARD_FORMATS
+
+
+# -------------------------
+# EXPORT RATECARD (PRO only)
+# Renders the last generate_pricing result as PNG / PDF.
+# -------------------------
+async def export_ratecard(update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
+    query = update.callback_query
+    user = update.effective_user
+    if not query or not query.message or not query.message.chat or not user:
+        return  # Pylance-safe guard
+
+    chat_id = query.message.chat.id
+    fmt = payload or RATECARD_DEFAULT_FORMAT
+
+    ud = cast(Dict[str, Any], context.user_data)
+    inputs = ud.get("ratecard")
+    if not inputs:
+        await context.bot.send_message(chat_id, "⚠️ Price a creator first, then tap Export Ratecard.")
+        return
+
+    try:
+        result = await fetch_pricing_range({"telegram_id": str(user.id), **inputs})
+    except Exception as e:
+        await context.bot.send_message(chat_id, f"⚠️ Backend pricing error: {e}")
+        return
+
+    if result.get("error"):
+        await context.bot.send_message(chat_id, "⚠️ Not enough data to build a ratecard.")
+        return
+
+    if not result.get("is_pro"):
+        await context.bot.send_message(
+            chat_id,
+            "🔒 Ratecard export is a PRO feature.",
+            reply_markup=InlineKeyboardMarkup(
+                [[InlineKeyboardButton("🚀 Upgrade to PRO (₦10,000)", callback_data=encode("upgrade_pro"))]]
+            ),
+        )
+        return
+
+    card = {
+        "name": user.first_name,
+        "platform": result["platform"],
+        "niche": result["niche"],
+        "followers": result.get("followers"),
+        "avg_views": result.get("avg_views"),
+        "engagement": result.get("engagement"),
+        "min": result["min"],
+        "mid": result["mid"],
+        "max": result["max"],
+        "whitelist_ngn": result.get("whitelist_ngn"),
+        "usage_months": result.get("usage_months", 3),
+        "config_version": result.get("config_version"),
+    }
+
+    try:
+        await ratecard_exporter.send(
+            context.bot,
+            chat_id,
+            card,
+            fmt,
+            filename=f"ratecard_{card['platform']}_{card['niche']}.{fmt}",
+            caption="📁 Your ratecard — share it with brands.",
+        )
+    except Exception as e:
+        logger.error(f"❌ Ratecard export failed for {user.id} → {e}")
+        await context.bot.send_message(chat_id, "⚠️ Could not render the ratecard. Please try again.")
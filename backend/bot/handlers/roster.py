@@ -0,0 +1,89 @@
+# backend/bot/handlers/roster.py
+
+import os
+import tempfile
+import logging
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from bot.progress import ProgressMessage
+from app.db_async import run_db
+from app.services.pricing_quote import resolve_pro
+from app.services.roster_pricing import (
+    ROSTER_EXTENSIONS,
+    ROSTER_MAX_BYTES,
+    ROSTER_MAX_ROWS,
+    RosterBusy,
+    RosterError,
+    roster_pricer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------
+# ROSTER UPLOAD (CSV / XLSX document → priced CSV)
+#   header row with platform, niche and followers and/or avg_views
+#   (engagement optional); every other column is passed through.
+# -------------------------------------------------
+async def roster_upload(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    message = update.effective_message
+    user = update.effective_user
+    if not message or not message.document or not user:
+        return
+
+    document = message.document
+    filename = document.file_name or "roster.csv"
+    stem, ext = os.path.splitext(filename)
+
+    if ext.lower() not in ROSTER_EXTENSIONS:
+        await message.reply_text("❌ Send the roster as a `.csv` or `.xlsx` file.", parse_mode="Markdown")
+        return
+
+    if document.file_size and document.file_size > ROSTER_MAX_BYTES:
+        await message.reply_text(f"❌ File too large (max {ROSTER_MAX_BYTES // (1024 * 1024)} MB).")
+        return
+
+    progress = await ProgressMessage.send(context.bot, message.chat_id, "📥 Pricing your roster...")
+
+    with tempfile.TemporaryDirectory(prefix="roster-") as workdir:
+        src_path = os.path.join(workdir, f"upload{ext.lower()}")
+        dst_path = os.path.join(workdir, "priced.csv")
+
+        try:
+            tg_file = await document.get_file()
+            await tg_file.download_to_drive(src_path)
+
+            is_pro = await run_db(resolve_pro, str(user.id))
+            summary = await roster_pricer.run(src_path, dst_path, filename, is_pro)
+
+        except RosterBusy:
+            await progress.finish("⏳ Busy pricing other rosters — please resend in a minute.")
+            return
+        except RosterError as e:
+            await progress.finish(f"❌ Could not price roster: {e}")
+            return
+        except Exception as e:
+            logger.error(f"❌ Roster upload failed for {user.id} → {e}")
+            await progress.finish("⚠️ Something went wrong pricing that file. Please try again.")
+            return
+
+        caption = (
+            f"📊 Priced {summary['priced']:,} of {summary['rows']:,} creators (NGN)"
+        )
+        if summary["skipped"]:
+            caption += f"\n⚠️ {summary['skipped']:,} rows skipped — see pricing_status"
+        if summary["truncated"]:
+            caption += f"\n✂️ Only the first {ROSTER_MAX_ROWS:,} rows were priced"
+        if not is_pro:
+            caption += "\n🔒 Whitelisting: PRO only"
+
+        with open(dst_path, "rb") as priced:
+            await message.reply_document(
+                document=priced,
+                filename=f"{stem}_priced.csv",
+                caption=caption,
+            )
+
+    await progress.finish("✅ Roster priced.")
@@ -1,7 +1,25 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 from typing import Any, Mapping
-from app.db import get_db
+from app.db import db_connection
+from app.db_async import run_db
+
+
+# -----------------------------------
+# DB QUERY (blocking → call via run_db)
+# -----------------------------------
+def fetch_status_row(telegram_id: str) -> Any | None:
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT is_pro, pro_activated_at
+            FROM creators
+            WHERE telegram_id = %s
+            """,
+            (telegram_id,),
+        )
+        return cur.fetchone()
 
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -16,22 +34,7 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # -----------------------------------
     # DATABASE QUERY
     # -----------------------------------
-    conn = get_db()
-    row: Any | None = None
-
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT is_pro, pro_activated_at
-            FROM creators
-            WHERE telegram_id = %s
-            """,
-            (telegram_id,),
-        )
-        row = cur.fetchone()
-    finally:
-        conn.close()
+    row: Any | None = await run_db(fetch_status_row, telegram_id)
 
     # -----------------------------------
     # NO RECORD → FREE USER
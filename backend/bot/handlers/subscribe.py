@@ -6,12 +6,16 @@ import logging
 import os
 import httpx
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
+from app.db_async import run_db
+from app.routes.paystack_routes import init_payment
 from app.services.pro_service import is_user_pro
+from bot.progress import ProgressMessage
+from bot.callback_data import encode
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,10 @@ ELITE_BASE_FEE_KOBO = 2_500_000      # ₦25,000 per package
 PUBLIC_BACKEND_URL = "https://creator-monetization.onrender.com"
 BASE_URL = os.getenv("BASE_URL")     # optional override for Render deployments
 
+# "local" → start checkouts in-process (default, bot + API in one service)
+# "http"  → POST to get_backend_url()/paystack/init (split deployments)
+PAYMENT_TRANSPORT = os.getenv("PAYMENT_TRANSPORT", "local").strip().lower()
+
 
 def get_backend_url() -> str:
     """
@@ -35,6 +43,24 @@ def get_backend_url() -> str:
     return PUBLIC_BACKEND_URL
 
 
+# -------------------------------------------------
+# CHECKOUT TRANSPORT (IN-PROCESS OR HTTP FALLBACK)
+# -------------------------------------------------
+async def fetch_checkout(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the /paystack/init payload for the bot.
+    Calls the route handler in-process unless PAYMENT_TRANSPORT=http,
+    so a tap never leaves the service (and shares its checkout cache).
+    """
+    if PAYMENT_TRANSPORT != "http":
+        return await init_payment(payload)
+
+    async with httpx.AsyncClient(timeout=20) as client:
+        resp = await client.post(f"{get_backend_url()}/paystack/init", json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+
 # -------------------------------------------------
 # SAFE REPLY (no crash if message missing)
 # -------------------------------------------------
@@ -64,8 +90,8 @@ async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     keyboard = InlineKeyboardMarkup(
         [
-            [InlineKeyboardButton("🚀 Upgrade to PRO (₦10,000)", callback_data="upgrade_pro")],
-            [InlineKeyboardButton("📦 ELITE Deal Packaging (₦25,000)", callback_data="elite_package")],
+            [InlineKeyboardButton("🚀 Upgrade to PRO (₦10,000)", callback_data=encode("upgrade_pro"))],
+            [InlineKeyboardButton("📦 ELITE Deal Packaging (₦25,000)", callback_data=encode("elite_package"))],
         ]
     )
 
@@ -102,7 +128,7 @@ async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # =================================================
 # UPGRADE PRO CALLBACK (PAYSTACK INIT)
 # =================================================
-async def upgrade_pro(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def upgrade_pro(update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str = ""):
     query = update.callback_query
     if not query or not query.message or not query.message.chat:
         return
@@ -111,7 +137,7 @@ async def upgrade_pro(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(chat_id)
 
     # Already PRO?
-    if is_user_pro(telegram_id):
+    if await run_db(is_user_pro, telegram_id):
         await context.bot.send_message(
             chat_id,
             "🎉 *You're already PRO!*\n\n"
@@ -124,28 +150,23 @@ async def upgrade_pro(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    backend_url = get_backend_url()
-    init_url = f"{backend_url}/paystack/init"
-
     payload = {
         "telegram_id": telegram_id
     }
 
-    await context.bot.send_message(
+    # edited into the checkout message (or the error) below
+    progress = await ProgressMessage.send(
+        context.bot,
         chat_id,
         "💳 *Generating secure checkout link...*",
         parse_mode="Markdown"
     )
 
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.post(init_url, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        data = await fetch_checkout(payload)
     except Exception as e:
         logger.error(f"[UPGRADE_PRO] Init error → {e}")
-        await context.bot.send_message(
-            chat_id,
+        await progress.finish(
             "❌ Payment initialization failed.\nPlease try again shortly."
         )
         return
@@ -159,13 +180,12 @@ async def upgrade_pro(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if not auth_url:
         logger.error(f"[UPGRADE_PRO] Missing authorization_url → {data}")
-        await context.bot.send_message(chat_id, "⚠️ Payment link unavailable. Try again later.")
+        await progress.finish("⚠️ Payment link unavailable. Try again later.")
         return
 
     btn = InlineKeyboardButton("💳 Pay with Paystack", url=auth_url)
 
-    await context.bot.send_message(
-        chat_id,
+    await progress.finish(
         "💼 *PRO Upgrade — ₦10,000 One-Time*\n\n"
         "You are unlocking:\n"
         "✔ USD Dual Pricing\n"
@@ -190,9 +210,6 @@ async def pay_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not message or not user:
         return
 
-    backend_url = get_backend_url()
-    init_url = f"{backend_url}/paystack/init"
-
     await safe_reply(message, "💳 *Initializing secure payment...*")
 
     payload = {
@@ -201,16 +218,13 @@ async def pay_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "metadata": {"telegram_id": user.id},
     }
 
-    logger.info(f"[PAY] Init → {init_url}")
+    logger.info(f"[PAY] Init ({PAYMENT_TRANSPORT}) for {user.id}")
 
     raw = None
     for attempt in range(3):
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                resp = await client.post(init_url, json=payload)
-                resp.raise_for_status()
-                raw = resp.json()
-                break
+            raw = await fetch_checkout(payload)
+            break
         except Exception as e:
             logger.warning(f"[PAY] Attempt {attempt+1}/3 failed → {e}")
             if attempt < 2:
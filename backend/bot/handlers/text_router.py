@@ -10,7 +10,12 @@ from telegram.ext import ContextTypes
 from bot.handlers.pricing import pricing_calc
 from bot.handlers.deal import deal_step_handler
 from bot.handlers.subscribe import subscribe_command, pay_command, upgrade_pro
-from bot.handlers.elite_package import elite_package_step
+from bot.handlers.elite_package import elite_package_start, elite_package_step
+from bot.handlers.callbacks_platform import platform_selected
+from bot.handlers.ratecard import export_ratecard, valid_format
+from bot.callbacks_niche import niche_selected
+from app.services.pricing_input import PLATFORM_MAP, NICHE_MAP
+from bot.callback_data import CallbackDispatcher
 
 
 async def text_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -80,44 +85,12 @@ async def text_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # =============================================================
 # CALLBACK ROUTER (Inline Keyboard)
-# MUST BE REGISTERED IN APPLICATION HANDLER
+# One CallbackQueryHandler(callback_router.dispatch) serves every button:
+# callback_data is decoded (see bot.callback_data) and looked up by action.
 # =============================================================
-async def callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    query = update.callback_query
-    if not query or not query.message or not query.message.chat:
-        return  # Pylance-safe guard
-
-    data = query.data or ""
-    await query.answer()
-
-    chat_id = query.message.chat.id
-
-    # -------------------------
-    # PRO UPGRADE CALLBACK
-    # -------------------------
-    if data == "upgrade_pro":
-        return await upgrade_pro(update, context)
-
-    # -------------------------
-    # ELITE PACKAGE CALLBACK
-    # -------------------------
-    if data == "elite_package":
-        user_data = cast(Dict[str, Any], context.user_data or {})
-        user_data["mode"] = "elite"
-        return await elite_package_step(update, context)
-
-    # -------------------------
-    # EXPORT RATECARD (PRO only)
-    # Placeholder until export feature ships
-    # -------------------------
-    if data == "export_ratecard":
-        await context.bot.send_message(
-            chat_id,
-            "📁 Export Feature Coming Soon!\nYou'll be able to download branded ratecards."
-        )
-        return
-
-    # -------------------------
-    # UNKNOWN CALLBACK
-    # -------------------------
-    await context.bot.send_message(chat_id, "⚠️ Unknown action.")
+callback_router = CallbackDispatcher()
+callback_router.register("platform", platform_selected, validate=PLATFORM_MAP.__contains__)
+callback_router.register("niche", niche_selected, validate=NICHE_MAP.__contains__)
+callback_router.register("upgrade_pro", upgrade_pro)
+callback_router.register("elite_package", elite_package_start)
+callback_router.register("export_ratecard", export_ratecard, validate=valid_format)
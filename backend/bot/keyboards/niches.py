@@ -1,22 +1,24 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
+from bot.callback_data import encode
+
 def niche_keyboard():
     keyboard = [
         [
-            InlineKeyboardButton("Fashion/Beauty", callback_data="niche_fashion"),
-            InlineKeyboardButton("Tech/Gadgets", callback_data="niche_tech"),
+            InlineKeyboardButton("Fashion/Beauty", callback_data=encode("niche", "fashion")),
+            InlineKeyboardButton("Tech/Gadgets", callback_data=encode("niche", "tech")),
         ],
         [
-            InlineKeyboardButton("Meme/Comedy", callback_data="niche_comedy"),
-            InlineKeyboardButton("Lifestyle/Vlog", callback_data="niche_lifestyle"),
+            InlineKeyboardButton("Meme/Comedy", callback_data=encode("niche", "comedy")),
+            InlineKeyboardButton("Lifestyle/Vlog", callback_data=encode("niche", "lifestyle")),
         ],
         [
-            InlineKeyboardButton("Food/Hospitality", callback_data="niche_food"),
-            InlineKeyboardButton("Music/Entertainment", callback_data="niche_music"),
+            InlineKeyboardButton("Food/Hospitality", callback_data=encode("niche", "food")),
+            InlineKeyboardButton("Music/Entertainment", callback_data=encode("niche", "music")),
         ],
         [
-            InlineKeyboardButton("Fitness/Wellness", callback_data="niche_fitness"),
-            InlineKeyboardButton("Other", callback_data="niche_other"),
+            InlineKeyboardButton("Fitness/Wellness", callback_data=encode("niche", "fitness")),
+            InlineKeyboardButton("Other", callback_data=encode("niche", "other")),
         ]
     ]
     return InlineKeyboardMarkup(keyboard)
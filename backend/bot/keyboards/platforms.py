@@ -1,18 +1,20 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
+from bot.callback_data import encode
+
 def platform_keyboard():
     keyboard = [
         [
-            InlineKeyboardButton("Instagram", callback_data="platform_instagram"),
-            InlineKeyboardButton("TikTok", callback_data="platform_tiktok"),
+            InlineKeyboardButton("Instagram", callback_data=encode("platform", "instagram")),
+            InlineKeyboardButton("TikTok", callback_data=encode("platform", "tiktok")),
         ],
         [
-            InlineKeyboardButton("YouTube Shorts", callback_data="platform_youtube"),
-            InlineKeyboardButton("Twitter", callback_data="platform_twitter"),
+            InlineKeyboardButton("YouTube Shorts", callback_data=encode("platform", "youtube")),
+            InlineKeyboardButton("Twitter", callback_data=encode("platform", "twitter")),
         ],
         [
-            InlineKeyboardButton("Facebook", callback_data="platform_facebook"),
-            InlineKeyboardButton("Other", callback_data="platform_other"),
+            InlineKeyboardButton("Facebook", callback_data=encode("platform", "facebook")),
+            InlineKeyboardButton("Other", callback_data=encode("platform", "other")),
         ],
     ]
     return InlineKeyboardMarkup(keyboard)
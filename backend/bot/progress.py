@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from telegram import Bot, MaybeInaccessibleMessage, Message
+from telegram.error import BadRequest
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressMessage:
+    """
+    A "working on it..." message that later becomes the result.
+
+        progress = await ProgressMessage.send(context.bot, chat_id, "📈 Generating...")
+        ...
+        await progress.finish(result_text, parse_mode="Markdown", reply_markup=kb)
+
+    finish() edits the progress message in place instead of sending a second
+    message (one Bot API call instead of two, and no leftover spinner text).
+    Falls back to a fresh send_message if the edit is rejected.
+
+    Wrapping an existing message (e.g. a callback's keyboard message) and
+    calling finish() turns that message into the next step in place.
+    """
+
+    def __init__(self, bot: Bot, chat_id: int, message: Optional[MaybeInaccessibleMessage] = None):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message = message
+
+    @classmethod
+    async def send(cls, bot: Bot, chat_id: int, text: str, **kwargs: Any) -> "ProgressMessage":
+        message = await bot.send_message(chat_id, text, **kwargs)
+        return cls(bot, chat_id, message)
+
+    async def finish(self, text: str, **kwargs: Any) -> Message | bool:
+        if self.message is not None:
+            try:
+                return await self.bot.edit_message_text(
+                    text,
+                    chat_id=self.chat_id,
+                    message_id=self.message.message_id,
+                    **kwargs,
+                )
+            except BadRequest as e:
+                logger.warning(f"Progress edit failed, sending instead → {e}")
+
+        self.message = await self.bot.send_message(self.chat_id, text, **kwargs)
+        return self.message
@@ -0,0 +1,17 @@
+# backend/tests/conftest.py
+#
+# Run from backend/:  python -m pytest -q tests
+#
+# Dummy config so the app modules import; nothing here connects to
+# Postgres, Paystack or Telegram.
+
+import os
+
+for _name, _value in {
+    "DATABASE_URL": "postgresql://test@localhost/test",
+    "PAYSTACK_SECRET_KEY": "sk_test",
+    "TELEGRAM_BOT_TOKEN": "123:test",
+    "CONVERSATION_STORE": "postgres",
+    "PRICING_TRANSPORT": "local",
+}.items():
+    os.environ.setdefault(_name, _value)
@@ -0,0 +1,108 @@
+# backend/tests/fake_paystack.py
+
+import json
+import uuid
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.services.paystack_client import PaystackClient
+
+
+class FakePaystack:
+    """
+    Local in-memory Paystack stand-in for tests.
+
+    Plugs into PaystackClient through httpx.MockTransport, so the real
+    client code (retries, breaker, parsing) is exercised without network:
+
+        fake = FakePaystack()
+        client = fake.client()
+        data = await client.initialize_transaction("a@b.c", 1000, "ref-1")
+        fake.settle("ref-1", "success")
+        await reconcile_pending_payments(client=client)
+
+    Supported endpoints:
+      POST /transaction/initialize
+      GET  /transaction/verify/:reference
+      GET  /transaction?status=&page=&perPage=
+    """
+
+    def __init__(self, fail_with: Optional[int] = None):
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        # force every request to answer with this HTTP status (e.g. 503)
+        self.fail_with = fail_with
+        self.calls: Dict[str, int] = {"initialize": 0, "verify": 0, "list": 0}
+
+    # ---------- test helpers ----------
+    def add(self, reference: str, amount: int, status: str = "abandoned", metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.transactions[reference] = {
+            "id": len(self.transactions) + 1,
+            "reference": reference,
+            "amount": amount,
+            "status": status,
+            "metadata": metadata or {},
+            "customer": {"email": ""},
+        }
+
+    def settle(self, reference: str, status: str = "success") -> None:
+        self.transactions[reference]["status"] = status
+
+    def client(self, secret_key: str = "sk_test_fake") -> PaystackClient:
+        return PaystackClient(secret_key, base_url="https://paystack.test", transport=self.transport())
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    # ---------- request handling ----------
+    @staticmethod
+    def _reply(status_code: int, body: Dict[str, Any]) -> httpx.Response:
+        return httpx.Response(status_code, json=body)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.fail_with is not None:
+            return self._reply(self.fail_with, {"status": False, "message": "Stubbed failure"})
+
+        path = request.url.path
+
+        if request.method == "POST" and path == "/transaction/initialize":
+            self.calls["initialize"] += 1
+            body = json.loads(request.content or b"{}")
+            reference = body.get("reference") or str(uuid.uuid4())
+            self.add(reference, int(body.get("amount") or 0), metadata=body.get("metadata"))
+            self.transactions[reference]["customer"]["email"] = body.get("email") or ""
+            return self._reply(200, {
+                "status": True,
+                "message": "Authorization URL created",
+                "data": {
+                    "authorization_url": f"https://checkout.paystack.test/{reference}",
+                    "access_code": reference[:12],
+                    "reference": reference,
+                },
+            })
+
+        if request.method == "GET" and path.startswith("/transaction/verify/"):
+            self.calls["verify"] += 1
+            reference = path.rsplit("/", 1)[-1]
+            tx = self.transactions.get(reference)
+            if tx is None:
+                # what Paystack really answers for an unknown reference
+                return self._reply(400, {"status": False, "message": "Transaction reference not found"})
+            return self._reply(200, {"status": True, "message": "Verification successful", "data": tx})
+
+        if request.method == "GET" and path == "/transaction":
+            self.calls["list"] += 1
+            status = request.url.params.get("status")
+            page = int(request.url.params.get("page", 1))
+            per_page = int(request.url.params.get("perPage", 50))
+
+            matches = [tx for tx in self.transactions.values() if not status or tx["status"] == status]
+            start = (page - 1) * per_page
+            return self._reply(200, {
+                "status": True,
+                "message": "Transactions retrieved",
+                "data": matches[start:start + per_page],
+                "meta": {"total": len(matches), "page": page, "perPage": per_page},
+            })
+
+        return self._reply(404, {"status": False, "message": "Not found"})
@@ -0,0 +1,83 @@
+# backend/tests/test_callback_flow.py
+#
+# stats → platform → niche through the real handlers, against a Bot API
+# stand-in that records every call: pins how many Bot API calls one
+# pricing conversation costs with and without TELEGRAM_EDIT_IN_PLACE.
+
+import asyncio
+from typing import Dict
+
+import pytest
+from telegram import Update
+from telegram.ext import Application, CallbackContext
+
+import app.services.pro_service as pro_module
+import bot.callbacks_niche as niche_module
+import bot.handlers.callbacks_platform as platform_module
+from benchmarks.webhook_replay import FakeBotAPI, _callback, _message
+from bot.callback_data import encode
+from bot.handlers.text_router import callback_router, text_router
+
+USER_ID = 4242
+
+
+async def _conversation() -> Dict[str, int]:
+    fake_api = FakeBotAPI()
+    application = (
+        Application.builder()
+        .token("123:test")
+        .request(fake_api)
+        .get_updates_request(fake_api)
+        .updater(None)
+        .build()
+    )
+    await application.initialize()
+    fake_api.calls.clear()   # drop getMe from initialize()
+
+    try:
+        steps = [
+            (text_router, _message(1, USER_ID, "50k 12k 8%")),
+            (callback_router.dispatch, _callback(2, USER_ID, encode("platform", "tiktok"))),
+            (callback_router.dispatch, _callback(3, USER_ID, encode("niche", "tech"))),
+        ]
+        for handler, payload in steps:
+            update = Update.de_json(payload, application.bot)
+            await handler(update, CallbackContext.from_update(update, application))
+
+        user_data = application.user_data[USER_ID]
+        assert user_data["platform"] == "tiktok"
+        assert user_data["niche"] == "tech"
+    finally:
+        await application.shutdown()
+
+    return dict(fake_api.calls)
+
+
+@pytest.fixture(autouse=True)
+def free_user(monkeypatch):
+    monkeypatch.setattr(pro_module, "_load_pro_status", lambda telegram_id: (False, None))
+
+
+def _set_edit_in_place(monkeypatch, enabled: bool) -> None:
+    monkeypatch.setattr(platform_module, "TELEGRAM_EDIT_IN_PLACE", enabled)
+    monkeypatch.setattr(niche_module, "TELEGRAM_EDIT_IN_PLACE", enabled)
+
+
+def test_edit_in_place_turns_each_step_into_an_edit(monkeypatch):
+    _set_edit_in_place(monkeypatch, True)
+
+    assert asyncio.run(_conversation()) == {
+        "sendMessage": 1,          # stats → platform keyboard
+        "answerCallbackQuery": 2,
+        "editMessageText": 2,      # keyboard → niche step → pricing card
+    }
+
+
+def test_without_edit_in_place_each_step_is_a_new_message(monkeypatch):
+    _set_edit_in_place(monkeypatch, False)
+
+    assert asyncio.run(_conversation()) == {
+        "sendMessage": 3,          # platform keyboard, niche step, progress
+        "answerCallbackQuery": 2,
+        "editMessageText": 1,      # progress → pricing card
+    }
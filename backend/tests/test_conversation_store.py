@@ -0,0 +1,67 @@
+# backend/tests/test_conversation_store.py
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import app.services.conversation_store as store_module
+from app.services.conversation_store import ConversationStore
+
+
+def _run_update(store: ConversationStore, user_id: int, writes: list):
+    async def handler(update):
+        store.get(user_id)["step"] = "niche"
+        return len(writes)          # rows written while the update was processed
+
+    update = SimpleNamespace(effective_user=SimpleNamespace(id=user_id))
+    return asyncio.run(store.wrap(handler)(update))
+
+
+def _fake_db(monkeypatch):
+    writes = []
+    monkeypatch.setattr(store_module, "_load_state", lambda user_id, ttl: None)
+    monkeypatch.setattr(
+        store_module, "_write_states", lambda upserts, deletes, purge_ttl: writes.append((upserts, deletes))
+    )
+    return writes
+
+
+def test_shared_store_writes_through_before_the_update_returns(monkeypatch):
+    writes = _fake_db(monkeypatch)
+    store = ConversationStore(shared=True)
+
+    assert _run_update(store, 7, writes) == 0
+    assert writes == [([(7, '{"step":"niche"}')], [])]
+    assert store.stats()["dirty"] == 0
+
+
+def test_single_worker_store_batches_writes(monkeypatch):
+    writes = _fake_db(monkeypatch)
+    store = ConversationStore(shared=False)
+
+    _run_update(store, 7, writes)
+    assert writes == []
+    assert store.stats()["dirty"] == 1
+
+    asyncio.run(store.flush())
+    assert writes == [([(7, '{"step":"niche"}')], [])]
+
+
+def test_non_json_values_are_not_persisted(monkeypatch, caplog):
+    writes = _fake_db(monkeypatch)
+    store = ConversationStore(shared=False)
+
+    async def handler(update):
+        data = store.get(7)
+        data["step"] = "niche"
+        data["started"] = datetime(2026, 1, 1)
+        data["pair"] = (1, 2)
+
+    update = SimpleNamespace(effective_user=SimpleNamespace(id=7))
+    asyncio.run(store.wrap(handler)(update))
+    asyncio.run(store.flush())
+
+    # only the value that survives a reload unchanged is written
+    assert writes == [([(7, '{"step":"niche"}')], [])]
+    assert "'pair'" in caplog.text and "'started'" in caplog.text
+    assert store.get(7)["pair"] == (1, 2)   # still usable on this worker
@@ -0,0 +1,43 @@
+# backend/tests/test_db_async.py
+
+import time
+import asyncio
+
+from app.db_async import DB_EXECUTOR_WORKERS, run_db
+
+
+def slow_query(seconds: float) -> float:
+    time.sleep(seconds)   # stands in for a blocking psycopg2 call
+    return seconds
+
+
+def test_event_loop_keeps_running_while_db_workers_are_busy():
+    async def scenario():
+        ticks = 0
+        done = False
+
+        async def heartbeat():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        beat = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0)
+
+        # every worker busy, plus a few calls queued behind them
+        calls = [run_db(slow_query, 0.2) for _ in range(DB_EXECUTOR_WORKERS + 2)]
+        started = time.perf_counter()
+        results = await asyncio.gather(*calls)
+        elapsed = time.perf_counter() - started
+
+        ticks_while_blocked = ticks
+        done = True
+        await beat
+        return results, elapsed, ticks_while_blocked
+
+    results, elapsed, ticks = asyncio.run(scenario())
+
+    assert results == [0.2] * (DB_EXECUTOR_WORKERS + 2)
+    assert elapsed >= 0.4             # the extra calls waited for a free worker
+    assert ticks > 100                # ...but the loop never stopped ticking
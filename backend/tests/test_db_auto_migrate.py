@@ -0,0 +1,98 @@
+# backend/tests/test_db_auto_migrate.py
+#
+# run_migrations against a scripted connection: which statements run, in
+# which transaction mode, and what gets recorded in schema_migrations.
+
+from contextlib import contextmanager
+
+import pytest
+
+import app.db_auto_migrate as migrate_module
+from app.db_auto_migrate import NO_TRANSACTION, run_migrations
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._row = None
+
+    def execute(self, sql, params=None):
+        self.conn.log.append((" ".join(sql.split()), self.conn.autocommit))
+        if "to_regclass" in sql:
+            self._row = ("schema_migrations",)
+        elif sql.startswith("SELECT 1 FROM schema_migrations"):
+            self._row = (1,) if self.conn.recorded.pop(0) else None
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return [(version,) for version in self.conn.applied]
+
+
+class FakeConnection:
+    def __init__(self, applied, recorded):
+        self.applied = applied
+        self.recorded = list(recorded)   # answers to the under-lock re-checks
+        self.autocommit = False
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def _run(monkeypatch, migrations, recorded):
+    conn = FakeConnection(applied=[1], recorded=recorded)
+
+    @contextmanager
+    def db_connection():
+        yield conn
+
+    monkeypatch.setattr(migrate_module, "db_connection", db_connection)
+    monkeypatch.setattr(migrate_module, "MIGRATIONS", [(1, "done", "SELECT 1")] + migrations)
+    return run_migrations(), conn.log
+
+
+def _statements(log, keyword):
+    return [(sql, autocommit) for sql, autocommit in log if keyword in sql]
+
+
+def test_no_transaction_migration_runs_in_autocommit_and_is_recorded(monkeypatch):
+    sql = NO_TRANSACTION + "\nREINDEX INDEX CONCURRENTLY some_idx;"
+    count, log = _run(monkeypatch, [(2, "rebuild", sql)], recorded=[False, False])
+
+    assert count == 1
+    assert _statements(log, "REINDEX") == [("REINDEX INDEX CONCURRENTLY some_idx", True)]
+    assert len(_statements(log, "INSERT INTO schema_migrations")) == 1
+
+
+def test_no_transaction_migration_recorded_meanwhile_is_not_counted(monkeypatch):
+    sql = NO_TRANSACTION + "\nREINDEX INDEX CONCURRENTLY some_idx;"
+    count, log = _run(monkeypatch, [(2, "rebuild", sql)], recorded=[False, True])
+
+    assert count == 0
+    assert _statements(log, "INSERT INTO schema_migrations") == []
+
+
+def test_no_transaction_migration_rejects_blocking_ddl(monkeypatch):
+    sql = NO_TRANSACTION + """
+    ALTER TABLE payments ADD COLUMN IF NOT EXISTS x INTEGER;
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS x_idx ON payments (x);
+    """
+    with pytest.raises(RuntimeError, match="CONCURRENTLY"):
+        _run(monkeypatch, [(2, "mixed", sql)], recorded=[False])
+
+
+def test_transactional_migration_sets_lock_timeout(monkeypatch):
+    count, log = _run(monkeypatch, [(2, "column", "ALTER TABLE payments ADD COLUMN x INTEGER")], recorded=[False])
+
+    assert count == 1
+    executed = [sql for sql, _ in log]
+    timeout = executed.index("SET LOCAL lock_timeout = '5s'")
+    assert executed[timeout + 1] == "ALTER TABLE payments ADD COLUMN x INTEGER"
@@ -0,0 +1,65 @@
+# backend/tests/test_fx_rates.py
+
+import json
+import asyncio
+
+import pytest
+
+from app.services.fx_rates import FileFxSource, FxRefresher, FxSource, FxSourceError, build_fx_source, parse_rates
+
+
+def test_static_spec_parses_rates():
+    source = build_fx_source("static:USD=1550, gbp=1960")
+    assert asyncio.run(source.fetch()) == ({"USD": 1550.0, "GBP": 1960.0}, None)
+
+
+@pytest.mark.parametrize("spec", [
+    "static:USD=",
+    "static:USD=0",
+    "static:USD=-5",
+    "static:=1550",
+    "static:USD=abc",
+    "static:USD=nan",
+    "static:USD=inf",
+    "static:USD=1550,GBP=-inf",
+])
+def test_malformed_static_spec_is_rejected(spec):
+    with pytest.raises(ValueError):
+        build_fx_source(spec)
+
+
+def test_non_finite_provider_rates_are_dropped():
+    payload = {"base": "USD", "rates": {"NGN": 1550.0, "GBP": float("nan"), "EUR": float("inf")}}
+    assert parse_rates(payload, ("USD", "GBP", "EUR")) == ({"USD": 1550.0}, None)
+
+
+@pytest.mark.parametrize("ngn", [float("nan"), float("inf"), 0, -1550])
+def test_unusable_ngn_rate_is_rejected(ngn):
+    with pytest.raises(FxSourceError):
+        parse_rates({"base": "USD", "rates": {"NGN": ngn}}, ("USD",))
+
+
+def test_malformed_spec_disables_fx_instead_of_failing_startup():
+    refresher = FxRefresher(spec="static:USD=")
+    asyncio.run(refresher.start())
+
+    stats = refresher.stats()
+    assert stats["running"] is False
+    assert stats["source"] == "none"
+    assert "USD" in stats["last_error"]
+
+
+def test_file_source_reads_off_the_event_loop(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"NGN": 1500, "GBP": 0.75}}))
+
+    rates, _ = asyncio.run(FileFxSource(str(path)).fetch())
+    assert rates == {"USD": 1500.0, "GBP": 2000.0}
+
+
+def test_sources_must_implement_fetch():
+    class Incomplete(FxSource):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,163 @@
+# backend/tests/test_hybrid_pricing_engine.py
+#
+# The compiled PricingModel must price exactly like the original formula
+# (same floats, same truncation), for the scalar, batch and columnar engines.
+
+import random
+from typing import Any, Dict, Optional
+
+from app.services.hybrid_pricing_engine import (
+    AFRICA_DISCOUNT,
+    FLOOR_NGN_PER_10K,
+    FLOOR_PLATFORM_MULT,
+    NICHE_MULT,
+    PLATFORM_CPM_USD,
+    PLATFORM_SPREAD,
+    USAGE_MULT,
+    USD_TO_NGN,
+    WHITELIST_MULT,
+    BATCH_SCALAR_CUTOFF,
+    hybrid_pricing_engine,
+    hybrid_pricing_engine_batch,
+    hybrid_pricing_engine_columns,
+)
+
+VERSION_KEYS = ("config_version", "fx_version")
+
+
+def reference_engine(followers, avg_views, engagement, platform, niche, is_pro, mode="single") -> Dict[str, Any]:
+    """
+    The engine as it was before the tables were compiled (step by step).
+    """
+    platform = (platform or "").lower()
+    niche = (niche or "").lower()
+
+    if platform in PLATFORM_CPM_USD:
+        low, high = PLATFORM_CPM_USD[platform]
+        cpm_usd = (low + high) / 2.0
+    else:
+        cpm_usd = 10
+    cpm_usd_local = cpm_usd * AFRICA_DISCOUNT
+    niche_mult = NICHE_MULT.get(niche, 1.0)
+
+    floor_ngn = 0
+    if followers:
+        floor_ngn = ((followers / 10_000) * FLOOR_NGN_PER_10K) * FLOOR_PLATFORM_MULT.get(platform, 1.0)
+
+    views_ngn = 0
+    if avg_views:
+        views_ngn = (((avg_views / 1000) * cpm_usd_local) * niche_mult) * USD_TO_NGN
+
+    if followers and avg_views and engagement:
+        pricing_mode, base_value_ngn = "full", max(views_ngn, floor_ngn)
+    elif followers and not avg_views:
+        pricing_mode, base_value_ngn = "followers_only", floor_ngn
+    elif avg_views and not followers:
+        pricing_mode, base_value_ngn = "views_only", views_ngn
+    else:
+        return {"error": "insufficient_data", "mode": "unknown"}
+
+    ngn_usage = base_value_ngn * USAGE_MULT.get(3, 2.0)
+    spread = PLATFORM_SPREAD.get(platform, 0.25)
+    usd_mid = ngn_usage / USD_TO_NGN
+    whitelist_ngn: Optional[float] = ngn_usage * WHITELIST_MULT if is_pro else None
+    usd_whitelist = whitelist_ngn / USD_TO_NGN if whitelist_ngn else None
+
+    common = {
+        "usd_mid": round(float(usd_mid), 2),
+        "whitelist_ngn": int(whitelist_ngn) if whitelist_ngn else None,
+        "usd_whitelist": round(float(usd_whitelist), 2) if usd_whitelist else None,
+    }
+    head = {
+        "mode": pricing_mode, "platform": platform, "niche": niche,
+        "followers": followers, "avg_views": avg_views, "engagement": engagement,
+    }
+    if mode == "range":
+        return {
+            **head, "currency": "NGN",
+            "min": int(ngn_usage * (1 - spread)), "mid": int(ngn_usage), "max": int(ngn_usage * (1 + spread)),
+            **common, "usage_months": 3, "whitelisting_enabled": is_pro, "is_pro": is_pro,
+        }
+    return {
+        **head, "usage_months": 3,
+        "range_low_ngn": int(ngn_usage * (1 - spread)), "range_high_ngn": int(ngn_usage * (1 + spread)),
+        **common, "is_pro": is_pro,
+    }
+
+
+def _rows(n: int, seed: int):
+    rng = random.Random(seed)
+    platforms = ["instagram", "tiktok", "youtube", "twitter", "facebook", "other", "TikTok", "myspace", None, ""]
+    niches = ["tech", "beauty", "general", "Tech", "unknown", None, "finance", "comedy", "fitness"]
+    return [
+        (
+            rng.choice([None, 0, rng.randint(1, 5_000_000), rng.randint(1, 50_000_000), 50_000, 1_200_000]),
+            rng.choice([None, 0, rng.randint(1, 2_000_000), 12_000]),
+            rng.choice([None, 0, round(rng.uniform(0, 1), 4), 0.08]),
+            rng.choice(platforms),
+            rng.choice(niches),
+            rng.random() < 0.5,
+        )
+        for _ in range(n)
+    ]
+
+
+def _strip(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in result.items() if k not in VERSION_KEYS}
+
+
+def test_scalar_and_batch_match_reference_formula():
+    rows = _rows(50_000, seed=22)
+    for mode in ("range", "single"):
+        expected = [reference_engine(*row, mode=mode) for row in rows]
+        scalar = [_strip(hybrid_pricing_engine(*row, mode=mode)) for row in rows]
+        batch = [_strip(r) for r in hybrid_pricing_engine_batch(*zip(*rows), mode=mode)]
+
+        assert scalar == expected
+        assert batch == expected
+
+
+def test_small_batches_take_the_scalar_path_with_the_same_results():
+    rows = _rows(300, seed=5)
+    expected = [reference_engine(*row, mode="range") for row in rows]
+    for size in (1, 7, 300):
+        batch = [_strip(r) for r in hybrid_pricing_engine_batch(*zip(*rows[:size]), mode="range")]
+        assert batch == expected[:size]
+
+
+def test_columns_match_range_results():
+    rows = _rows(5_000, seed=9)
+    columns = hybrid_pricing_engine_columns(*zip(*rows))
+    for i, row in enumerate(rows):
+        expected = reference_engine(*row, mode="range")
+        if "error" in expected:
+            assert columns["mode"][i] is None
+            continue
+        for key in ("mode", "min", "mid", "max", "usd_mid", "whitelist_ngn", "usd_whitelist"):
+            assert columns[key][i] == expected[key], (i, key)
+
+
+def test_results_carry_versions():
+    result = hybrid_pricing_engine(50_000, 12_000, 0.08, "tiktok", "tech", True, mode="range")
+    assert set(VERSION_KEYS) <= set(result)
+
+
+def test_batch_matches_scalar_past_int64():
+    # prices around 2**63 (and far past it) must not wrap in the NumPy pass;
+    # 10**k up to 10**22 is exact as a float64, so both paths see the same inputs
+    huge = [
+        (10 ** k, views, 0.05, "tiktok", "tech", True)
+        for k in range(15, 23)
+        for views in (None, 10 ** k)
+    ]
+    rows = _rows(BATCH_SCALAR_CUTOFF, seed=3) + huge
+    batch = hybrid_pricing_engine_batch(*zip(*rows), mode="range")
+    columns = hybrid_pricing_engine_columns(*zip(*rows))
+
+    for i, row in enumerate(rows):
+        scalar = hybrid_pricing_engine(*row, mode="range")
+        assert batch[i] == scalar, i
+        if "error" not in scalar:
+            assert columns["min"][i] == scalar["min"], i
+            assert columns["max"][i] == scalar["max"], i
+    assert max(r["max"] for r in batch[-len(huge):]) > 2 ** 63
@@ -0,0 +1,62 @@
+# backend/tests/test_paystack_reconcile.py
+#
+# One reconciliation pass against FakePaystack (real PaystackClient over
+# httpx.MockTransport); the two DB helpers are replaced by the pending
+# rows below and a list of applied outcomes.
+
+import asyncio
+
+import app.services.paystack_reconcile as reconcile_module
+from app.services.paystack_reconcile import PAYSTACK_RECONCILE_ABANDON_AFTER, reconcile_pending_payments
+from fake_paystack import FakePaystack
+
+PRO_KOBO = 1_000_000
+
+
+def test_reconcile_pass_maps_paystack_states(monkeypatch):
+    fake = FakePaystack()
+    fake.add("ref-paid", PRO_KOBO, status="success")
+    fake.add("ref-short", PRO_KOBO // 2, status="success")
+    fake.add("ref-failed", PRO_KOBO, status="failed")
+    fake.add("ref-open", PRO_KOBO)
+
+    # (reference, telegram_id, amount, plan, age_seconds), in keyset order
+    pending = [
+        ("ref-failed", "1", PRO_KOBO, "PRO", 900.0),
+        ("ref-gone", "2", PRO_KOBO, "PRO", PAYSTACK_RECONCILE_ABANDON_AFTER + 1.0),
+        ("ref-missing", "3", PRO_KOBO, "PRO", 900.0),
+        ("ref-open", "4", PRO_KOBO, "PRO", 900.0),
+        ("ref-paid", "5", PRO_KOBO, "PRO", 900.0),
+        ("ref-short", "6", PRO_KOBO, "PRO", 900.0),
+    ]
+    applied = []
+
+    def claim_pending_page(after, limit, min_age):
+        return [row for row in pending if row[0] > after][:limit]
+
+    def apply_reconciliation(outcomes):
+        applied.extend(outcomes)
+        return set()
+
+    monkeypatch.setattr(reconcile_module, "claim_pending_page", claim_pending_page)
+    monkeypatch.setattr(reconcile_module, "apply_reconciliation", apply_reconciliation)
+
+    async def run():
+        client = fake.client()
+        try:
+            return await reconcile_pending_payments(client=client, page_size=4)
+        finally:
+            await client.aclose()
+
+    summary = asyncio.run(run())
+
+    # unknown references come back as 400 "Transaction reference not found":
+    # old ones are abandoned, recent ones stay pending
+    assert sorted(applied) == [
+        ("ref-failed", "failed"),
+        ("ref-gone", "abandoned"),
+        ("ref-paid", "success"),
+        ("ref-short", "mismatch"),
+    ]
+    assert summary == {"checked": 6, "success": 1, "failed": 1, "abandoned": 1, "mismatch": 1, "unchanged": 2}
+    assert fake.calls["verify"] == 6
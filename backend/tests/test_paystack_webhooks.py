@@ -0,0 +1,77 @@
+# backend/tests/test_paystack_webhooks.py
+#
+# process_pending_events against a scripted connection: a handler that
+# keeps raising backs off exponentially and is dead-lettered, while the
+# rest of the batch is still applied.
+
+from contextlib import contextmanager
+
+import app.services.paystack_webhooks as webhooks_module
+from app.services.paystack_webhooks import (
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_RETRY_BASE,
+    WEBHOOK_RETRY_MAX,
+    process_pending_events,
+    retry_delay,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        if sql.startswith("UPDATE paystack_events"):
+            self.updates.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+def _process(monkeypatch, rows):
+    cur = FakeCursor(rows)
+
+    class FakeConnection:
+        def cursor(self):
+            return cur
+
+        def commit(self):
+            pass
+
+    @contextmanager
+    def db_connection():
+        yield FakeConnection()
+
+    def poisoned(cur, data):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(webhooks_module, "db_connection", db_connection)
+    monkeypatch.setitem(webhooks_module.WEBHOOK_HANDLERS, "test.poisoned", poisoned)
+    monkeypatch.setitem(webhooks_module.WEBHOOK_HANDLERS, "test.ok", lambda cur, data: None)
+    process_pending_events()
+    return cur.updates
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert retry_delay(0) == WEBHOOK_RETRY_BASE
+    assert retry_delay(1) == WEBHOOK_RETRY_BASE * 2
+    assert retry_delay(3) == WEBHOOK_RETRY_BASE * 8
+    assert retry_delay(50) == WEBHOOK_RETRY_MAX
+
+
+def test_failing_event_backs_off_and_others_still_apply(monkeypatch):
+    updates = _process(monkeypatch, [(1, "test.poisoned", {"data": {}}, 2), (2, "test.ok", {"data": {}}, 0)])
+
+    failed, applied = updates
+    assert "next_attempt_at" in failed[0]
+    assert failed[1][1:] == ("pending", retry_delay(2), 1)
+    assert "status='processed'" in applied[0] and applied[1] == (2,)
+
+
+def test_event_is_dead_lettered_on_its_last_attempt(monkeypatch):
+    updates = _process(monkeypatch, [(1, "test.poisoned", {"data": {}}, WEBHOOK_MAX_ATTEMPTS - 1)])
+
+    (sql, params), = updates
+    assert params[1] == "failed"
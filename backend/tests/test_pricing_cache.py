@@ -0,0 +1,70 @@
+# backend/tests/test_pricing_cache.py
+
+import pytest
+
+import app.utils.cache as cache_module
+from app.services.hybrid_pricing_engine import BUILTIN_PRICING_TABLES, PricingModel, current_model, install_model
+from app.services.pricing_cache import PricingCache, quantize
+
+
+@pytest.fixture(autouse=True)
+def restore_model():
+    model = current_model()
+    yield
+    install_model(model)
+
+
+def test_quantize_keeps_types_and_never_zeroes():
+    assert quantize(51_234, 3) == 51_200 and isinstance(quantize(51_234, 3), int)
+    assert quantize(0.08123, 2) == 0.081
+    assert quantize(0.0004, 1) == 0.0004
+    assert quantize(None, 3) is None
+    assert quantize(51_234, 0) == 51_234
+
+
+def test_equivalent_quantized_inputs_share_one_entry():
+    cache = PricingCache(maxsize=100, ttl=60, quantize_digits=3)
+
+    first = cache.quote(51_234, 12_010, 0.0812, "TikTok", "Tech", True, "range")
+    second = cache.quote(51_249, 12_040, 0.08118, "tiktok", "tech", True, "range")
+
+    assert second is first
+    assert first.result["followers"] == 51_200
+    assert cache.stats()["hits"] == 1
+
+    # PRO and output mode are part of the key
+    assert cache.quote(51_234, 12_010, 0.0812, "tiktok", "tech", False, "range") is not first
+    assert cache.quote(51_234, 12_010, 0.0812, "tiktok", "tech", True, "single") is not first
+
+
+def test_installing_a_model_makes_old_entries_miss():
+    cache = PricingCache(maxsize=100, ttl=60)
+    before = cache.quote(50_000, 12_000, 0.08, "tiktok", "tech", True, "range")
+    assert cache.quote(50_000, 12_000, 0.08, "tiktok", "tech", True, "range") is before
+
+    floor = BUILTIN_PRICING_TABLES["floor_ngn_per_10k"] * 2
+    install_model(PricingModel.from_tables({**BUILTIN_PRICING_TABLES, "floor_ngn_per_10k": floor}))
+
+    after = cache.quote(50_000, 12_000, 0.08, "tiktok", "tech", True, "range")
+    assert after is not before
+    assert after.result["config_version"] != before.result["config_version"]
+    assert after.result["max"] > before.result["max"]
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PricingCache(maxsize=100, ttl=60)
+
+    first = cache.quote(50_000, None, None, "tiktok", "tech", False, "range")
+    now[0] += 59
+    assert cache.quote(50_000, None, None, "tiktok", "tech", False, "range") is first
+    now[0] += 2
+    assert cache.quote(50_000, None, None, "tiktok", "tech", False, "range") is not first
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disabled_cache_always_prices():
+    cache = PricingCache(maxsize=0)
+    first = cache.quote(50_000, None, None, "tiktok", "tech", False, "range")
+    assert cache.quote(50_000, None, None, "tiktok", "tech", False, "range") is not first
@@ -0,0 +1,69 @@
+# backend/tests/test_pricing_config.py
+
+import os
+import json
+import asyncio
+
+import pytest
+
+from app.services.hybrid_pricing_engine import BUILTIN_PRICING_TABLES, current_model, install_model
+from app.services.pricing_config import PricingConfigError, PricingConfigManager, parse_config
+
+
+@pytest.fixture(autouse=True)
+def restore_model():
+    model = current_model()
+    yield
+    install_model(model)
+
+
+def test_partial_config_merges_over_builtin_tables():
+    tables = parse_config({"niche_mult": {"Tech": 1.5}, "usage_mult": {"6": 2.5}, "usd_to_ngn": 1500})
+
+    assert tables["niche_mult"] == {**BUILTIN_PRICING_TABLES["niche_mult"], "tech": 1.5}
+    assert tables["usage_mult"] == {**BUILTIN_PRICING_TABLES["usage_mult"], 6: 2.5}
+    assert tables["usd_to_ngn"] == 1500
+    assert tables["platform_cpm_usd"] == BUILTIN_PRICING_TABLES["platform_cpm_usd"]
+
+
+@pytest.mark.parametrize("raw", [
+    {"niche_mult": {"tech": float("nan")}},
+    {"niche_mult": {"tech": float("inf")}},
+    {"usd_to_ngn": float("nan")},
+    {"platform_cpm_usd": {"tiktok": [1, float("inf")]}},
+    {"niche_mult": {"tech": 0}},
+    {"niche_mult": {"tech": "1.5"}},
+    {"platform_cpm_usd": {"tiktok": [9, 3]}},
+    {"usage_mult": {"six": 2.0}},
+    {"africa_discount": 1.5},
+    {"surge": 2},
+    [1, 2],
+])
+def test_bad_configs_are_rejected(raw):
+    with pytest.raises(PricingConfigError):
+        parse_config(raw)
+
+
+def _write(path, raw, mtime_ns):
+    path.write_text(json.dumps(raw))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reload_keeps_the_old_model_on_a_bad_revision(tmp_path):
+    path = tmp_path / "pricing_config.json"
+    manager = PricingConfigManager(source="file", path=str(path), poll_interval=0)
+
+    _write(path, {"niche_mult": {"tech": 1.5}}, 1_000_000_000)
+    assert asyncio.run(manager.reload())
+    good = current_model()
+    assert good.tables()["niche_mult"]["tech"] == 1.5
+
+    # json.dumps writes NaN, and json.load reads it back
+    _write(path, {"niche_mult": {"tech": float("nan")}}, 2_000_000_000)
+    assert not asyncio.run(manager.reload())
+    assert current_model() is good
+    assert manager.rejected == 1
+
+    # the rejected revision is not retried every poll
+    assert not asyncio.run(manager.reload())
+    assert manager.rejected == 1
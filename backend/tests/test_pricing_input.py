@@ -0,0 +1,73 @@
+# backend/tests/test_pricing_input.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import bot.handlers.pricing as pricing_module
+from app.services.pricing_input import parse_number
+from bot.handlers.pricing import has_bulk_row, parse_bulk, pricing_calc
+
+
+class FakeMessage:
+    def __init__(self, text: str):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def _send(text: str, monkeypatch):
+    bulk_calls = []
+
+    async def fake_bulk(update, lines):
+        bulk_calls.append(lines)
+
+    monkeypatch.setattr(pricing_module, "bulk_pricing", fake_bulk)
+
+    message = FakeMessage(text)
+    update = SimpleNamespace(effective_message=message)
+    context = SimpleNamespace(user_data={})
+    asyncio.run(pricing_calc(update, context))
+    return message, context.user_data, bulk_calls
+
+
+def test_has_bulk_row_needs_a_complete_row():
+    assert has_bulk_row(["@ada 50k 12k 8% tiktok tech"])
+    assert has_bulk_row(["oops", "50k 12k 8% tiktok tech"])
+    assert not has_bulk_row(["50k", "12000", "8%"])
+    assert not has_bulk_row(["50k 12k 8% tiktok"])
+
+
+def test_stats_split_over_lines_are_one_creator(monkeypatch):
+    message, user_data, bulk_calls = _send("50k\n12000\n8%", monkeypatch)
+
+    assert bulk_calls == []
+    assert user_data["stats"] == {"followers": 50_000, "avg_views": 12_000, "engagement": 0.08}
+    assert "platform" in message.replies[0]
+
+
+def test_creator_rows_go_to_bulk_mode(monkeypatch):
+    _, user_data, bulk_calls = _send("@a 50k 12k 8% tiktok tech\n@b 1.2m instagram beauty", monkeypatch)
+
+    assert len(bulk_calls) == 1
+    assert "stats" not in user_data
+
+
+@pytest.mark.parametrize("raw", ["1e400", "nan", "inf", "-5", "20000000m", "1e25"])
+def test_parse_number_rejects_out_of_range(raw):
+    with pytest.raises(ValueError):
+        parse_number(raw)
+
+
+def test_overflowing_numbers_are_bad_input_not_a_crash(monkeypatch):
+    assert not has_bulk_row(["1e400 tiktok tech"])
+    rows, errors = parse_bulk(["1e400 tiktok tech", "50k tiktok tech"])
+    assert [line_no for line_no, _ in rows] == [2]
+    assert errors == [(1, "bad number in '1e400'")]
+
+    message, user_data, _ = _send("1e400 12k 8%", monkeypatch)
+    assert "stats" not in user_data
+    assert "Invalid format" in message.replies[0]
@@ -0,0 +1,39 @@
+# backend/tests/test_pro_expiry.py
+
+import asyncio
+
+from telegram.error import Forbidden, RetryAfter
+
+from app.services.pro_expiry import ProExpirySweeper
+
+
+class FakeBot:
+    """
+    send_message raises the queued errors for a chat, then succeeds.
+    """
+
+    def __init__(self, errors):
+        self.errors = {chat_id: list(queue) for chat_id, queue in errors.items()}
+        self.sent = []
+
+    async def send_message(self, chat_id, **kwargs):
+        queue = self.errors.get(chat_id)
+        if queue:
+            raise queue.pop(0)
+        self.sent.append(chat_id)
+
+
+def test_reminder_failures_are_counted():
+    bot = FakeBot({
+        2: [RetryAfter(0)],                   # retried once, then delivered
+        3: [RetryAfter(0), RetryAfter(0)],    # still rate-limited after the retry
+        4: [Forbidden("blocked")],
+    })
+    sweeper = ProExpirySweeper(notify_rate=0)
+    sweeper._bot = bot
+
+    asyncio.run(sweeper._send_reminders(["1", "2", "3", "4"]))
+
+    assert bot.sent == [1, 2]
+    assert sweeper.notified == 2
+    assert sweeper.notify_failed == 2
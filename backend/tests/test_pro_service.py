@@ -0,0 +1,37 @@
+# backend/tests/test_pro_service.py
+
+import app.services.pro_service as pro_module
+from app.services.pro_service import invalidate_pro_status, is_user_pro
+
+
+def test_lookup_that_raced_an_upgrade_is_not_cached(monkeypatch):
+    paid = False
+    loads = []
+
+    def load_pro_status(telegram_id):
+        nonlocal paid
+        loads.append(telegram_id)
+        is_pro = paid
+        if len(loads) == 1:
+            # charge.success commits and invalidates while this read is in flight
+            paid = True
+            invalidate_pro_status(telegram_id)
+        return is_pro, None
+
+    monkeypatch.setattr(pro_module, "_load_pro_status", load_pro_status)
+    invalidate_pro_status("9001")
+
+    assert is_user_pro("9001") is False     # the stale read is returned once...
+    assert is_user_pro("9001") is True      # ...but not cached
+    assert is_user_pro("9001") is True
+    assert len(loads) == 2
+
+
+def test_lookup_without_invalidation_is_cached(monkeypatch):
+    loads = []
+    monkeypatch.setattr(pro_module, "_load_pro_status", lambda telegram_id: loads.append(telegram_id) or (False, None))
+    invalidate_pro_status("9002")
+
+    assert is_user_pro("9002") is False
+    assert is_user_pro("9002") is False
+    assert len(loads) == 1
@@ -0,0 +1,81 @@
+# backend/tests/test_ratecard.py
+#
+# RatecardExporter against a recording bot: file_id reuse, the rendered
+# bytes cache and the process-pool render path (one real worker).
+
+import asyncio
+from types import SimpleNamespace
+
+from telegram.error import BadRequest
+
+from app.services.ratecard import RatecardExporter, ratecard_key
+
+CARD = {
+    "name": "Ada",
+    "platform": "tiktok",
+    "niche": "tech",
+    "followers": 50_000,
+    "avg_views": 12_000,
+    "engagement": 0.08,
+    "min": 675_000,
+    "mid": 900_000,
+    "max": 1_125_000,
+    "whitelist_ngn": 1_980_000,
+    "usage_months": 3,
+    "config_version": "v1",
+}
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+        self.reject_file_ids = False
+
+    async def send_document(self, chat_id, document, **kwargs):
+        if isinstance(document, str) and self.reject_file_ids:
+            raise BadRequest("Wrong file identifier")
+        self.sent.append(document)
+        return SimpleNamespace(document=SimpleNamespace(file_id=f"file-{len(self.sent)}"))
+
+
+def test_key_follows_the_config_version_the_card_was_priced_with():
+    assert ratecard_key(CARD, "pdf") == ratecard_key(dict(CARD), "pdf")
+    assert ratecard_key(CARD, "pdf") != ratecard_key(CARD, "png")
+    assert ratecard_key(CARD, "pdf") != ratecard_key({**CARD, "config_version": "v2"}, "pdf")
+
+
+def test_cache_hits_skip_rendering_and_uploads():
+    exporter = RatecardExporter(workers=1)
+    bot = FakeBot()
+
+    async def scenario():
+        # same card twice at once: one render on the pool, shared
+        await asyncio.gather(
+            exporter.render(ratecard_key(CARD, "pdf"), CARD, "pdf"),
+            exporter.render(ratecard_key(CARD, "pdf"), CARD, "pdf"),
+        )
+        await exporter.send(bot, 1, CARD, "pdf", filename="card.pdf")
+        await exporter.send(bot, 1, CARD, "pdf", filename="card.pdf")
+
+        # file_id rejected → re-upload the cached bytes, no new render
+        bot.reject_file_ids = True
+        await exporter.send(bot, 1, CARD, "pdf", filename="card.pdf")
+        bot.reject_file_ids = False
+
+        # a config change is a different card
+        await exporter.send(bot, 1, {**CARD, "config_version": "v2"}, "pdf", filename="card.pdf")
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        exporter.shutdown()
+
+    stats = exporter.stats()
+    assert stats["renders"] == 2
+    assert stats["uploads"] == 3
+    assert stats["file_id_reused"] == 1
+    assert stats["stale_file_ids"] == 1
+
+    uploaded = [doc for doc in bot.sent if isinstance(doc, bytes)]
+    assert uploaded[0].startswith(b"%PDF") and uploaded[0] == uploaded[1]
+    assert bot.sent[1] == "file-1"
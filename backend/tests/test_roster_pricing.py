@@ -0,0 +1,92 @@
+# backend/tests/test_roster_pricing.py
+#
+# price_roster end to end on small CSV / XLSX files: header aliases,
+# per-row errors (which must never abort the job) and the priced columns.
+
+import csv
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.hybrid_pricing_engine import hybrid_pricing_engine
+from app.services.roster_pricing import PRICED_COLUMNS, RosterError, price_roster
+
+HEADER = ["Name", "Followers", "Avg Views", "ER", "Platform", "Category"]
+ROWS = [
+    ["ada", "50k", "12000", "8%", "tiktok", "tech"],
+    ["bola", "1.2m", "", "", "Instagram", "fashion"],
+    ["chi", "1e400", "", "", "tiktok", "tech"],
+    ["dayo", "1e25", "", "", "tiktok", "tech"],
+    ["eze", "50k", "", "", "myspace", "tech"],
+    ["femi", "", "", "", "youtube", "music"],
+]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def _write_xlsx(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        # numbers as numbers, the way spreadsheets store them
+        sheet.append([float(c) if c.replace(".", "", 1).isdigit() else c for c in row])
+    workbook.save(path)
+
+
+def _read_output(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.parametrize("filename,write", [("roster.csv", _write_csv), ("roster.xlsx", _write_xlsx)])
+def test_roster_prices_good_rows_and_marks_bad_ones(tmp_path, filename, write):
+    src, dst = tmp_path / filename, tmp_path / "priced.csv"
+    write(src, [HEADER] + ROWS)
+
+    summary = price_roster(str(src), str(dst), filename, is_pro=True, chunk_rows=4)
+
+    assert summary["rows"] == 6
+    assert summary["priced"] == 2
+    assert summary["skipped"] == 4
+    assert not summary["truncated"]
+
+    out = _read_output(dst)
+    assert out[0] == HEADER + PRICED_COLUMNS
+    status = {row[0]: row[-1] for row in out[1:]}
+    assert status == {
+        "ada": "ok",
+        "bola": "ok",
+        "chi": "number out of range '1e400'",
+        "dayo": "number out of range '1e25'",
+        "eze": "unknown platform 'myspace'",
+        "femi": "not enough data (followers or views needed)",
+    }
+
+    expected = hybrid_pricing_engine(50_000, 12_000, 0.08, "tiktok", "tech", True)
+    ada = dict(zip(PRICED_COLUMNS, out[1][len(HEADER):]))
+    assert int(ada["min_ngn"]) == expected["range_low_ngn"]
+    assert int(ada["max_ngn"]) == expected["range_high_ngn"]
+    assert float(ada["usd_mid"]) == expected["usd_mid"]
+    assert int(ada["whitelist_ngn"]) == expected["whitelist_ngn"]
+
+
+def test_free_rows_leave_whitelisting_blank(tmp_path):
+    src, dst = tmp_path / "roster.csv", tmp_path / "priced.csv"
+    _write_csv(src, [HEADER, ROWS[0]])
+
+    price_roster(str(src), str(dst), "roster.csv", is_pro=False)
+
+    ada = dict(zip(PRICED_COLUMNS, _read_output(dst)[1][len(HEADER):]))
+    assert ada["whitelist_ngn"] == ""
+    assert ada["pricing_status"] == "ok (whitelisting: PRO only)"
+
+
+def test_roster_without_platform_column_is_rejected(tmp_path):
+    src = tmp_path / "roster.csv"
+    _write_csv(src, [["followers", "niche"], ["50k", "tech"]])
+
+    with pytest.raises(RosterError, match="platform"):
+        price_roster(str(src), str(tmp_path / "priced.csv"), "roster.csv", is_pro=False)
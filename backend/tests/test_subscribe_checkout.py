@@ -0,0 +1,32 @@
+# backend/tests/test_subscribe_checkout.py
+
+import asyncio
+
+import app.routes.paystack_routes as routes_module
+from bot.handlers import subscribe
+from fake_paystack import FakePaystack
+
+
+def test_checkout_is_started_in_process(monkeypatch):
+    fake = FakePaystack()
+    client = fake.client()
+    inserted = []
+
+    monkeypatch.setattr(subscribe, "PAYMENT_TRANSPORT", "local")
+    monkeypatch.setattr(routes_module, "get_paystack_client", lambda: client)
+    monkeypatch.setattr(routes_module, "insert_pending_payment", lambda *row: inserted.append(row))
+
+    async def run():
+        try:
+            first = await subscribe.fetch_checkout({"telegram_id": "880001"})
+            again = await subscribe.fetch_checkout({"telegram_id": "880001"})
+            return first, again
+        finally:
+            await client.aclose()
+
+    first, again = asyncio.run(run())
+
+    assert first["authorization_url"].startswith("https://checkout.paystack.test/")
+    assert again == first                 # repeat tap reuses the pending checkout
+    assert fake.calls["initialize"] == 1
+    assert [(telegram_id, amount, plan) for _, telegram_id, amount, plan in inserted] == [("880001", 1_000_000, "PRO")]
@@ -0,0 +1,35 @@
+# backend/tests/test_telegram_rate_limiter.py
+
+import time
+import asyncio
+
+from app.services.telegram_rate_limiter import TelegramRateLimiter, TokenBucket
+
+
+def test_capped_bucket_forgives_debt_beyond_max_wait():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.reserve(max_wait=0.1) == 0.0
+    waits = [bucket.reserve(max_wait=0.1) for _ in range(5)]
+    assert all(0 < wait <= 0.1 + 1e-9 for wait in waits)
+
+
+def test_per_chat_wait_is_capped_and_reported():
+    limiter = TelegramRateLimiter(global_rate=1000, chat_rate=1, chat_burst=1, chat_max_wait=0.05)
+
+    async def send():
+        return True
+
+    async def burst():
+        for _ in range(5):
+            await limiter.process_request(send, (), {}, "sendMessage", {"chat_id": 42}, None)
+
+    started = time.monotonic()
+    asyncio.run(burst())
+    elapsed = time.monotonic() - started
+
+    # uncapped, 5 messages at 1 msg/s (burst 1) would block the caller ~4s
+    assert elapsed < 1.0
+    stats = limiter.stats()
+    assert stats["throttled"] == 4
+    assert 0 < stats["chat_wait_s_total"] <= 0.25
+    assert stats["chat_wait_s_max"] <= 0.06
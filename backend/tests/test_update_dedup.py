@@ -0,0 +1,23 @@
+# backend/tests/test_update_dedup.py
+
+from app.services.update_dedup import UpdateDeduplicator
+
+
+def test_redelivery_inside_window_is_duplicate():
+    dedup = UpdateDeduplicator(window=64)
+    assert dedup._test_and_set(1000) is False
+    assert dedup._test_and_set(1001) is False
+    assert dedup._test_and_set(1000) is True
+    assert dedup._test_and_set(990) is False
+
+
+def test_sequence_reset_is_followed_not_dropped():
+    dedup = UpdateDeduplicator(window=64)
+    for update_id in range(5000, 5010):
+        dedup._test_and_set(update_id)
+
+    # Telegram restarted update_ids at a lower random value
+    assert [dedup._test_and_set(i) for i in (12, 13, 14)] == [False, False, False]
+    assert dedup._test_and_set(13) is True
+    assert dedup.stats()["sequence_resets"] == 1
+    assert dedup.stats()["highest_update_id"] == 14